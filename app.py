@@ -0,0 +1,9 @@
+# WSGI entry point: gunicorn app:server
+#
+# Every worker imports the Dash app and starts its own watchlist scheduler.
+# Only one of them (the holder of data/refresh.lock) fetches from the data
+# server; the others read its snapshots from data/snapshots.db. Do not use
+# --preload: the scheduler threads must be started inside each worker.
+from main import app, server
+
+__all__ = ["app", "server"]
@@ -0,0 +1,228 @@
+"""
+/data/full payloads for benchmarks and the local stand-in server
+
+Synthetic payloads follow the NinjaTrader exporter ("ninja trade/data.cs"):
+one entry per trading day keyed by date, with OHLCV, Instrument, BarIndex
+and a Panels dict of indicator plots (null while an indicator warms up).
+
+Usage:
+    python -m benchmarks.fixtures synth fixture.json --bars 2500 --panels 6
+    python -m benchmarks.fixtures record fixture.json --url https://test-cfrs.onrender.com
+"""
+
+import argparse
+import json
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import requests
+from core.trading_calendar import is_trading_day
+
+DEFAULT_BARS = 2500
+DEFAULT_START = date(2015, 1, 2)
+# Indicator panels in the order the chart template lays them out
+STANDARD_PANELS = ("Panel 1", "Panel ?", "Panel 2", "Panel 3", "Panel 4", "Panel 5")
+# Plots per extra (non-standard) panel
+EXTRA_PLOTS = ("Plot1", "Plot2", "Plot3", "Plot4")
+# Bars before the moving-average style indicators produce values
+WARMUP_BARS = 20
+
+
+def trading_days(start, count):
+    """The first `count` trading days on or after `start`"""
+    days = []
+    day = start
+    while len(days) < count:
+        if is_trading_day(day):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _rolling_mean(values, window):
+    means = np.full(len(values), np.nan)
+    if len(values) >= window:
+        sums = np.cumsum(np.insert(values, 0, 0.0))
+        means[window - 1 :] = (sums[window:] - sums[:-window]) / window
+    return means
+
+
+def _value(x):
+    return None if x is None or np.isnan(x) else round(float(x), 6)
+
+
+def make_bars(
+    bars=DEFAULT_BARS,
+    panels=len(STANDARD_PANELS),
+    seed=0,
+    instrument="QQQ",
+    start=DEFAULT_START,
+    first_index=0,
+    last_close=400.0,
+):
+    """
+    Synthetic bars as the exporter writes them: {date: bar}
+
+    `panels` indicator panels are filled, the standard six first and then
+    extra "Panel 6", "Panel 7", ... with generic plots. first_index and
+    last_close let a caller continue an existing series.
+    """
+    rng = np.random.default_rng(seed)
+    days = trading_days(start, bars)
+    close = last_close + np.cumsum(rng.normal(0, 3, bars))
+    opens = close + rng.normal(0, 1, bars)
+    highs = np.maximum(opens, close) + np.abs(rng.normal(1, 0.5, bars))
+    lows = np.minimum(opens, close) - np.abs(rng.normal(1, 0.5, bars))
+    volumes = rng.integers(100_000, 90_000_000, bars)
+
+    sma = _rolling_mean(close, WARMUP_BARS)
+    spread = 2 * np.array(
+        [np.std(close[max(0, i - WARMUP_BARS + 1) : i + 1]) for i in range(bars)]
+    )
+    spread[: WARMUP_BARS - 1] = np.nan
+    atr = _rolling_mean(highs - lows, 14)
+    momentum = close - np.concatenate((np.full(12, np.nan), close[:-12]))[:bars]
+
+    names = list(STANDARD_PANELS[:panels]) + [
+        f"Panel {n}" for n in range(6, 6 + max(0, panels - len(STANDARD_PANELS)))
+    ]
+
+    data = {}
+    for i, day in enumerate(days):
+        mean = (opens[i] + close[i]) / 2
+        standard = {
+            "Panel 1": {
+                "Price": close[i],
+                "Open": opens[i],
+                "High": highs[i],
+                "Low": lows[i],
+                "Close": close[i],
+                "Volume": int(volumes[i]),
+                "Mean": mean,
+                "Upper": highs[max(0, i - WARMUP_BARS + 1) : i + 1].max(),
+                "Lower": lows[max(0, i - WARMUP_BARS + 1) : i + 1].min(),
+            },
+            "Panel ?": {
+                "SMA": sma[i],
+                "Upper band": sma[i] + spread[i],
+                "Middle band": sma[i],
+                "Trigger": sma[i] + 0.5,
+                "Lower band": sma[i] - spread[i],
+                "UpTrend": close[i] if close[i] >= opens[i] else np.nan,
+                "DownTrend": close[i] if close[i] < opens[i] else np.nan,
+            },
+            "Panel 2": {
+                "MomentumHistogram": momentum[i],
+                "SqueezeDots": float(i % 2),
+            },
+            "Panel 3": {"Momentum": momentum[i], "Squeeze": float(i % 3 == 0)},
+            "Panel 4": {"Volume": int(volumes[i])},
+            "Panel 5": {"ATR": atr[i], "Range value": highs[i] - lows[i]},
+        }
+        bar_panels = {}
+        for name in names:
+            plots = standard.get(name) or {
+                plot: close[i] + rng.normal(0, 5) for plot in EXTRA_PLOTS
+            }
+            bar_panels[name] = {
+                plot: value if isinstance(value, int) else _value(value)
+                for plot, value in plots.items()
+            }
+
+        week = day.isocalendar()
+        data[day.isoformat()] = {
+            "Week": f"{week.week}/{day.year}",
+            "Date": day.isoformat(),
+            "Open": _value(opens[i]),
+            "High": _value(highs[i]),
+            "Low": _value(lows[i]),
+            "Close": _value(close[i]),
+            "Volume": int(volumes[i]),
+            "Mean": _value(mean),
+            "Instrument": instrument,
+            "BarIndex": first_index + i,
+            "Panels": bar_panels,
+        }
+    return data
+
+
+def make_payload(
+    bars=DEFAULT_BARS,
+    panels=len(STANDARD_PANELS),
+    seed=0,
+    instrument="QQQ",
+    start=DEFAULT_START,
+):
+    """A complete synthetic /data/full response"""
+    data = make_bars(bars, panels, seed, instrument, start)
+    return full_response(data, instrument)
+
+
+def full_response(data, instrument):
+    """Wrap exporter bars the way the data server's /data/full does"""
+    dates = list(data)
+    return {
+        "status": "success",
+        "data": data,
+        "summary": {
+            "instrument": instrument,
+            "total_bars": len(dates),
+            "first_date": dates[0] if dates else None,
+            "last_date": dates[-1] if dates else None,
+        },
+    }
+
+
+def record_payload(path, url, instrument=None, timeout=60):
+    """Save the live server's /data/full response for offline replay"""
+    params = {"instrument": instrument} if instrument else None
+    response = requests.get(f"{url}/data/full", params=params, timeout=timeout)
+    response.raise_for_status()
+    payload = response.json()
+    save_payload(payload, path)
+    logging.info(f"✓ Recorded {len(payload.get('data', {})):,} bars to {path}")
+    return payload
+
+
+def save_payload(payload, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+
+
+def load_payload(path):
+    return json.loads(Path(path).read_text())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark /data/full fixtures")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    synth_parser = subparsers.add_parser("synth", help="Generate a synthetic payload")
+    synth_parser.add_argument("path")
+    synth_parser.add_argument("--bars", type=int, default=DEFAULT_BARS)
+    synth_parser.add_argument("--panels", type=int, default=len(STANDARD_PANELS))
+    synth_parser.add_argument("--seed", type=int, default=0)
+    synth_parser.add_argument("--instrument", default="QQQ")
+
+    record_parser = subparsers.add_parser("record", help="Record the live payload")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--url", required=True)
+    record_parser.add_argument("--instrument")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "synth":
+        payload = make_payload(args.bars, args.panels, args.seed, args.instrument)
+        save_payload(payload, args.path)
+        logging.info(f"✓ Wrote {args.bars:,} synthetic bars to {args.path}")
+    else:
+        record_payload(args.path, args.url, args.instrument)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    main()
@@ -0,0 +1,762 @@
+"""
+Load test: many simulated traders against one dashboard instance
+
+Each simulated client behaves like an open browser tab, over HTTP only:
+
+    page load    GET / , /_dash-layout and /_dash-dependencies, then the
+                 callbacks the renderer fires on load (update_chart,
+                 update_poll_interval, update_watchlist_options) and the
+                 chart payload download
+    auto-update  every --poll-seconds (from a random phase), the callbacks on
+                 auto-update.n_intervals; a changed chart URL is downloaded
+    zoom         the zoomed-window fetch the chart makes after a bar click
+                 or pan on a downsampled history (--zoom-rate per minute)
+    calculator   calculate_trade with random inputs (--calc-rate per minute)
+    push stream  a /stream connection held open like the page's EventSource,
+                 reopened when the server ends it and retried later when it
+                 is refused; a "reset" delta reloads the chart through
+                 update_chart, as push-reload does
+
+Auto-updates only run while the client's stream is down, as the page
+disables its interval while the EventSource is open (--no-stream polls
+throughout). Bar clicks themselves (panel values and calculator prefill) run
+clientside and make no requests; the zoom fetch is their server-side cost.
+Callbacks are looked up in /_dash-dependencies by output, so request bodies
+follow the layout as it changes.
+
+Latency percentiles, errors and throughput are reported per action, with
+stream_connect timing each /stream request up to its response headers, and
+counts of refused (503) and dropped streams, deltas received and polls
+skipped while streaming. With --spawn, a stand-in data server
+(benchmarks.standin) and the app are started locally, so nothing leaves the
+machine.
+
+Usage:
+    python -m benchmarks.loadtest --spawn --clients 200 --duration 120
+    python -m benchmarks.loadtest --spawn --workers 4 --poll-seconds 5
+    python -m benchmarks.loadtest --spawn --clients 40 --max-streams 8
+    python -m benchmarks.loadtest --app-url http://127.0.0.1:5000 --clients 50
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import requests
+from benchmarks.fixtures import DEFAULT_BARS, STANDARD_PANELS, load_payload, make_payload
+from benchmarks.standin import StandInServer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CLIENTS = 100
+DEFAULT_DURATION = 60
+DEFAULT_POLL_SECONDS = 30
+# Per client, per minute
+DEFAULT_ZOOM_RATE = 2.0
+DEFAULT_CALC_RATE = 0.5
+CHART_WIDTH = 1200
+REQUEST_TIMEOUT = 60
+STREAM_ROUTE = "/stream"
+# Well past the server's 15 s keep-alive comments, so a silent stream is dead
+STREAM_READ_TIMEOUT = 45
+# The page's defaults (core.push): reconnect delay, and the wait after a refusal
+STREAM_RECONNECT_SECONDS = 3
+STREAM_REFUSED_SECONDS = 30
+STARTUP_TIMEOUT = 120
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _parse_output(output):
+    """[(id, property)] from a dependency's output string ("..a.b...c.d..")"""
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    specs = []
+    for part in parts:
+        component, prop = part.rsplit(".", 1)
+        specs.append((component, prop.split("@")[0]))
+    return specs
+
+
+class DashCallbacks:
+    """The app's server-side callbacks, from /_dash-dependencies"""
+
+    def __init__(self, dependencies):
+        self.callbacks = [
+            dep
+            for dep in dependencies
+            if not dep.get("clientside_function")
+            # Pattern-matching callbacks need the rendered ids; none are
+            # server-side in this app
+            and "{" not in dep["output"]
+            and not any(
+                not isinstance(spec["id"], str) or spec["id"].startswith("{")
+                for spec in dep["inputs"] + dep.get("state", [])
+            )
+        ]
+
+    def triggered_by(self, component, prop):
+        return [
+            dep
+            for dep in self.callbacks
+            if any(
+                spec["id"] == component and spec["property"] == prop
+                for spec in dep["inputs"]
+            )
+        ]
+
+    def on_load(self):
+        """Callbacks the renderer fires when the page loads"""
+        return [dep for dep in self.callbacks if not dep.get("prevent_initial_call")]
+
+    @staticmethod
+    def name(dep):
+        """Report label: the callback's first output component"""
+        return "cb:" + _parse_output(dep["output"])[0][0]
+
+    @staticmethod
+    def body(dep, values, changed=()):
+        """/_dash-update-component request body, with inputs from `values`"""
+        outputs = [
+            {"id": component, "property": prop}
+            for component, prop in _parse_output(dep["output"])
+        ]
+        return {
+            "output": dep["output"],
+            "outputs": outputs if dep["output"].startswith("..") else outputs[0],
+            "inputs": [
+                {**spec, "value": values.get((spec["id"], spec["property"]))}
+                for spec in dep["inputs"]
+            ],
+            "state": [
+                {**spec, "value": values.get((spec["id"], spec["property"]))}
+                for spec in dep.get("state", [])
+            ],
+            "changedPropIds": [f"{component}.{prop}" for component, prop in changed],
+        }
+
+
+def layout_values(layout):
+    """{(id, property): value} for every component with an id in the layout"""
+    values = {}
+
+    def walk(node):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            props = node.get("props")
+            if isinstance(props, dict):
+                component = props.get("id")
+                if isinstance(component, str):
+                    for prop, value in props.items():
+                        if prop != "children":
+                            values[(component, prop)] = value
+                walk(props.get("children"))
+
+    walk(layout)
+    return values
+
+
+class Recorder:
+    """Latencies, errors and bytes per action, shared by all clients"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, action, seconds, ok=True, size=0):
+        with self._lock:
+            self.latencies[action].append(seconds)
+            self.bytes[action] += size
+            if not ok:
+                self.errors[action] += 1
+
+    def count(self, name, size=0):
+        """Count an event that is not a request (stream refusals, deltas, ...)"""
+        with self._lock:
+            self.counts[name] += 1
+            self.bytes[name] += size
+
+    def summary(self, elapsed):
+        results = {}
+        with self._lock:
+            actions = sorted(self.latencies)
+            for action in actions:
+                timings = np.array(self.latencies[action]) * 1000
+                results[action] = {
+                    "count": len(timings),
+                    "errors": self.errors[action],
+                    **{
+                        f"p{p}_ms": float(np.percentile(timings, p))
+                        for p in PERCENTILES
+                    },
+                    "max_ms": float(timings.max()),
+                    "per_second": len(timings) / elapsed if elapsed else None,
+                    "kib": self.bytes[action] / 1024,
+                }
+        return results
+
+    def stream_summary(self):
+        with self._lock:
+            return {
+                **{
+                    name: self.counts[name]
+                    for name in (
+                        "stream_opened",
+                        "stream_refused",
+                        "stream_failed",
+                        "stream_dropped",
+                        "stream_delta",
+                        "stream_reset",
+                        "poll_skipped",
+                    )
+                },
+                "delta_kib": self.bytes["stream_delta"] / 1024,
+            }
+
+
+class SimulatedClient(threading.Thread):
+    """One browser tab: page load, then auto-updates, zooms and calculations"""
+
+    def __init__(self, number, app_url, recorder, deadline, options):
+        super().__init__(name=f"client-{number}", daemon=True)
+        self.app_url = app_url.rstrip("/")
+        self.recorder = recorder
+        self.deadline = deadline
+        self.options = options
+        self.random = random.Random(options.seed * 100_003 + number)
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.callbacks = None
+        self.values = {}
+        self.chart_url = None
+        self.window = None
+        # Push stream state, shared with the StreamListener thread
+        self.streaming = threading.Event()
+        self.wake = threading.Event()
+        self.reload_version = None
+        self.listener = None
+
+    def timed(self, action, method, path, **kwargs):
+        """The response to one request, or None if it failed"""
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.app_url + path, timeout=REQUEST_TIMEOUT, **kwargs
+            )
+            content = response.content
+        except requests.RequestException:
+            self.recorder.record(action, time.perf_counter() - started, ok=False)
+            return None
+        ok = response.status_code < 400
+        self.recorder.record(
+            action, time.perf_counter() - started, ok=ok, size=len(content)
+        )
+        return response if ok else None
+
+    def fire(self, dep, changed=()):
+        body = DashCallbacks.body(dep, self.values, changed)
+        response = self.timed(
+            DashCallbacks.name(dep), "POST", "/_dash-update-component", json=body
+        )
+        # 204: PreventUpdate, nothing to apply
+        if response is None or response.status_code == 204:
+            return
+        try:
+            updates = response.json().get("response", {})
+        except ValueError:
+            return
+        for component, props in updates.items():
+            for prop, value in props.items():
+                self.values[(component, prop)] = value
+
+    def fire_all(self, deps, changed=()):
+        for dep in deps:
+            self.fire(dep, changed)
+        self.download_chart()
+
+    def download_chart(self):
+        """Fetch the chart payload when the chart URL has changed, as the page does"""
+        url = self.values.get(("chart-url", "data"))
+        if not url or url == self.chart_url:
+            return
+        self.chart_url = url
+        response = self.timed("chart_data", "GET", f"{url}&width={CHART_WIDTH}")
+        if response is None:
+            return
+        try:
+            resolution = response.json().get("resolution") or {}
+        except ValueError:
+            return
+        if resolution.get("start") is not None and resolution.get("end") is not None:
+            self.window = (resolution["start"], resolution["end"])
+
+    def page_load(self):
+        self.timed("page", "GET", "/")
+        layout = self.timed("layout", "GET", "/_dash-layout")
+        dependencies = self.timed("dependencies", "GET", "/_dash-dependencies")
+        if layout is None or dependencies is None:
+            return False
+        self.values = layout_values(layout.json())
+        self.callbacks = DashCallbacks(dependencies.json())
+        self.fire_all(self.callbacks.on_load())
+        return True
+
+    def auto_update(self):
+        if self.streaming.is_set():
+            # The page disables its interval while the stream is open
+            self.recorder.count("poll_skipped")
+            return
+        key = ("auto-update", "n_intervals")
+        self.values[key] = (self.values.get(key) or 0) + 1
+        self.fire_all(self.callbacks.triggered_by(*key), changed=[key])
+
+    def push_reload(self, version):
+        """A reset delta: the page reloads the chart through update_chart"""
+        key = ("push-reload", "data")
+        self.values[key] = version
+        self.fire_all(self.callbacks.triggered_by(*key), changed=[key])
+
+    def stream_params(self):
+        """The query the page's EventSource opens /stream with"""
+        return {
+            "symbol": self.values.get(("watchlist-dropdown", "value")) or "",
+            "interval": self.values.get(("interval-dropdown", "value")) or "",
+            "version": self.values.get(("chart-version-store", "data")) or "",
+            "since": self.window[1] if self.window else "",
+        }
+
+    def zoom(self):
+        """The refine request the chart makes for a zoomed-in window"""
+        if not self.chart_url or self.window is None:
+            return
+        first, last = self.window
+        span = (last - first) * self.random.uniform(0.05, 0.2)
+        start = self.random.uniform(first, last - span)
+        self.timed(
+            "zoom",
+            "GET",
+            self.chart_url.replace("format=columnar", "format=json"),
+            params={"width": CHART_WIDTH, "start": int(start), "end": int(start + span)},
+        )
+
+    def calculate(self):
+        open_price = round(self.random.uniform(50, 500), 2)
+        bid = round(self.random.uniform(0.5, 20), 2)
+        self.values.update(
+            {
+                ("calc-ticker", "value"): "QQQ",
+                ("calc-description", "value"): "load test",
+                ("calc-direction", "value"): self.random.choice(("long", "short")),
+                ("calc-open-price", "value"): open_price,
+                ("calc-current-price", "value"): round(
+                    open_price + self.random.gauss(0, 2), 2
+                ),
+                ("calc-strike-price", "value"): round(open_price),
+                ("calc-atr", "value"): round(self.random.uniform(1, 10), 2),
+                ("calc-bid-price", "value"): bid,
+                ("calc-ask-price", "value"): round(
+                    bid + self.random.uniform(0.01, 0.5), 2
+                ),
+            }
+        )
+        key = ("calc-button", "n_clicks")
+        self.values[key] = (self.values.get(key) or 0) + 1
+        self.fire_all(self.callbacks.triggered_by(*key), changed=[key])
+
+    def next_in(self, per_minute):
+        if per_minute <= 0:
+            return float("inf")
+        return time.monotonic() + self.random.expovariate(per_minute / 60)
+
+    def run(self):
+        try:
+            if not self.page_load():
+                return
+            options = self.options
+            if options.stream:
+                self.listener = StreamListener(self)
+                self.listener.start()
+            now = time.monotonic()
+            due = {
+                self.auto_update: now + self.random.uniform(0, options.poll_seconds),
+                self.zoom: self.next_in(options.zoom_rate),
+                self.calculate: self.next_in(options.calc_rate),
+            }
+            rates = {self.zoom: options.zoom_rate, self.calculate: options.calc_rate}
+            while True:
+                action = min(due, key=due.get)
+                wait = due[action] - time.monotonic()
+                if due[action] >= self.deadline:
+                    return
+                # Woken early by the stream to reload the chart
+                if wait > 0 and self.wake.wait(wait):
+                    self.wake.clear()
+                    version, self.reload_version = self.reload_version, None
+                    if version is not None:
+                        self.push_reload(version)
+                    continue
+                action()
+                if action == self.auto_update:
+                    due[action] += options.poll_seconds
+                else:
+                    due[action] = self.next_in(rates[action])
+        except Exception as e:
+            logging.warning(f"{self.name} stopped: {e}")
+        finally:
+            if self.listener is not None:
+                self.listener.stop()
+            self.session.close()
+
+
+class StreamListener(threading.Thread):
+    """
+    A client's push stream, held open like the page's EventSource
+
+    Each connection attempt is timed as stream_connect, up to its response
+    headers. While one is open the client's auto-updates are skipped. When
+    the server ends the stream, it is reopened after the server's retry
+    delay with Last-Event-ID, as a browser does; a refused (503) or failed
+    one is retried after a jittered wait, as the page does.
+    """
+
+    def __init__(self, client):
+        super().__init__(name=f"{client.name}-stream", daemon=True)
+        self.client = client
+        self.recorder = client.recorder
+        self.session = requests.Session()
+        self.last_event_id = None
+        self.retry_seconds = STREAM_RECONNECT_SECONDS
+        self._closing = threading.Event()
+
+    def stop(self):
+        """Stop after the current event or keep-alive; does not block"""
+        self._closing.set()
+
+    def run(self):
+        client = self.client
+        try:
+            while not self._closing.is_set() and time.monotonic() < client.deadline:
+                delay = self.connect()
+                client.streaming.clear()
+                if self._closing.wait(delay):
+                    return
+        finally:
+            self.session.close()
+
+    def connect(self):
+        """One stream connection; returns seconds to wait before the next"""
+        client = self.client
+        headers = {}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                client.app_url + STREAM_ROUTE,
+                params=client.stream_params(),
+                headers=headers,
+                stream=True,
+                timeout=(REQUEST_TIMEOUT, STREAM_READ_TIMEOUT),
+            )
+        except requests.RequestException:
+            self.recorder.record(
+                "stream_connect", time.perf_counter() - started, ok=False
+            )
+            self.recorder.count("stream_failed")
+            return STREAM_REFUSED_SECONDS * client.random.uniform(0.5, 1.5)
+
+        ok = response.status_code == 200
+        self.recorder.record("stream_connect", time.perf_counter() - started, ok=ok)
+        if not ok:
+            response.close()
+            self.recorder.count(
+                "stream_refused" if response.status_code == 503 else "stream_failed"
+            )
+            return STREAM_REFUSED_SECONDS * client.random.uniform(0.5, 1.5)
+
+        self.recorder.count("stream_opened")
+        client.streaming.set()
+        try:
+            self.read(response)
+        except (requests.RequestException, ValueError):
+            self.recorder.count("stream_dropped")
+        finally:
+            response.close()
+        return self.retry_seconds
+
+    def read(self, response):
+        """Dispatch server-sent events until the server ends the stream"""
+        event, data = None, []
+        for line in response.iter_lines(decode_unicode=True):
+            if self._closing.is_set() or time.monotonic() >= self.client.deadline:
+                return
+            if line:
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data.append(value)
+                elif field == "id":
+                    self.last_event_id = value
+                elif field == "retry" and value.isdigit():
+                    self.retry_seconds = int(value) / 1000
+                continue
+            if event == "delta" and data:
+                self.delta("\n".join(data))
+            event, data = None, []
+
+    def delta(self, body):
+        self.recorder.count("stream_delta", size=len(body))
+        delta = json.loads(body)
+        if delta.get("reset"):
+            self.recorder.count("stream_reset")
+            self.client.reload_version = delta.get("version")
+            self.client.wake.set()
+
+
+def run_load(app_url, options):
+    """Drive `app_url` with options.clients clients for options.duration seconds"""
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + options.ramp_seconds + options.duration
+    clients = []
+    for number in range(options.clients):
+        # Spread the page loads over the ramp-up
+        start_at = started + options.ramp_seconds * number / max(options.clients, 1)
+        time.sleep(max(0.0, start_at - time.monotonic()))
+        client = SimulatedClient(number, app_url, recorder, deadline, options)
+        client.start()
+        clients.append(client)
+    for client in clients:
+        client.join(max(0.0, deadline - time.monotonic()) + REQUEST_TIMEOUT)
+    elapsed = time.monotonic() - started
+    return recorder.summary(elapsed), recorder.stream_summary(), elapsed
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def spawn_app(data_url, workers=1, threads=8, max_streams=None):
+    """
+    The app in a subprocess on a free local port, reading from `data_url`
+
+    Runs under gunicorn (gthread, as on Render) when it is installed,
+    otherwise on Flask's threaded development server. The app's data/
+    directory goes to a scratch working directory. max_streams sets the
+    app's STREAM_MAX_CONNECTIONS per worker.
+    """
+    port = _free_port()
+    if importlib.util.find_spec("gunicorn") is not None:
+        command = [
+            sys.executable, "-m", "gunicorn", "app:server",
+            "--bind", f"127.0.0.1:{port}",
+            "--worker-class", "gthread",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--timeout", "120",
+        ]
+    else:
+        if workers > 1:
+            logging.warning("gunicorn is not installed; running a single process")
+        command = [
+            sys.executable, "-c",
+            f"import main; main.app.run(host='127.0.0.1', port={port}, threaded=True)",
+        ]
+    env = {
+        **os.environ,
+        "RENDER_SERVER_URL": data_url,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])
+        ),
+    }
+    if max_streams is not None:
+        env["STREAM_MAX_CONNECTIONS"] = str(max_streams)
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as scratch:
+        log_path = Path(scratch) / "app.log"
+        with open(log_path, "wb") as log:
+            process = subprocess.Popen(
+                command, cwd=scratch, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+            try:
+                _wait_ready(url, process, log_path)
+                yield url
+            finally:
+                process.terminate()
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def _wait_ready(url, process, log_path):
+    give_up = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < give_up:
+        if process.poll() is not None:
+            output = log_path.read_text(errors="replace")[-2000:]
+            raise RuntimeError(f"App exited during startup:\n{output}")
+        try:
+            if requests.get(f"{url}/_dash-layout", timeout=5).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"App not ready after {STARTUP_TIMEOUT}s")
+
+
+def print_report(results, elapsed, clients, streams=None):
+    header = (
+        f"{'action':<22}{'count':>8}{'errors':>8}"
+        + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+        + f"{'max ms':>10}{'req/s':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    total = 0
+    for action, result in results.items():
+        total += result["count"]
+        print(
+            f"{action:<22}{result['count']:>8}{result['errors']:>8}"
+            + "".join(f"{result[f'p{p}_ms']:>10.1f}" for p in PERCENTILES)
+            + f"{result['max_ms']:>10.1f}{result['per_second']:>9.1f}"
+        )
+    print(
+        f"{clients} clients, {total:,} requests in {elapsed:.0f}s "
+        f"({total / elapsed:.1f} req/s)"
+    )
+    if streams is not None:
+        print(
+            f"Streams: {streams['stream_opened']} opened, "
+            f"{streams['stream_refused']} refused, "
+            f"{streams['stream_failed']} failed, "
+            f"{streams['stream_dropped']} dropped; "
+            f"{streams['stream_delta']} deltas ({streams['delta_kib']:.0f} KiB, "
+            f"{streams['stream_reset']} resets); "
+            f"{streams['poll_skipped']} polls skipped while streaming"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard load test")
+    parser.add_argument("--app-url", help="Running app (default: with --spawn)")
+    parser.add_argument(
+        "--spawn", action="store_true", help="Start a stand-in and the app locally"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per worker")
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--ramp-seconds", type=float, default=10)
+    parser.add_argument("--poll-seconds", type=float, default=DEFAULT_POLL_SECONDS)
+    parser.add_argument(
+        "--zoom-rate", type=float, default=DEFAULT_ZOOM_RATE, help="Per client-minute"
+    )
+    parser.add_argument(
+        "--calc-rate", type=float, default=DEFAULT_CALC_RATE, help="Per client-minute"
+    )
+    parser.add_argument(
+        "--no-stream",
+        dest="stream",
+        action="store_false",
+        help="Poll throughout instead of holding a /stream connection",
+    )
+    parser.add_argument(
+        "--max-streams", type=int, help="Spawned app's streams per worker"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixture", help="Payload for the stand-in (with --spawn)")
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument(
+        "--grow-seconds", type=float, help="Stand-in adds a bar this often"
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.spawn and not args.app_url:
+        parser.error("give --app-url or --spawn")
+
+    with ExitStack() as stack:
+        standin = None
+        app_url = args.app_url
+        if args.spawn:
+            if args.fixture:
+                payload = load_payload(args.fixture)
+            else:
+                payload = make_payload(args.bars, len(STANDARD_PANELS))
+            standin = stack.enter_context(
+                StandInServer(
+                    payload,
+                    latency_ms=args.latency_ms,
+                    grow_seconds=args.grow_seconds,
+                    seed=args.seed,
+                )
+            )
+            logging.info(f"Stand-in data server at {standin.url}")
+            app_url = stack.enter_context(
+                spawn_app(
+                    standin.url, args.workers, args.threads, args.max_streams
+                )
+            )
+            logging.info(f"App at {app_url}")
+
+        logging.info(
+            f"Running {args.clients} clients for {args.duration:.0f}s "
+            f"(+{args.ramp_seconds:.0f}s ramp-up)"
+        )
+        results, streams, elapsed = run_load(app_url, args)
+        upstream = dict(standin.stats) if standin is not None else None
+
+    print_report(results, elapsed, args.clients, streams if args.stream else None)
+    if upstream is not None:
+        print(f"Data server requests: {upstream}")
+
+    if args.output:
+        report = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "app_url": args.app_url,
+                "spawned": args.spawn,
+                "workers": args.workers if args.spawn else None,
+                "clients": args.clients,
+                "duration": args.duration,
+                "poll_seconds": args.poll_seconds,
+                "zoom_rate": args.zoom_rate,
+                "calc_rate": args.calc_rate,
+                "stream": args.stream,
+                "max_streams": args.max_streams,
+            },
+            "elapsed_s": elapsed,
+            "results": results,
+            "streams": streams,
+            "upstream": upstream,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    sys.exit(main())
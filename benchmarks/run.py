@@ -0,0 +1,287 @@
+"""
+Benchmarks for the data pipeline, panels, calculator and trade journal
+
+Everything runs offline: bar data comes from a fixture served by a local
+stand-in data server (benchmarks.standin), and journal inserts go to a
+scratch database.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --bars 10000 --panels 8 --output results.json
+    python -m benchmarks.run --fixture recorded.json --baseline baseline.json
+    python -m benchmarks.run --only convert_dataframe,fetch_and_process
+
+With --baseline, a case whose median time or peak memory exceeds the
+baseline by more than --tolerance (default 20%) is flagged as a regression
+and the run exits with status 1.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from benchmarks.fixtures import (
+    DEFAULT_BARS,
+    STANDARD_PANELS,
+    load_payload,
+    make_payload,
+)
+from benchmarks.standin import StandInServer
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.2
+CALCULATOR_CALLS = 10_000
+JOURNAL_ROWS = 500
+PANEL_CLICKS = 200
+
+
+def _calculator_inputs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    opens = rng.uniform(50, 500, count)
+    return [
+        {
+            "open_price": float(open_price),
+            "current_price": float(open_price + rng.normal(0, 2)),
+            "strike_price": float(round(open_price)),
+            "atr_value": float(rng.uniform(1, 10)),
+            "bid_price": float(bid),
+            "ask_price": float(bid + rng.uniform(0.01, 0.5)),
+            "trade_direction": "short" if i % 2 else "long",
+            "scenario": "standard",
+        }
+        for i, (open_price, bid) in enumerate(zip(opens, rng.uniform(0.5, 20, count)))
+    ]
+
+
+def build_cases(server, scratch, payload):
+    """
+    {name: (setup, run, items, unit)}; setup() runs untimed before every
+    repetition and returns the argument run() is timed on
+    """
+    from core import db, ib_client
+    from core.calculators import calculate_trade_analysis
+    from core.data_processing import _panel_table_cache, fetch_and_process_data
+    from core.ui_components import create_data_panels
+
+    # Point the client at the stand-in and the journal at a scratch database
+    ib_client.RENDER_SERVER_URL = server.url
+    db.DB_PATH = Path(scratch) / "trades.db"
+    db.init_database()
+
+    bars = len(payload["data"])
+    client = ib_client.IBClient()
+    df, _ = fetch_and_process_data()
+    symbol = payload["summary"].get("instrument")
+    clicks = np.random.default_rng(0).integers(0, len(df), PANEL_CLICKS)
+    inputs = _calculator_inputs(CALCULATOR_CALLS)
+
+    def clear_panel_cache():
+        _panel_table_cache.clear()
+
+    def insert_rows(dedupe_window):
+        def run(_):
+            for i, data in enumerate(inputs[:JOURNAL_ROWS]):
+                results = calculate_trade_analysis(data)
+                db.insert_trade_result(
+                    trade_date="01/02/2025",
+                    ticker="QQQ",
+                    direction=data["trade_direction"],
+                    scenario="standard",
+                    target_price_value=results["target_price"],
+                    option_bid=data["bid_price"],
+                    option_ask=data["ask_price"],
+                    intrinsic_value=results["intrinsic_value"],
+                    extrinsic_value=results["extrinsic_value"],
+                    target_size=results["target_size"],
+                    tradable_flag=results["is_tradable"],
+                    inputs_dict=data,
+                    description=f"bench {i}",
+                    dedupe_window=dedupe_window,
+                )
+
+        return run
+
+    return {
+        "convert_dataframe": (
+            lambda: payload["data"],
+            client._convert_to_dataframe,
+            bars,
+            "bars",
+        ),
+        "fetch_and_process": (
+            lambda: None,
+            lambda _: fetch_and_process_data(symbol),
+            bars,
+            "bars",
+        ),
+        "create_data_panels_cold": (
+            clear_panel_cache,
+            lambda _: create_data_panels(df, symbol, int(clicks[0])),
+            1,
+            "tables",
+        ),
+        "create_data_panels": (
+            lambda: create_data_panels(df, symbol),
+            lambda _: [create_data_panels(df, symbol, int(i)) for i in clicks],
+            PANEL_CLICKS,
+            "clicks",
+        ),
+        "calculate_trade_analysis": (
+            lambda: inputs,
+            lambda batch: [calculate_trade_analysis(dict(data)) for data in batch],
+            CALCULATOR_CALLS,
+            "calls",
+        ),
+        "db_insert": (lambda: None, insert_rows(None), JOURNAL_ROWS, "rows"),
+        "db_insert_dedupe": (
+            lambda: None,
+            insert_rows(db.DEFAULT_DEDUPE_WINDOW_SECONDS),
+            JOURNAL_ROWS,
+            "rows",
+        ),
+    }
+
+
+def measure(setup, run, items, repeat):
+    """Time `run` over `repeat` repetitions, then once more for peak memory"""
+    timings = []
+    for _ in range(repeat):
+        argument = setup()
+        started = time.perf_counter()
+        run(argument)
+        timings.append(time.perf_counter() - started)
+
+    argument = setup()
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": median,
+        "p95_s": float(np.percentile(timings, 95)),
+        "throughput": items / median if median else None,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Names of the cases slower or hungrier than the baseline allows"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        result["baseline_median_s"] = base["median_s"]
+        result["change"] = result["median_s"] / base["median_s"] - 1
+        slower = result["median_s"] > base["median_s"] * (1 + tolerance)
+        hungrier = result["peak_mib"] > base["peak_mib"] * (1 + tolerance)
+        result["regression"] = slower or hungrier
+        if result["regression"]:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(results):
+    header = (
+        f"{'case':<26}{'median ms':>11}{'p95 ms':>10}{'throughput':>20}{'peak MiB':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        line = (
+            f"{name:<26}{result['median_s'] * 1000:>11.2f}"
+            f"{result['p95_s'] * 1000:>10.2f}{throughput:>20}"
+            f"{result['peak_mib']:>10.2f}"
+        )
+        if "change" in result:
+            flag = "  REGRESSION" if result["regression"] else ""
+            line += f"  {result['change']:+.0%} vs baseline{flag}"
+        print(line)
+
+
+def run_benchmarks(payload, repeat=DEFAULT_REPEAT, only=None):
+    """Run every (or each named) case against a stand-in serving `payload`"""
+    with tempfile.TemporaryDirectory() as scratch, StandInServer(payload) as server:
+        from core import metrics
+
+        # Stage timings recorded along the way stay out of the app's data/
+        metrics.METRICS_DIR = Path(scratch) / "metrics"
+        cases = build_cases(server, scratch, payload)
+        results = {}
+        for name, (setup, run, items, unit) in cases.items():
+            if only and name not in only:
+                continue
+            logging.info(f"Running {name}")
+            results[name] = {**measure(setup, run, items, repeat), "unit": unit}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Data pipeline benchmarks")
+    parser.add_argument("--fixture", help="Recorded or saved /data/full payload")
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS)
+    parser.add_argument("--panels", type=int, default=len(STANDARD_PANELS))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", help="Comma-separated case names")
+    parser.add_argument("--output", help="Write results as JSON (a future baseline)")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    if args.fixture:
+        payload = load_payload(args.fixture)
+    else:
+        payload = make_payload(args.bars, args.panels)
+
+    results = run_benchmarks(
+        payload, args.repeat, set(args.only.split(",")) if args.only else None
+    )
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("meta", {}).get("bars") != len(payload["data"]):
+            logging.warning("Baseline was measured on a different number of bars")
+        regressions = compare(results, baseline, args.tolerance)
+    print_report(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "fixture": args.fixture,
+                "bars": len(payload["data"]),
+                "panels": args.panels if not args.fixture else None,
+            },
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    sys.exit(main())
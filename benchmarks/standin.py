@@ -0,0 +1,378 @@
+"""
+Local stand-in for the Render data server
+
+Serves recorded or synthetic /data/full payloads (see benchmarks.fixtures)
+on the endpoints IBClient uses: /, /data/full, /data/summary and
+/data/sample, plus /standin/stats with request and failure counts. Bodies
+are serialised (and gzipped, with --gzip) once per instrument and bar
+count, so the stand-in keeps up with load tests and stays out of benchmark
+timings.
+
+Realism knobs:
+    --latency-ms / --jitter-ms   added to every response
+    --bandwidth-mbps             transfer time in proportion to body size
+    --grow-seconds               reveal one more bar every N seconds, starting
+                                 from --initial-bars (default: 90% of them)
+    --failure-rate / --failure-modes
+                                 fail that share of data requests with
+                                 error (500), unavailable (503), timeout
+                                 (hang past the client timeout), reset
+                                 (drop the connection) or garbage (the route's
+                                 own response, cut in half)
+
+Usage:
+    python -m benchmarks.standin --bars 2500 --instruments QQQ,SPY
+    python -m benchmarks.standin --fixture recorded.json --latency-ms 80 \\
+        --grow-seconds 5 --failure-rate 0.02 --failure-modes error,timeout
+    RENDER_SERVER_URL=http://127.0.0.1:8000 python main.py
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from benchmarks.fixtures import (
+    DEFAULT_BARS,
+    STANDARD_PANELS,
+    full_response,
+    load_payload,
+    make_payload,
+)
+
+DEFAULT_PORT = 8000
+FAILURE_MODES = ("error", "unavailable", "timeout", "reset", "garbage")
+# Longer than IBClient's 30 s request timeout
+DEFAULT_HANG_SECONDS = 35
+DATA_ROUTES = ("/data/full", "/data/summary", "/data/sample")
+
+
+class StandInData:
+    """
+    One instrument's bars, revealed over time when growth is enabled
+
+    The full fixture is held in memory; visible() is how many bars are
+    currently served, so grown bars keep the recorded (or generated)
+    indicator values rather than made-up ones.
+    """
+
+    def __init__(self, payload, initial_bars=None, grow_seconds=None):
+        self.instrument = payload.get("summary", {}).get("instrument") or next(
+            (bar.get("Instrument") for bar in payload.get("data", {}).values()), None
+        )
+        self.bars = list(payload.get("data", {}).items())
+        self.grow_seconds = grow_seconds
+        if initial_bars is None:
+            initial_bars = len(self.bars)
+            if grow_seconds:
+                initial_bars = int(initial_bars * 0.9)
+        self.initial_bars = max(1, min(initial_bars, len(self.bars)))
+        self.started = time.monotonic()
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def visible(self):
+        if not self.grow_seconds:
+            return self.initial_bars
+        grown = int((time.monotonic() - self.started) / self.grow_seconds)
+        return min(len(self.bars), self.initial_bars + grown)
+
+    def response(self, count=None):
+        bars = self.bars[: count or self.visible()]
+        return full_response(dict(bars), self.instrument)
+
+    def summary(self):
+        count = self.visible()
+        return {
+            "instrument": self.instrument,
+            "total_bars": count,
+            "first_date": self.bars[0][0] if self.bars else None,
+            "last_date": self.bars[count - 1][0] if self.bars else None,
+        }
+
+    def sample(self, count):
+        bars = self.bars[: min(count, self.visible())]
+        return {"status": "success", "data": dict(bars)}
+
+    def full_body(self, encoding="identity"):
+        """Serialised /data/full for the visible bars, cached per bar count"""
+        count = self.visible()
+        key = (count, encoding)
+        with self._lock:
+            body = self._bodies.get(key)
+        if body is None:
+            body = json.dumps(self.response(count)).encode()
+            if encoding == "gzip":
+                body = gzip.compress(body, compresslevel=5)
+            with self._lock:
+                # Older bar counts are never asked for again
+                self._bodies = {
+                    cached: value
+                    for cached, value in self._bodies.items()
+                    if cached[0] == count
+                }
+                self._bodies[key] = body
+        return body
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for bursts of connections from load tests
+    request_queue_size = 128
+
+
+class StandInServer:
+    """
+    The data server's endpoints for one or more payloads, on a background
+    thread
+
+    with StandInServer(payload) as server:
+        IBClient(server.url).get_historical_data()
+    """
+
+    def __init__(
+        self,
+        payloads,
+        host="127.0.0.1",
+        port=0,
+        latency_ms=0,
+        jitter_ms=0,
+        bandwidth_mbps=None,
+        grow_seconds=None,
+        initial_bars=None,
+        failure_rate=0.0,
+        failure_modes=("error",),
+        hang_seconds=DEFAULT_HANG_SECONDS,
+        compress=False,
+        seed=None,
+    ):
+        if isinstance(payloads, dict):
+            payloads = [payloads]
+        self.instruments = {}
+        for payload in payloads:
+            data = StandInData(payload, initial_bars, grow_seconds)
+            self.instruments[data.instrument] = data
+        self.default = next(iter(self.instruments.values()))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.failure_rate = failure_rate
+        self.failure_modes = tuple(failure_modes)
+        self.hang_seconds = hang_seconds
+        self.compress = compress
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        self._httpd = _HTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def delay(self, size=0):
+        seconds = self.latency_ms / 1000
+        if self.jitter_ms:
+            seconds += self._random.uniform(0, self.jitter_ms) / 1000
+        if self.bandwidth_mbps:
+            seconds += size * 8 / (self.bandwidth_mbps * 1_000_000)
+        return seconds
+
+    def failure(self, path):
+        """The failure mode to inject for this request, or None"""
+        if path not in DATA_ROUTES or not self.failure_rate:
+            return None
+        if self._random.random() >= self.failure_rate:
+            return None
+        return self._random.choice(self.failure_modes)
+
+    def status(self):
+        return {
+            "status": "running",
+            "data_status": {
+                "instrument": self.default.instrument,
+                "total_bars": self.default.visible(),
+                "instruments": list(self.instruments),
+            },
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients reusing a session skip the TCP handshake
+            protocol_version = "HTTP/1.1"
+
+            def send_json(self, status, body, encoding="identity"):
+                time.sleep(server.delay(len(body)))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if encoding != "identity":
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def inject(self, mode, url, query):
+                server.count(f"failure:{mode}")
+                if mode == "timeout":
+                    time.sleep(server.hang_seconds)
+                    self.close_connection = True
+                elif mode == "reset":
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    self.close_connection = True
+                elif mode == "garbage":
+                    # The response this request would have had, cut in half
+                    # (uncompressed, so the client fails on the JSON itself)
+                    status, body, encoding = self.respond(url, query)
+                    if encoding == "gzip":
+                        body = gzip.decompress(body)
+                    self.send_json(status, body[: len(body) // 2])
+                else:
+                    status = 503 if mode == "unavailable" else 500
+                    body = {"status": "error", "message": f"Injected {mode} failure"}
+                    self.send_json(status, json.dumps(body).encode())
+
+            def respond(self, url, query):
+                """(status, body, encoding) for a request, failures aside"""
+                instrument = query.get("instrument", [None])[0]
+                data = server.instruments.get(instrument, server.default)
+                if instrument and instrument not in server.instruments:
+                    message = f"Unknown instrument {instrument}"
+                    body = json.dumps({"status": "error", "message": message})
+                    return 404, body.encode(), "identity"
+
+                if url.path == "/":
+                    body = server.status()
+                elif url.path == "/data/full":
+                    accepts = self.headers.get("Accept-Encoding", "")
+                    encoding = "identity"
+                    if server.compress and "gzip" in accepts:
+                        encoding = "gzip"
+                    return 200, data.full_body(encoding), encoding
+                elif url.path == "/data/summary":
+                    body = data.summary()
+                elif url.path == "/data/sample":
+                    count = int(query.get("count", ["10"])[0])
+                    body = data.sample(count)
+                elif url.path == "/standin/stats":
+                    with server._stats_lock:
+                        body = dict(server.stats)
+                else:
+                    body = {"status": "error", "message": "Not found"}
+                    return 404, json.dumps(body).encode(), "identity"
+                return 200, json.dumps(body).encode(), "identity"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                server.count(url.path)
+
+                mode = server.failure(url.path)
+                if mode is not None:
+                    self.inject(mode, url, query)
+                    return
+                self.send_json(*self.respond(url, query))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="standin-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in data server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--fixture", action="append", help="Recorded payload (repeat for several)"
+    )
+    parser.add_argument("--instruments", default="QQQ", help="Synthetic instruments")
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS)
+    parser.add_argument("--panels", type=int, default=len(STANDARD_PANELS))
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float)
+    parser.add_argument("--grow-seconds", type=float)
+    parser.add_argument("--initial-bars", type=int)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-modes", default="error")
+    parser.add_argument("--hang-seconds", type=float, default=DEFAULT_HANG_SECONDS)
+    parser.add_argument("--gzip", action="store_true", help="Gzip /data/full")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    modes = args.failure_modes.split(",")
+    unknown = set(modes) - set(FAILURE_MODES)
+    if unknown:
+        parser.error(f"unknown failure modes: {', '.join(sorted(unknown))}")
+
+    if args.fixture:
+        payloads = [load_payload(path) for path in args.fixture]
+    else:
+        payloads = [
+            make_payload(args.bars, args.panels, seed=seed, instrument=instrument)
+            for seed, instrument in enumerate(args.instruments.split(","))
+        ]
+
+    server = StandInServer(
+        payloads,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        grow_seconds=args.grow_seconds,
+        initial_bars=args.initial_bars,
+        failure_rate=args.failure_rate,
+        failure_modes=modes,
+        hang_seconds=args.hang_seconds,
+        compress=args.gzip,
+        seed=args.seed,
+    )
+    logging.info(
+        f"Stand-in data server for {', '.join(server.instruments)} at {server.url}"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    main()
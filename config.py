@@ -1,5 +1,38 @@
+import os
+
 # WebSocket Data Server Configuration
 # For local Windows setup, use localhost:8000
 # For Replit cloud setup, use 127.0.0.1:8000
 
-RENDER_SERVER_URL = "https://test-cfrs.onrender.com"
+# RENDER_SERVER_URL in the environment points the app elsewhere, such as
+# the local stand-in (python -m benchmarks.standin)
+RENDER_SERVER_URL = os.environ.get(
+    "RENDER_SERVER_URL", "https://test-cfrs.onrender.com"
+)
+
+# Instruments kept warm by the background watchlist refresh. Clients can only
+# chart these, the ones the data server advertises, and these bar intervals
+WATCHLIST_SYMBOLS = ["QQQ"]
+WATCHLIST_INTERVALS = ["1d", "1wk"]
+
+# Refresh cadence in seconds: near the open/close, intraday, outside sessions
+REFRESH_SECONDS_EDGE = 15
+REFRESH_SECONDS_INTRADAY = 60
+REFRESH_SECONDS_CLOSED = 3600
+
+# Option chains the screener may load: file names inside OPTION_CHAIN_DIR,
+# or URLs under one of OPTION_CHAIN_URLS (comma-separated in the environment,
+# e.g. a local stand-in). Anything else typed into the screener is refused.
+OPTION_CHAIN_DIR = os.environ.get("OPTION_CHAIN_DIR", "data/chains")
+OPTION_CHAIN_URLS = [
+    url for url in os.environ.get("OPTION_CHAIN_URLS", "").split(",") if url
+]
+
+# Push streams (/stream): each open one holds a server thread, so a worker
+# keeps at most STREAM_MAX_CONNECTIONS of them (fewer than gunicorn --threads)
+# and ends each after STREAM_LIFETIME_SECONDS, when the browser reconnects
+STREAM_MAX_CONNECTIONS = int(os.environ.get("STREAM_MAX_CONNECTIONS", "4"))
+STREAM_LIFETIME_SECONDS = 300
+
+# Chart payload transport: "columnar" (typed arrays) or "json" (row objects)
+CHART_TRANSPORT = "columnar"
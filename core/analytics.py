@@ -0,0 +1,199 @@
+import logging
+import threading
+from core.db import get_connection, get_journal_version
+
+# SQL expressions for each dimension the journal can be grouped by.
+# trade_date is stored as MM/DD/YYYY, so it is rewritten to ISO for sorting.
+DIMENSIONS = {
+    "ticker": "ticker",
+    "direction": "direction",
+    "day": """
+        CASE WHEN trade_date LIKE '__/__/____'
+            THEN substr(trade_date, 7, 4) || '-' || substr(trade_date, 1, 2)
+                 || '-' || substr(trade_date, 4, 2)
+            ELSE date(created_at)
+        END
+    """,
+}
+
+PERCENTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75}
+
+_cache = {}
+_cache_version = None
+_cache_lock = threading.Lock()
+
+
+def _cached(key, compute):
+    """
+    Return a cached result, recomputing when the journal has changed
+
+    The journal version is read from the database, so writes made by other
+    worker processes or the journal_io CLI invalidate the cache as well.
+    """
+    global _cache_version
+
+    version = get_journal_version()
+    with _cache_lock:
+        if _cache_version != version:
+            _cache.clear()
+            _cache_version = version
+        if key in _cache:
+            return _cache[key]
+
+    result = compute()
+
+    with _cache_lock:
+        if _cache_version == version:
+            _cache[key] = result
+    return result
+
+
+def clear_cache():
+    """Drop all cached analytics results"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _resolve_group_by(group_by):
+    if isinstance(group_by, str):
+        group_by = (group_by,)
+    group_by = tuple(group_by)
+
+    unknown = [dim for dim in group_by if dim not in DIMENSIONS]
+    if unknown or not group_by:
+        raise ValueError(
+            f"group_by must be drawn from {', '.join(DIMENSIONS)}, got {group_by}"
+        )
+    return group_by
+
+
+def _build_summary_query(group_by, ticker=None, direction=None):
+    select_dims = ", ".join(f"{DIMENSIONS[dim]} AS {dim}" for dim in group_by)
+    dims = ", ".join(group_by)
+
+    clauses = []
+    params = []
+    if ticker is not None:
+        clauses.append("ticker = ?")
+        params.append(ticker)
+    if direction is not None:
+        clauses.append("direction = ?")
+        params.append(direction)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    # Nearest-rank percentiles: the smallest value whose rank reaches p * n
+    percentile_columns = ",\n".join(
+        f"MIN(CASE WHEN target_size IS NOT NULL AND size_rank >= {p} * size_count "
+        f"THEN target_size END) AS target_size_{name}"
+        for name, p in PERCENTILES.items()
+    )
+
+    query = f"""
+        WITH journal AS (
+            SELECT {select_dims}, tradable_flag, extrinsic_value, target_size
+            FROM trade_calculator_results
+            {where}
+        ),
+        ranked AS (
+            SELECT *,
+                ROW_NUMBER() OVER (
+                    PARTITION BY {dims}, target_size IS NULL ORDER BY target_size
+                ) AS size_rank,
+                COUNT(target_size) OVER (PARTITION BY {dims}) AS size_count
+            FROM journal
+        )
+        SELECT {dims},
+            COUNT(*) AS count,
+            SUM(CASE WHEN tradable_flag THEN 1 ELSE 0 END) AS tradable_count,
+            AVG(CASE WHEN tradable_flag THEN 1.0 ELSE 0.0 END) AS tradable_ratio,
+            AVG(extrinsic_value) AS avg_extrinsic_value,
+            MIN(target_size) AS target_size_min,
+            {percentile_columns},
+            MAX(target_size) AS target_size_max,
+            AVG(target_size) AS target_size_avg
+        FROM ranked
+        GROUP BY {dims}
+        ORDER BY {dims}
+    """
+    return query, params
+
+
+def summarize(group_by="ticker", ticker=None, direction=None):
+    """
+    Aggregate the trade journal by one or more dimensions (ticker, direction, day)
+
+    Returns one dict per group with the row count, tradable count and ratio,
+    average extrinsic value and the target_size distribution
+    (min, p25, median, p75, max, avg). All aggregation runs inside SQLite.
+    """
+    group_by = _resolve_group_by(group_by)
+
+    def compute():
+        query, params = _build_summary_query(group_by, ticker, direction)
+        with get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    return _cached(("summarize", group_by, ticker, direction), compute)
+
+
+def summary_by_ticker(**filters):
+    """Per-ticker journal aggregates"""
+    return summarize("ticker", **filters)
+
+
+def summary_by_direction(**filters):
+    """Per-direction journal aggregates"""
+    return summarize("direction", **filters)
+
+
+def summary_by_day(**filters):
+    """Per-day journal aggregates"""
+    return summarize("day", **filters)
+
+
+def daily_trend(window=7, ticker=None, direction=None):
+    """
+    Per-day counts with running totals and a rolling tradable ratio
+
+    The rolling ratio covers the last `window` days that have journal entries,
+    weighted by the number of calculations on each day.
+    """
+    if int(window) < 1:
+        raise ValueError("window must be at least 1")
+    window = int(window)
+
+    def compute():
+        query, params = _build_summary_query(("day",), ticker, direction)
+        query = f"""
+            WITH daily AS ({query})
+            SELECT day, count, tradable_count, tradable_ratio, avg_extrinsic_value,
+                SUM(count) OVER (ORDER BY day) AS cumulative_count,
+                SUM(tradable_count) OVER (ORDER BY day) AS cumulative_tradable,
+                CAST(SUM(tradable_count) OVER rolling AS REAL)
+                    / SUM(count) OVER rolling AS rolling_tradable_ratio
+            FROM daily
+            WINDOW rolling AS (ORDER BY day ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW)
+            ORDER BY day
+        """
+        with get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    return _cached(("daily_trend", window, ticker, direction), compute)
+
+
+def journal_dashboard(window=7):
+    """Everything a journal dashboard needs, in one cached call"""
+
+    def compute():
+        logging.info("Computing journal analytics")
+        return {
+            "by_ticker": summary_by_ticker(),
+            "by_direction": summary_by_direction(),
+            "by_ticker_direction": summarize(("ticker", "direction")),
+            "by_day": summary_by_day(),
+            "trend": daily_trend(window),
+        }
+
+    return _cached(("journal_dashboard", window), compute)
@@ -0,0 +1,206 @@
+import logging
+import numpy as np
+import pandas as pd
+from core.calculators import calculate_trade_analysis_batch
+from core.parallel import run_sharded
+
+DEFAULT_STRIKE_OFFSETS = (-2.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0)
+
+
+def synthetic_quotes(
+    bars,
+    strike_offsets=DEFAULT_STRIKE_OFFSETS,
+    strike_step=1.0,
+    time_value_factor=0.4,
+    spread=0.05,
+    noise=0.0,
+    seed=None,
+):
+    """
+    Generate call and put quotes for every bar when no recorded quotes exist
+
+    Strikes sit at Open + offset × ATR, snapped to strike_step. Each option is
+    priced at intrinsic value plus a time value of time_value_factor × ATR that
+    decays with distance from the money, quoted `spread` wide around the mid.
+    `noise` adds multiplicative jitter to the time value.
+    """
+    bars = bars.dropna(subset=["Open", "ATR"])
+    offsets = np.asarray(strike_offsets, dtype=float)
+    n_bars, n_offsets = len(bars), len(offsets)
+
+    open_price = np.repeat(bars["Open"].to_numpy(dtype=float), n_offsets)
+    atr = np.repeat(bars["ATR"].to_numpy(dtype=float), n_offsets)
+    time = np.repeat(bars.index.to_numpy(), n_offsets)
+    strike = np.round((open_price + np.tile(offsets, n_bars) * atr) / strike_step)
+    strike *= strike_step
+
+    safe_atr = np.where(atr > 0, atr, 1.0)
+    distance = np.abs(open_price - strike) / safe_atr
+    time_value = time_value_factor * atr * np.exp(-distance)
+    if noise:
+        rng = np.random.default_rng(seed)
+        time_value *= np.exp(rng.normal(0.0, noise, time_value.shape))
+
+    call_mid = np.maximum(open_price - strike, 0.0) + time_value
+    put_mid = np.maximum(strike - open_price, 0.0) + time_value
+    half_spread = spread / 2
+
+    return pd.DataFrame(
+        {
+            "time": np.concatenate([time, time]),
+            "strike": np.concatenate([strike, strike]),
+            "option_type": np.repeat(["call", "put"], len(strike)),
+            "bid": np.maximum(np.concatenate([call_mid, put_mid]) - half_spread, 0.0),
+            "ask": np.concatenate([call_mid, put_mid]) + half_spread,
+        }
+    )
+
+
+def _evaluate_rows(arrays, intrinsic_adjustment=1.0):
+    """Apply the tradability rule and bar outcome to one shard of quote rows"""
+    is_short = arrays["option_type"] == "put"
+    direction = np.where(is_short, "short", "long")
+
+    results = calculate_trade_analysis_batch(
+        {
+            "open_price": arrays["open"],
+            "current_price": arrays["current"],
+            "strike_price": arrays["strike"],
+            "atr_value": arrays["atr"],
+            "bid_price": arrays["bid"],
+            "ask_price": arrays["ask"],
+            "trade_direction": direction,
+            "intrinsic_adjustment": intrinsic_adjustment,
+        }
+    )
+
+    target = results["target_price"]
+    # Long targets are hit if the bar trades up to them, short targets if it
+    # trades down to them
+    target_hit = np.where(is_short, arrays["low"] <= target, arrays["high"] >= target)
+    move = np.where(
+        is_short, arrays["open"] - arrays["close"], arrays["close"] - arrays["open"]
+    )
+
+    return {
+        "bar_position": arrays["bar_position"],
+        "direction": direction,
+        "target_price": target,
+        "target_size": results["target_size"],
+        "is_tradable": results["is_tradable"],
+        "target_hit": target_hit,
+        "move": move,
+    }
+
+
+def evaluate_history(
+    bars,
+    quotes=None,
+    current_price_column="Open",
+    intrinsic_adjustment=1.0,
+    workers=None,
+    **synthetic_options,
+):
+    """
+    Evaluate the calculator rule for every (bar, quote) pair over history
+
+    `bars` is the processed DataFrame from fetch_and_process_data (datetime
+    index with Open, High, Low, Close and ATR). `quotes` holds time, strike,
+    option_type (call/put), bid and ask; when omitted, synthetic_quotes(bars,
+    **synthetic_options) is used. The underlying price for intrinsic value is
+    taken from current_price_column. Large histories are sharded across a
+    process pool (see core.parallel.run_sharded).
+    Returns one row per evaluated quote.
+    """
+    bars = bars.dropna(subset=["Open", "High", "Low", "Close", "ATR"])
+    if quotes is None:
+        quotes = synthetic_quotes(bars, **synthetic_options)
+
+    quote_times = pd.to_datetime(quotes["time"]).to_numpy()
+    bar_position = bars.index.get_indexer(quote_times)
+    matched = bar_position >= 0
+    if not matched.all():
+        logging.warning(f"Skipping {(~matched).sum():,} quotes with no matching bar")
+    quotes = quotes[matched]
+    bar_position = bar_position[matched]
+
+    def bar_column(name):
+        return bars[name].to_numpy(dtype=float)[bar_position]
+
+    arrays = {
+        "bar_position": bar_position,
+        "open": bar_column("Open"),
+        "high": bar_column("High"),
+        "low": bar_column("Low"),
+        "close": bar_column("Close"),
+        "atr": bar_column("ATR"),
+        "current": bar_column(current_price_column),
+        "strike": quotes["strike"].to_numpy(dtype=float),
+        "option_type": quotes["option_type"].astype(str).str.lower().to_numpy(),
+        "bid": quotes["bid"].to_numpy(dtype=float),
+        "ask": quotes["ask"].to_numpy(dtype=float),
+    }
+
+    evaluated = run_sharded(
+        _evaluate_rows,
+        arrays,
+        workers=workers,
+        intrinsic_adjustment=intrinsic_adjustment,
+    )
+
+    result = pd.DataFrame(evaluated)
+    result.insert(0, "time", bars.index[result.pop("bar_position").to_numpy()])
+    result.insert(1, "strike", arrays["strike"])
+    atr = np.where(arrays["atr"] > 0, arrays["atr"], np.nan)
+    result["moneyness_atr"] = np.round((arrays["strike"] - arrays["open"]) / atr, 1)
+    return result
+
+
+def summarize_backtest(evaluated, by=("direction", "is_tradable")):
+    """Hit rates and average move per group of evaluated signals"""
+    grouped = evaluated.groupby(list(by), observed=True)
+    summary = grouped.agg(
+        signals=("target_hit", "size"),
+        hits=("target_hit", "sum"),
+        hit_rate=("target_hit", "mean"),
+        avg_move=("move", "mean"),
+        avg_target_size=("target_size", "mean"),
+    )
+    return summary.reset_index()
+
+
+def run_backtest(bars, quotes=None, workers=None, **options):
+    """
+    Replay the calculator's tradability rule over history and report outcomes
+
+    Returns a dict with the evaluated rows, an overall summary, and hit rates
+    by direction/tradability and by strike moneyness (in ATR units).
+    """
+    evaluated = evaluate_history(bars, quotes, workers=workers, **options)
+    tradable = evaluated[evaluated["is_tradable"]]
+
+    def rate(values):
+        return float(values.mean()) if len(values) else 0.0
+
+    overall = {
+        "bars": int(evaluated["time"].nunique()),
+        "signals": int(len(evaluated)),
+        "tradable_signals": int(len(tradable)),
+        "tradable_ratio": rate(evaluated["is_tradable"]),
+        "hit_rate": rate(evaluated["target_hit"]),
+        "tradable_hit_rate": rate(tradable["target_hit"]),
+    }
+
+    logging.info(
+        f"Backtest: {overall['signals']:,} signals over {overall['bars']:,} bars, "
+        f"{overall['tradable_signals']:,} tradable"
+    )
+
+    return {
+        "overall": overall,
+        "by_direction": summarize_backtest(evaluated),
+        "by_moneyness": summarize_backtest(
+            evaluated, by=("direction", "moneyness_atr", "is_tradable")
+        ),
+        "evaluated": evaluated,
+    }
@@ -131,6 +131,20 @@ def create_calculator_panel():
                         placeholder="Leave blank for auto",
                         style=input_style,
                     ),
+                    html.Div("Days to Expiry (Optional)", style=label_style),
+                    dcc.Input(
+                        id="calc-days-to-expiry",
+                        type="number",
+                        placeholder="Leave blank to skip pricing",
+                        style=input_style,
+                    ),
+                    html.Div("Volatility % (Optional)", style=label_style),
+                    dcc.Input(
+                        id="calc-volatility",
+                        type="number",
+                        placeholder="Leave blank for implied",
+                        style=input_style,
+                    ),
                     html.Button(
                         "Calculate",
                         id="calc-button",
@@ -147,6 +161,28 @@ def create_calculator_panel():
                             "marginTop": "10px",
                         },
                     ),
+                    html.Div("Option Chain (File or URL)", style=label_style),
+                    dcc.Input(
+                        id="screener-source",
+                        type="text",
+                        placeholder="e.g., chain.csv",
+                        style=input_style,
+                    ),
+                    html.Button(
+                        "Screen Chain",
+                        id="screener-button",
+                        style={
+                            "width": "100%",
+                            "backgroundColor": "#0066cc",
+                            "color": "#ffffff",
+                            "border": "none",
+                            "padding": "8px",
+                            "borderRadius": "3px",
+                            "cursor": "pointer",
+                            "fontSize": "12px",
+                            "fontWeight": "bold",
+                        },
+                    ),
                 ],
                 style={"padding": "10px"},
             ),
@@ -261,6 +297,25 @@ def create_calculator_panel():
                 ],
                 style={"padding": "0 10px"},
             ),
+            # Screener Section
+            html.Div(
+                [
+                    html.Div(
+                        "Tradable Strikes",
+                        style={
+                            "backgroundColor": "#2d2d2d",
+                            "color": "#ffffff",
+                            "padding": "6px 8px",
+                            "fontWeight": "bold",
+                            "fontSize": "12px",
+                            "marginTop": "15px",
+                            "marginBottom": "5px",
+                        },
+                    ),
+                    dcc.Loading(html.Div(id="screener-results"), type="dot"),
+                ],
+                style={"padding": "0 10px 10px 10px"},
+            ),
         ],
         style={
             "backgroundColor": "#2d2d2d",
@@ -1,3 +1,8 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+
 def calculate_trade_analysis(data: dict) -> dict:
     """
     Calculate all trading metrics with scenario-based extrinsic values
@@ -47,6 +52,57 @@ def calculate_trade_analysis(data: dict) -> dict:
     }
 
 
+# Number of distinct input combinations remembered by the calculator memo
+CALCULATION_CACHE_SIZE = 1024
+
+MEMO_KEY_FIELDS = (
+    "open_price",
+    "current_price",
+    "strike_price",
+    "atr_value",
+    "bid_price",
+    "ask_price",
+    "trade_direction",
+    "scenario",
+    "custom_intrinsic_value",
+    "intrinsic_adjustment",
+)
+
+
+def _memo_key(data: dict) -> tuple:
+    """Normalise calculator inputs into a hashable key"""
+    key = []
+    for field in MEMO_KEY_FIELDS:
+        value = data.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        key.append((field, value))
+    return tuple(key)
+
+
+@lru_cache(maxsize=CALCULATION_CACHE_SIZE)
+def _memoized_trade_analysis(key: tuple) -> dict:
+    data = {field: value for field, value in key if value is not None}
+    return calculate_trade_analysis(data)
+
+
+def calculate_trade_analysis_cached(data: dict) -> dict:
+    """
+    calculate_trade_analysis with a bounded LRU memo keyed by the normalised inputs
+
+    Like the uncached version, records intrinsic_calculation_method on `data`.
+    Returns a fresh dict each call so callers cannot corrupt the memo.
+    """
+    result = dict(_memoized_trade_analysis(_memo_key(data)))
+    data["intrinsic_calculation_method"] = result["intrinsic_calculation_method"]
+    return result
+
+
+def clear_calculation_cache():
+    """Forget all memoised calculator results"""
+    _memoized_trade_analysis.cache_clear()
+
+
 def calculate_short_trade_analysis(data: dict) -> dict:
     """
     For short trades (subtract instead of add)
@@ -115,3 +171,126 @@ def calculate_custom_intrinsic(data: dict) -> float:
         data["intrinsic_calculation_method"] = "auto"
 
     return adjusted_intrinsic
+
+
+BATCH_INPUT_FIELDS = (
+    "open_price",
+    "current_price",
+    "strike_price",
+    "atr_value",
+    "bid_price",
+    "ask_price",
+)
+
+BATCH_OUTPUT_FIELDS = (
+    "target_price",
+    "option_price",
+    "intrinsic_value",
+    "extrinsic_value",
+    "target_size",
+    "is_tradable",
+)
+
+
+def round_like_python(values, decimals=4):
+    """
+    Vectorised round() that returns exactly what Python's round(x, decimals) does
+
+    np.round scales by 10**decimals before rounding, which can land on the other
+    side of a tie than Python's correctly rounded result. Only values whose
+    scaled fraction sits next to .5 can differ, so those few are re-rounded
+    with the builtin.
+    """
+    values = np.asarray(values, dtype=float)
+    shape = values.shape
+    # np.round of a 0-d array is a NumPy scalar, which cannot be patched
+    values = np.atleast_1d(values)
+    rounded = np.round(values, decimals)
+
+    scaled = values * 10.0**decimals
+    fraction = np.abs(scaled - np.trunc(scaled))
+    ambiguous = np.flatnonzero(np.abs(fraction - 0.5) < 1e-6)
+    if ambiguous.size:
+        source = values.ravel()
+        np.put(
+            rounded, ambiguous, [round(float(source[i]), decimals) for i in ambiguous]
+        )
+    return rounded.reshape(shape)
+
+
+def calculate_trade_analysis_batch(data, decimals=4):
+    """
+    Vectorised calculate_trade_analysis over arrays of inputs
+
+    `data` is a DataFrame or a mapping of the scalar calculator's keys
+    (open_price, current_price, strike_price, atr_value, bid_price, ask_price,
+    and optionally trade_direction, custom_intrinsic_value, intrinsic_adjustment)
+    to arrays or scalars, which are broadcast together. NaN in
+    custom_intrinsic_value means "no override" for that row.
+
+    Returns arrays for target_price, option_price, intrinsic_value,
+    extrinsic_value, target_size and is_tradable that match the scalar results
+    element for element (a DataFrame with the same index for DataFrame input).
+    Pass decimals=None to skip rounding.
+    """
+    is_frame = isinstance(data, pd.DataFrame)
+
+    def column(key, default=None):
+        if key in data:
+            return data[key]
+        if default is None:
+            raise KeyError(key)
+        return default
+
+    inputs = [np.asarray(column(key), dtype=float) for key in BATCH_INPUT_FIELDS]
+    direction = np.asarray(column("trade_direction", "long"))
+    override = np.asarray(column("custom_intrinsic_value", np.nan), dtype=float)
+    adjustment = np.asarray(column("intrinsic_adjustment", 1.0), dtype=float)
+
+    (
+        open_price,
+        current_price,
+        strike_price,
+        atr_value,
+        bid_price,
+        ask_price,
+        direction,
+        override,
+        adjustment,
+    ) = np.broadcast_arrays(*inputs, direction, override, adjustment)
+
+    is_short = direction == "short"
+
+    # Same max(0, x) semantics as calculate_custom_intrinsic
+    moneyness = np.where(
+        is_short, strike_price - current_price, current_price - strike_price
+    )
+    base_intrinsic = np.where(moneyness > 0, moneyness, 0.0)
+    intrinsic_value = np.where(
+        np.isnan(override), base_intrinsic * adjustment, override
+    )
+
+    target_price = np.where(is_short, open_price - atr_value, open_price + atr_value)
+    option_price = (bid_price + ask_price) / 2
+    target_size = option_price - intrinsic_value
+
+    # Like the scalar path, tradability is decided before rounding
+    is_tradable = target_price <= target_size
+
+    results = {
+        "target_price": target_price,
+        "option_price": option_price,
+        "intrinsic_value": intrinsic_value,
+        "extrinsic_value": target_size.copy(),
+        "target_size": target_size,
+    }
+    if decimals is not None:
+        results = {
+            key: round_like_python(values, decimals)
+            for key, values in results.items()
+        }
+    results["is_tradable"] = is_tradable
+
+    if is_frame:
+        return pd.DataFrame(results, index=data.index)
+    return results
@@ -1,15 +1,22 @@
 import dash
-from dash import html, Input, Output, State, no_update
+from dash import html, Input, Output, State, ALL, no_update
 import json
-import pandas as pd
 import logging
-from core.data_processing import fetch_and_process_data
-from core.ui_components import create_data_panels
-from core.calculators import calculate_trade_analysis
-from core.db import insert_trade_result
+from core.ui_components import PANEL_PLACEHOLDER, PANEL_VALUE_FIELDS
+from core.calculators import calculate_trade_analysis_cached
+from core.db import DEFAULT_DEDUPE_WINDOW_SECONDS, insert_trade_result
+from core.pricing import price_option
+from core.screener import load_chain, resolve_chain_source, screen_chain
+from core.payload import chart_data_url
+from core.push import REFUSED_RETRY_SECONDS, STREAM_ROUTE
+from core.trading_calendar import poll_seconds
+from core.watchlist import UnknownInstrumentError, get_watchlist
 import math
 from datetime import datetime
 
+# Calendar days per year when converting days to expiry for pricing
+DAYS_PER_YEAR = 365
+
 # Global app variable to store the app instance
 _app = None
 
@@ -47,172 +54,131 @@ def validate_numeric_input(value, field_name):
     return num_value
 
 
+def parse_intrinsic_override(value):
+    """The calculator's optional intrinsic value override, or None if unset or invalid"""
+    if value is None or value == "":
+        return None
+    try:
+        override = float(value)
+    except (ValueError, TypeError):
+        return None
+    if math.isnan(override) or override < 0:
+        return None
+    return override
+
+
+def parse_pricing_inputs(days_to_expiry, volatility):
+    """
+    (time to expiry in years, volatility as a decimal) from the calculator's
+    optional pricing inputs; time to expiry is None when pricing is off and
+    volatility is None to use the implied volatility
+    """
+    if days_to_expiry is None or days_to_expiry == "":
+        return None, None
+    days = validate_numeric_input(days_to_expiry, "Days to Expiry")
+    if days <= 0:
+        raise ValueError("Days to Expiry must be positive")
+
+    vol = None
+    if volatility is not None and volatility != "":
+        vol = validate_numeric_input(volatility, "Volatility") / 100
+        if vol <= 0:
+            raise ValueError("Volatility must be positive")
+    return days / DAYS_PER_YEAR, vol
+
+
 def register_python_callbacks(app):
     """Register all Python callbacks with the app"""
 
     @app.callback(
         [
-            Output("chart-data", "data"),
-            Output("dataframe-store", "data"),
-            Output("data-box", "children"),
-            Output("panel-2", "children"),
-            Output("panel-3", "children"),
-            Output("panel-4", "children"),
-            Output("panel-5", "children"),
+            Output("chart-url", "data"),
             Output("symbol-input", "value"),
             Output("last-symbol-store", "data"),
+            Output("chart-version-store", "data"),
         ],
         [
             Input("update-btn", "n_clicks"),
             Input("auto-update", "n_intervals"),
             Input("interval-dropdown", "value"),
+            Input("watchlist-dropdown", "value"),
+            Input("push-reload", "data"),
+        ],
+        [
+            State("symbol-input", "value"),
+            State("last-symbol-store", "data"),
+            State("chart-version-store", "data"),
         ],
-        [State("symbol-input", "value"), State("last-symbol-store", "data")],
         prevent_initial_call=False,
     )
-    def update_chart(n_clicks, n_intervals, interval, symbol, last_symbol):
-        period = "10y"
+    def update_chart(
+        n_clicks,
+        n_intervals,
+        interval,
+        selected,
+        push_version,
+        symbol,
+        last_symbol,
+        last_version,
+    ):
         ctx = dash.callback_context
-
-        # Use default symbol if not set
-        if not symbol:
-            symbol = "QQQ"
-
-        df, chart_data_json = fetch_and_process_data(symbol, period, interval)
-        if df is None:
-            return (
-                no_update,
-                no_update,
-                "No data",
-                "No data",
-                "No data",
-                "No data",
-                "No data",
-                no_update,
-                no_update,
-            )
-
-        chart_data = json.loads(chart_data_json)
-
-        # Extract instrument from the data
-        instrument = (
-            df["Instrument"].iloc[0]
-            if "Instrument" in df.columns and not df.empty
-            else symbol
-        )
-
-        # Check if this is an auto-update and if symbol hasn't changed
+        trigger_id = ""
         if ctx.triggered and len(ctx.triggered) > 0:
             trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-            if trigger_id == "auto-update" and last_symbol == instrument:
-                # Symbol hasn't changed, don't update
-                return (
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                    no_update,
-                )
 
-        df_json = df.to_json(date_format="iso", orient="split")
+        # The watchlist selection wins; fall back to the current or default symbol
+        symbol = selected or symbol or "QQQ"
 
-        data_box, panel_2, panel_3, panel_4, panel_5 = create_data_panels(
-            df, instrument
-        )
-        return (
-            chart_data,
-            df_json,
-            data_box,
-            panel_2,
-            panel_3,
-            panel_4,
-            panel_5,
-            instrument,
-            instrument,
-        )
+        # Chart data comes from the watchlist cache, which the server-side
+        # scheduler keeps warm, so callbacks never fetch on a client's behalf
+        # (apart from the first load of an instrument)
+        watchlist = get_watchlist()
+        if trigger_id == "update-btn":
+            watchlist.request_refresh()
+        try:
+            entry = watchlist.get_or_fetch(symbol, interval)
+        except UnknownInstrumentError as e:
+            # Only configured and advertised instruments are tracked
+            logging.warning(str(e))
+            return no_update, no_update, no_update, no_update
+        if entry.payload is None:
+            return no_update, no_update, no_update, no_update
+
+        instrument = entry.instrument
+        version = entry.version
+
+        # Auto-updates only redraw when the data has actually changed
+        if (
+            trigger_id == "auto-update"
+            and last_symbol == instrument
+            and last_version == version
+        ):
+            return no_update, no_update, no_update, no_update
+
+        # The browser downloads the payload itself from the precompressed
+        # cache (core.payload) rather than through the callback response
+        url = chart_data_url(entry.symbol, entry.interval, version)
+        return url, instrument, instrument, version
 
     @app.callback(
-        [
-            Output("data-box", "children", allow_duplicate=True),
-            Output("panel-2", "children", allow_duplicate=True),
-            Output("panel-3", "children", allow_duplicate=True),
-            Output("panel-4", "children", allow_duplicate=True),
-            Output("panel-5", "children", allow_duplicate=True),
-        ],
-        [Input("clicked-bar-index", "data")],
-        [State("dataframe-store", "data"), State("symbol-input", "value")],
-        prevent_initial_call=True,
+        Output("auto-update", "interval"),
+        [Input("auto-update", "n_intervals")],
+        [State("auto-update", "interval")],
     )
-    def update_panels_on_click(bar_index, df_json, symbol):
-        if bar_index is None or df_json is None:
-            return no_update, no_update, no_update, no_update, no_update
-
-        try:
-            bar_index = int(bar_index)
-        except (ValueError, TypeError):
-            return no_update, no_update, no_update, no_update, no_update
-
-        df = pd.read_json(df_json, orient="split")
-        df.index = pd.to_datetime(df.index)
-
-        if bar_index < 0 or bar_index >= len(df):
-            return no_update, no_update, no_update, no_update, no_update
-
-        # Show the clicked candle's data
-        data_box, panel_2, panel_3, panel_4, panel_5 = create_data_panels(
-            df, symbol, bar_index
-        )
-        return data_box, panel_2, panel_3, panel_4, panel_5
+    def update_poll_interval(n_intervals, current_interval):
+        # Browsers poll on the same trading-calendar cadence as the server
+        # refresh: fast near the open and close, idle outside sessions
+        interval = int(poll_seconds() * 1000)
+        if interval == current_interval:
+            return no_update
+        return interval
 
     @app.callback(
-        [
-            Output("calc-ticker", "value"),
-            Output("calc-open-price", "value"),
-            Output("calc-atr", "value"),
-        ],
-        [Input("clicked-bar-index", "data")],
-        [State("dataframe-store", "data")],
-        prevent_initial_call=True,
+        Output("watchlist-dropdown", "options"),
+        [Input("auto-update", "n_intervals")],
     )
-    def update_calculator_from_click(bar_index, df_json):
-        print(
-            f"Calculator callback triggered! bar_index={bar_index}, has_data={df_json is not None}"
-        )
-
-        if bar_index is None or df_json is None:
-            print("Calculator callback: No bar index or data, returning no_update")
-            return no_update, no_update, no_update
-
-        try:
-            bar_index = int(bar_index)
-        except (ValueError, TypeError) as e:
-            print(f"Calculator callback: Error converting bar_index: {e}")
-            return no_update, no_update, no_update
-
-        df = pd.read_json(df_json, orient="split")
-        df.index = pd.to_datetime(df.index)
-
-        if bar_index < 0 or bar_index >= len(df):
-            print(
-                f"Calculator callback: Invalid bar_index {bar_index} for df length {len(df)}"
-            )
-            return no_update, no_update, no_update
-
-        # Show the clicked candle's data
-        row = df.iloc[bar_index]
-
-        # Get ticker from instrument column in data
-        ticker = row.get("Instrument", "QQQ")
-        open_price = round(row["Open"], 2) if "Open" in row else no_update
-        atr = round(row["ATR"], 2) if "ATR" in row else no_update
-
-        print(f"Calculator auto-fill: Ticker={ticker}, Open={open_price}, ATR={atr}")
-
-        return ticker, open_price, atr
+    def update_watchlist_options(n_intervals):
+        return [{"label": symbol, "value": symbol} for symbol in get_watchlist().symbols()]
 
     @app.callback(
         Output("calc-results", "children"),
@@ -229,6 +195,8 @@ def register_python_callbacks(app):
             State("calc-bid-price", "value"),
             State("calc-ask-price", "value"),
             State("calc-iv-override", "value"),
+            State("calc-days-to-expiry", "value"),
+            State("calc-volatility", "value"),
         ],
         prevent_initial_call=True,
     )
@@ -245,6 +213,8 @@ def register_python_callbacks(app):
         bid_price,
         ask_price,
         iv_override,
+        days_to_expiry,
+        volatility,
     ):
         if n_clicks is None:
             return no_update
@@ -271,6 +241,7 @@ def register_python_callbacks(app):
             validated_atr = validate_numeric_input(atr, "ATR")
             validated_bid_price = validate_numeric_input(bid_price, "Bid Price")
             validated_ask_price = validate_numeric_input(ask_price, "Ask Price")
+            time_to_expiry, vol = parse_pricing_inputs(days_to_expiry, volatility)
 
             trade_data = {
                 "open_price": validated_open_price,
@@ -283,16 +254,11 @@ def register_python_callbacks(app):
                 "scenario": "standard",
             }
 
-            if iv_override is not None and iv_override != "":
-                try:
-                    validated_iv = float(iv_override)
-                    if validated_iv < 0:
-                        raise ValueError("IV Override must be non-negative")
-                    trade_data["custom_intrinsic_value"] = validated_iv
-                except (ValueError, TypeError):
-                    pass
+            validated_iv = parse_intrinsic_override(iv_override)
+            if validated_iv is not None:
+                trade_data["custom_intrinsic_value"] = validated_iv
 
-            results = calculate_trade_analysis(trade_data)
+            results = calculate_trade_analysis_cached(trade_data)
 
             try:
                 if not ticker or ticker.strip() == "":
@@ -315,6 +281,7 @@ def register_python_callbacks(app):
                     description=description
                     if description and description.strip()
                     else None,
+                    dedupe_window=DEFAULT_DEDUPE_WINDOW_SECONDS,
                 )
             except Exception as db_error:
                 logging.warning(f"Failed to save to database: {db_error}")
@@ -412,6 +379,51 @@ def register_python_callbacks(app):
                         ],
                         style={"padding": "4px 8px", "marginBottom": "12px"},
                     ),
+                ]
+            )
+
+            if time_to_expiry is not None:
+                pricing = price_option(
+                    option_mid,
+                    validated_current_price,
+                    validated_strike_price,
+                    time_to_expiry,
+                    option_type="put" if direction == "short" else "call",
+                    vol=vol,
+                )
+                implied = pricing["implied_vol"]
+                implied_text = "n/a" if math.isnan(implied) else f"{implied:.2%}"
+                theo_text = (
+                    "n/a"
+                    if math.isnan(pricing["theoretical_value"])
+                    else f"{pricing['theoretical_value']:.2f}"
+                )
+                basis = f"{vol:.2%} vol" if vol is not None else "implied vol"
+                output.append(
+                    html.Div(
+                        [
+                            html.Div(
+                                f"Implied Vol = {implied_text}",
+                                style={"color": "#ffffff", "fontSize": "12px"},
+                            ),
+                            html.Div(
+                                f"Theoretical Value ({basis}) = {theo_text}",
+                                style={"color": "#ffffff", "fontSize": "12px"},
+                            ),
+                            html.Div(
+                                f"Delta {pricing['delta']:.3f} | "
+                                f"Gamma {pricing['gamma']:.4f} | "
+                                f"Vega {pricing['vega'] / 100:.3f} | "
+                                f"Theta {pricing['theta'] / DAYS_PER_YEAR:.3f}/day",
+                                style={"color": "#aaaaaa", "fontSize": "11px"},
+                            ),
+                        ],
+                        style={"padding": "4px 8px", "marginBottom": "12px"},
+                    )
+                )
+
+            output.extend(
+                [
                     html.Div(
                         tradable_text,
                         style={
@@ -436,8 +448,320 @@ def register_python_callbacks(app):
                 )
             ]
 
+    @app.callback(
+        Output("screener-results", "children"),
+        [Input("screener-button", "n_clicks")],
+        [
+            State("screener-source", "value"),
+            State("calc-open-price", "value"),
+            State("calc-current-price", "value"),
+            State("calc-atr", "value"),
+            State("calc-iv-override", "value"),
+            State("calc-days-to-expiry", "value"),
+            State("calc-volatility", "value"),
+        ],
+        prevent_initial_call=True,
+    )
+    def screen_option_chain(
+        n_clicks,
+        source,
+        open_price,
+        current_price,
+        atr,
+        iv_override,
+        days_to_expiry,
+        volatility,
+    ):
+        if n_clicks is None:
+            return no_update
+
+        def error(message):
+            return html.Div(
+                f"Error: {message}",
+                style={"color": "#ff4444", "padding": "10px", "fontSize": "12px"},
+            )
+
+        row_style = {
+            "display": "grid",
+            "gridTemplateColumns": "1fr 1fr 1fr 1fr",
+            "padding": "4px 8px",
+            "borderBottom": "1px solid #404040",
+            "fontSize": "12px",
+            "color": "#ffffff",
+        }
+
+        try:
+            if not source or not source.strip():
+                raise ValueError("Option chain source is required")
+            inputs = {
+                "open_price": validate_numeric_input(open_price, "Open Price"),
+                "current_price": validate_numeric_input(current_price, "Current Price"),
+                "atr_value": validate_numeric_input(atr, "ATR"),
+                "custom_intrinsic_value": parse_intrinsic_override(iv_override),
+            }
+            inputs["time_to_expiry"], inputs["vol"] = parse_pricing_inputs(
+                days_to_expiry, volatility
+            )
+            path = resolve_chain_source(source)
+        except ValueError as e:
+            return error(str(e))
+
+        try:
+            chain = load_chain(path)
+            screened = screen_chain(chain, **inputs)
+        except Exception as e:
+            # Details (paths, upstream errors) stay in the server log
+            logging.warning(f"Option chain {source!r} failed to load: {e}")
+            return error("Could not load the option chain")
+
+        summary = html.Div(
+            f"{len(screened)} of {len(chain)} contracts tradable",
+            style={"color": "#aaaaaa", "fontSize": "12px", "padding": "4px 8px"},
+        )
+        priced = "implied_vol" in screened.columns
+        columns = 5 if priced else 4
+        row_style["gridTemplateColumns"] = " ".join(["1fr"] * columns)
+
+        def implied_vol(contract):
+            if not priced:
+                return []
+            if math.isnan(contract.implied_vol):
+                return [html.Span("--")]
+            return [html.Span(f"{contract.implied_vol:.1%}")]
+
+        header = html.Div(
+            [
+                html.Span("Strike"),
+                html.Span("Type"),
+                html.Span("Size"),
+                html.Span("Margin"),
+                *([html.Span("IV")] if priced else []),
+            ],
+            style={**row_style, "fontWeight": "bold"},
+        )
+        rows = [
+            html.Div(
+                [
+                    html.Span(f"{contract.strike:.2f}"),
+                    html.Span(contract.option_type.title()),
+                    html.Span(f"{contract.target_size:.2f}"),
+                    html.Span(f"{contract.margin:.2f}", style={"color": "#00ff88"}),
+                    *implied_vol(contract),
+                ],
+                style=row_style,
+            )
+            for contract in screened.head(25).itertuples()
+        ]
+        return [summary, header, *rows]
+
 
 def register_clientside_callbacks(app):
+    # Columnar payloads (core.columnar) are rebuilt into the row-oriented
+    # chart data here, so everything downstream sees the same structure.
+    app.clientside_callback(
+        """
+        async function loadChartData(url) {
+  if (!url) {
+    return window.dash_clientside.no_update;
+  }
+  // The server downsamples long histories to what the chart can show
+  const container = document.getElementById("main-chart");
+  const width = (container && container.clientWidth) || 800;
+  const response = await fetch(`${url}&width=${width}`);
+  if (!response.ok) {
+    return window.dash_clientside.no_update;
+  }
+  const payload = await response.json();
+  if (payload.format !== "columnar") {
+    payload.url = url;
+    return payload;
+  }
+
+  const arrayTypes = {
+    u1: Uint8Array, u2: Uint16Array, u4: Uint32Array, i4: Int32Array, f8: Float64Array,
+  };
+  const typed = (data, dtype) => {
+    const binary = atob(data);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+      bytes[i] = binary.charCodeAt(i);
+    }
+    return new arrayTypes[dtype](bytes.buffer);
+  };
+  const scaled = (column) => {
+    const divisor = Math.pow(10, column.scale);
+    return Array.from(typed(column.data, column.dtype), (value) => value / divisor);
+  };
+  const coded = (column) =>
+    Array.from(typed(column.codes, column.dtype), (code) => column.values[code]);
+  const strings = (column) => {
+    if (column.type === "list") {
+      return column.data;
+    }
+    if (column.type === "dict") {
+      return coded(column);
+    }
+    const digits = Array.from(typed(column.data, column.dtype || "f8"));
+    if (column.type === "grouped") {
+      return digits.map((value) => String(value).replace(/\\B(?=(\\d{3})+(?!\\d))/g, ","));
+    }
+    return digits.map((value) => {
+      const sign = value < 0 ? "-" : "";
+      if (!column.scale) {
+        return sign + String(Math.abs(value));
+      }
+      const text = String(Math.abs(value)).padStart(column.scale + 1, "0");
+      const point = text.length - column.scale;
+      return sign + text.slice(0, point) + "." + text.slice(point);
+    });
+  };
+
+  const times = Array.from(typed(payload.time, "u4"));
+  const chartData = {};
+  const candles = payload.candlestick;
+  const candleColumns = {
+    open: scaled(candles.open),
+    high: scaled(candles.high),
+    low: scaled(candles.low),
+    close: scaled(candles.close),
+    volume_formatted: strings(candles.volume_formatted),
+  };
+  chartData.candlestick = times.map((time, i) => ({
+    time,
+    open: candleColumns.open[i],
+    high: candleColumns.high[i],
+    low: candleColumns.low[i],
+    close: candleColumns.close[i],
+    volume_formatted: candleColumns.volume_formatted[i],
+  }));
+
+  Object.entries(payload.series).forEach(([key, column]) => {
+    const values = scaled(column.value);
+    const positions = column.index ? typed(column.index, "u4") : null;
+    const colors = column.color ? coded(column.color) : null;
+    const formatted = column.formatted ? strings(column.formatted) : null;
+    chartData[key] = values.map((value, i) => {
+      const point = { time: times[positions ? positions[i] : i], value };
+      if (colors) {
+        point.color = colors[i];
+      }
+      if (formatted) {
+        point.formatted = formatted[i];
+      }
+      return point;
+    });
+  });
+
+  if (payload.resolution) {
+    chartData.resolution = payload.resolution;
+  }
+  if (payload.panels) {
+    const columns = payload.panels.data.map(strings);
+    const length = columns.length ? columns[0].length : 0;
+    chartData.panels = {
+      version: payload.panels.version,
+      instrument: payload.panels.instrument,
+      columns: payload.panels.columns,
+      rows: Array.from({ length }, (_, i) => columns.map((column) => column[i])),
+    };
+  }
+  chartData.url = url;
+  return chartData;
+}
+        """,
+        Output("chart-data", "data"),
+        [Input("chart-url", "data")],
+    )
+
+    # Bar browsing is handled entirely in the browser: the chart payload carries
+    # the precomputed per-bar panel values (chartData.panels), so a click fills
+    # the data panels and the calculator inputs without a server round trip.
+    app.clientside_callback(
+        f"""
+        function fillPanels(barIndex, chartData) {{
+  const fields = {json.dumps(PANEL_VALUE_FIELDS)};
+  const noUpdate = fields.map(() => window.dash_clientside.no_update);
+  if (!chartData || !chartData.panels || !chartData.panels.rows.length) {{
+    return noUpdate;
+  }}
+
+  // New chart data (another version or symbol) shows its latest bar; the
+  // clicked index belongs to the previous data and is reset by renderChart
+  const triggered = (window.dash_clientside.callback_context.triggered || []).map(
+    (trigger) => trigger.prop_id
+  );
+  const fresh = triggered.includes("chart-data.data");
+  const rows = chartData.panels.rows;
+  const index = fresh || barIndex === null || barIndex === undefined ? rows.length - 1 : barIndex;
+  const row = rows[index];
+  if (!row) {{
+    return noUpdate;
+  }}
+
+  const columns = {{}};
+  chartData.panels.columns.forEach((name, i) => (columns[name] = i));
+
+  return fields.map((field) => {{
+    const value = field === "instrument" ? chartData.panels.instrument : row[columns[field]];
+    if (value === undefined || value === null) {{
+      return "{PANEL_PLACEHOLDER}";
+    }}
+    return field === "instrument" ? `${{value}} (Daily)` : value;
+  }});
+}}
+        """,
+        Output({"type": "panel-value", "field": ALL}, "children"),
+        [Input("clicked-bar-index", "data"), Input("chart-data", "data")],
+    )
+
+    app.clientside_callback(
+        """
+        function fillCalculator(barIndex, chartData) {
+  const noUpdate = window.dash_clientside.no_update;
+  if (barIndex === null || barIndex === undefined || !chartData || !chartData.panels) {
+    return [noUpdate, noUpdate, noUpdate];
+  }
+
+  const row = chartData.panels.rows[barIndex];
+  const bar = chartData.candlestick && chartData.candlestick[barIndex];
+  if (!row || !bar) {
+    return [noUpdate, noUpdate, noUpdate];
+  }
+
+  // A downsampled point stands for several bars (its candle opens with the
+  // first, its panel row is the last), so only single bars are copied: a
+  // fully resolved chart or a window refined to full resolution
+  const resolution = chartData.resolution;
+  const single =
+    !resolution ||
+    resolution.points >= resolution.bars ||
+    (chartData.fullRanges || []).some(
+      (range) => range.start <= bar.time && bar.time <= range.end
+    );
+  if (!single) {
+    return [noUpdate, noUpdate, noUpdate];
+  }
+
+  const columns = chartData.panels.columns;
+  const value = (name) => row[columns.indexOf(name)];
+
+  return [
+    chartData.panels.instrument || "QQQ",
+    parseFloat(value("open")),
+    parseFloat(value("atr")),
+  ];
+}
+        """,
+        [
+            Output("calc-ticker", "value"),
+            Output("calc-open-price", "value"),
+            Output("calc-atr", "value"),
+        ],
+        [Input("clicked-bar-index", "data")],
+        [State("chart-data", "data")],
+        prevent_initial_call=True,
+    )
+
     app.clientside_callback(
         """
         function renderChart(chartData, currentIndex) {
@@ -469,8 +793,16 @@ def register_clientside_callbacks(app):
     wickUpColor: "#00ff88",
   });
   candleSeries.setData(chartData.candlestick);
-  
-  let clickedIndex = currentIndex;
+
+  // Series handles are shared with the push stream so it can apply delta bars
+  const seriesByKey = { candlestick: candleSeries };
+  window.ticonChart = { chartData, series: seriesByKey };
+
+  // A clicked index only means something for the data it was clicked on
+  const triggered = (window.dash_clientside.callback_context.triggered || []).map(
+    (trigger) => trigger.prop_id
+  );
+  let clickedIndex = triggered.includes("chart-data.data") ? null : currentIndex;
   chart.subscribeClick((param) => {
     if (param.time) {
       const barIndex = chartData.candlestick.findIndex(bar => bar.time === param.time);
@@ -485,6 +817,7 @@ def register_clientside_callbacks(app):
     if (chartData[key]) {
       const series = chart.addLineSeries({ color, lineWidth: 2, ...options });
       series.setData(chartData[key]);
+      seriesByKey[key] = series;
     }
   }
 
@@ -506,7 +839,8 @@ def register_clientside_callbacks(app):
         grid: { vertLines: { color: "#2b2b2b" }, horzLines: { color: "#2b2b2b" } },
         timeScale: { visible: false },
       });
-      momentumChart.addHistogramSeries({ color: "#008000" }).setData(chartData.momentum);
+      seriesByKey.momentum = momentumChart.addHistogramSeries({ color: "#008000" });
+      seriesByKey.momentum.setData(chartData.momentum);
     }
   }
 
@@ -520,7 +854,8 @@ def register_clientside_callbacks(app):
         grid: { vertLines: { color: "#2b2b2b" }, horzLines: { color: "#2b2b2b" } },
         timeScale: { visible: false },
       });
-      squeezeChart.addHistogramSeries({ color: "#0000FF" }).setData(chartData.squeeze);
+      seriesByKey.squeeze = squeezeChart.addHistogramSeries({ color: "#0000FF" });
+      seriesByKey.squeeze.setData(chartData.squeeze);
     }
   }
 
@@ -534,13 +869,239 @@ def register_clientside_callbacks(app):
         grid: { vertLines: { color: "#2b2b2b" }, horzLines: { color: "#2b2b2b" } },
         timeScale: { visible: true },
       });
-      volumeChart.addHistogramSeries({ color: "#26a69a" }).setData(chartData.volume);
+      seriesByKey.volume = volumeChart.addHistogramSeries({ color: "#26a69a" });
+      seriesByKey.volume.setData(chartData.volume);
     }
   }
 
+  // A downsampled history is refined where the user zooms: the visible
+  // window is fetched at the resolution the chart width allows (full
+  // resolution once it fits) and spliced into every series and the panels.
+  const resolution = chartData.resolution;
+  if (resolution && resolution.points < resolution.bars && chartData.url) {
+    const refined = [];
+    let timer = null;
+
+    async function refine(from, to) {
+      const span = to - from;
+      const covered = refined.some(
+        (view) => view.from <= from && view.to >= to && (view.full || span > view.span / 2)
+      );
+      if (covered || window.ticonChart.chartData !== chartData) {
+        return;
+      }
+
+      // Widened to whole points: each one covers the bars after the previous
+      // point up to its own time, so the fetched bars replace exactly the
+      // points they cover and none straddle the edges
+      const shown = chartData.candlestick;
+      const firstPoint = shown.findIndex((bar) => bar.time >= from);
+      if (firstPoint < 0) {
+        return;
+      }
+      const lastPoint = shown.findIndex((bar) => bar.time >= to);
+      const start = firstPoint > 0 ? shown[firstPoint - 1].time + 1 : 0;
+      const end = lastPoint < 0 ? shown[shown.length - 1].time : shown[lastPoint].time;
+
+      const url = new URL(chartData.url, window.location.href);
+      url.searchParams.set("format", "json");
+      url.searchParams.set("width", container.clientWidth || 800);
+      url.searchParams.set("start", start);
+      url.searchParams.set("end", end);
+      const response = await fetch(url.toString());
+      if (!response.ok || window.ticonChart.chartData !== chartData) {
+        return;
+      }
+      const detail = await response.json();
+      const fetched = detail.resolution;
+      if (!fetched || !detail.candlestick.length) {
+        return;
+      }
+      const full = fetched.points >= fetched.bars;
+      refined.push({ from, to, span, full });
+      if (full) {
+        // Bars here are single bars again (see fillCalculator)
+        chartData.fullRanges = [
+          ...(chartData.fullRanges || []),
+          { start: fetched.start, end: fetched.end },
+        ];
+      }
+
+      const candles = chartData.candlestick;
+      const position = (test) => {
+        const index = candles.findIndex(test);
+        return index < 0 ? candles.length : index;
+      };
+      const first = position((bar) => bar.time >= fetched.start);
+      const after = position((bar) => bar.time > fetched.end);
+
+      Object.entries(detail).forEach(([key, points]) => {
+        if (!Array.isArray(points)) {
+          return;
+        }
+        const current = chartData[key] || [];
+        chartData[key] = [
+          ...current.filter((point) => point.time < fetched.start),
+          ...points,
+          ...current.filter((point) => point.time > fetched.end),
+        ];
+        if (seriesByKey[key]) {
+          seriesByKey[key].setData(chartData[key]);
+        }
+      });
+      if (chartData.panels && detail.panels) {
+        chartData.panels.rows.splice(first, after - first, ...detail.panels.rows);
+      }
+      chart.timeScale().setVisibleRange({ from, to });
+    }
+
+    chart.timeScale().subscribeVisibleTimeRangeChange((range) => {
+      clearTimeout(timer);
+      if (range) {
+        timer = setTimeout(() => refine(range.from, range.to), 300);
+      }
+    });
+  }
+
   return ["", clickedIndex];
 }
         """,
         [Output("main-chart", "children"), Output("clicked-bar-index", "data")],
         [Input("chart-data", "data"), Input("clicked-bar-index", "data")],
     )
+
+    # Push updates: one EventSource per tab streams delta bars for the shown
+    # instrument (see core.push). While it is connected the auto-update
+    # interval is disabled; if it drops, polling resumes until it reconnects.
+    app.clientside_callback(
+        f"""
+        function connectPush(version, symbol, interval, chartData) {{
+  const dc = window.dash_clientside;
+  if (!window.EventSource || !version || !chartData || !chartData.candlestick) {{
+    return dc.no_update;
+  }}
+
+  // Versions applied from the stream itself keep the existing connection
+  const key = `${{symbol}}|${{interval}}`;
+  const current = window.ticonPush;
+  if (current && current.readyState !== EventSource.CLOSED) {{
+    if (current.ticonKey === key && current.ticonData === chartData) {{
+      return dc.no_update;
+    }}
+    current.close();
+  }}
+
+  if (window.ticonPushRetry) {{
+    clearTimeout(window.ticonPushRetry);
+    window.ticonPushRetry = null;
+  }}
+  let latest = version;
+
+  function mergePoints(points, updates) {{
+    updates.forEach((point) => {{
+      const last = points.length ? points[points.length - 1].time : -Infinity;
+      if (point.time === last) {{
+        points[points.length - 1] = point;
+      }} else if (point.time > last) {{
+        points.push(point);
+      }}
+    }});
+  }}
+
+  function applyDelta(delta) {{
+    const chart = window.ticonChart;
+    if (!chart || chart.chartData !== chartData) {{
+      return false;
+    }}
+    if (delta.reset) {{
+      return false;
+    }}
+
+    // delta.start counts full-resolution bars; the chart may be downsampled,
+    // so the first resent bar is found by time instead
+    const candles = chartData.candlestick;
+    const resent = delta.series.candlestick || [];
+    const newest = candles.length ? candles[candles.length - 1].time : -Infinity;
+    if (resent.length && resent[0].time > newest) {{
+      return false;
+    }}
+    const index = resent.length
+      ? candles.findIndex((bar) => bar.time >= resent[0].time)
+      : -1;
+    const start = index < 0 ? candles.length : index;
+
+    Object.entries(delta.series).forEach(([key, points]) => {{
+      const series = chart.series[key];
+      const current = chartData[key] || [];
+      const last = current.length ? current[current.length - 1].time : -Infinity;
+      points.forEach((point) => {{
+        // The chart can only replace its last bar or append after it
+        if (series && point.time >= last) {{
+          series.update(point);
+        }}
+      }});
+      mergePoints(current, points);
+      chartData[key] = current;
+    }});
+
+    if (chartData.panels) {{
+      chartData.panels.rows.splice(start, delta.panels.length, ...delta.panels);
+      chartData.panels.version = delta.version;
+    }}
+    return true;
+  }}
+
+  function open() {{
+    const candles = chartData.candlestick;
+    const since = candles.length ? candles[candles.length - 1].time : "";
+    const params = new URLSearchParams({{
+      symbol: symbol || "",
+      interval: interval || "",
+      version: latest,
+      since: since,
+    }});
+    const source = new EventSource("{STREAM_ROUTE}?" + params.toString());
+    source.ticonKey = key;
+    source.ticonData = chartData;
+    window.ticonPush = source;
+
+    source.addEventListener("delta", (event) => {{
+      const delta = JSON.parse(event.data);
+      latest = delta.version;
+      if (applyDelta(delta)) {{
+        dc.set_props("chart-version-store", {{ data: delta.version }});
+      }} else {{
+        // Too far behind (or a different chart): reload through update_chart
+        dc.set_props("push-reload", {{ data: delta.version }});
+      }}
+    }});
+    source.onopen = () => dc.set_props("auto-update", {{ disabled: true }});
+    source.onerror = () => {{
+      // Poll while the stream is down. The browser reopens streams the server
+      // ended itself; a refused one (503) is closed for good, so try again
+      // later, jittered so refused tabs do not all come back at once.
+      dc.set_props("auto-update", {{ disabled: false }});
+      if (source.readyState === EventSource.CLOSED && window.ticonPush === source) {{
+        const delay = {REFUSED_RETRY_SECONDS * 1000} * (0.5 + Math.random());
+        window.ticonPushRetry = setTimeout(() => {{
+          window.ticonPushRetry = null;
+          if (window.ticonPush === source) {{
+            open();
+          }}
+        }}, delay);
+      }}
+    }};
+  }}
+
+  open();
+  return symbol;
+}}
+        """,
+        Output("push-status", "data"),
+        [Input("chart-version-store", "data")],
+        [
+            State("watchlist-dropdown", "value"),
+            State("interval-dropdown", "value"),
+            State("chart-data", "data"),
+        ],
+    )
@@ -0,0 +1,127 @@
+import base64
+import re
+import numpy as np
+
+# Decimal places each series' values are rounded to by fetch_and_process_data
+SERIES_DECIMALS = {
+    "sma20": 3,
+    "bb_upper": 3,
+    "bb_middle": 3,
+    "bb_lower": 3,
+    "atr": 3,
+    "momentum": 3,
+    "squeeze": 3,
+    "mean": 2,
+}
+CANDLE_DECIMALS = 2
+
+_DECIMAL = re.compile(r"^-?\d+(\.\d+)?$")
+_GROUPED = re.compile(r"^-?\d{1,3}(,\d{3})*$")
+# String columns with at most this share of distinct values are dictionary coded
+DICTIONARY_MAX_RATIO = 0.25
+
+
+def _b64(values, dtype):
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode()
+
+
+def _scaled(values, decimals):
+    """Fixed-point ints that divide back to exactly the same doubles"""
+    scaled = np.rint(np.asarray(values, dtype=float) * 10**decimals)
+    if np.abs(scaled).max(initial=0) < 2**31:
+        return {"scale": decimals, "dtype": "i4", "data": _b64(scaled, "<i4")}
+    return {"scale": decimals, "dtype": "f8", "data": _b64(scaled, "<f8")}
+
+
+def _codes(values):
+    """Dictionary coding: distinct values plus a small int code per item"""
+    uniques, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    dtype = "<u1" if len(uniques) <= 256 else "<u2"
+    return {"values": uniques.tolist(), "codes": _b64(codes, dtype), "dtype": dtype[1:]}
+
+
+def encode_strings(values):
+    """
+    Encode a column of display strings as compactly as it allows
+
+    Plain decimals ("400.38", "-1.240") become fixed-point ints with the
+    shared number of decimals, comma-grouped integers ("33,231,874") become
+    ints, repetitive strings are dictionary coded, and anything else is sent
+    as a plain list. Every encoding decodes back to the identical strings.
+    """
+    if values and all(isinstance(value, str) for value in values):
+        if all(_DECIMAL.match(value) for value in values):
+            decimals = {len(value.partition(".")[2]) for value in values}
+            # "-0.00" cannot survive the round trip through an integer
+            negative_zero = any(
+                value.startswith("-") and not value.strip("-0.") for value in values
+            )
+            if len(decimals) == 1 and not negative_zero:
+                digits = [int(value.replace(".", "")) for value in values]
+                return {"type": "decimal", **_scaled(digits, 0), "scale": decimals.pop()}
+        if all(_GROUPED.match(value) for value in values):
+            digits = [int(value.replace(",", "")) for value in values]
+            return {"type": "grouped", "data": _b64(digits, "<f8")}
+        if len(set(values)) <= DICTIONARY_MAX_RATIO * len(values):
+            return {"type": "dict", **_codes(values)}
+    return {"type": "list", "data": list(values)}
+
+
+def encode_chart_data(chart_data):
+    """
+    Columnar form of a chart payload
+
+    The candle times form one shared axis (Uint32 seconds); other series
+    carry Uint32 positions into it only where they skip bars. Values are
+    fixed-point Int32 columns, colours are palette codes, and the panel table
+    is encoded column by column with encode_strings. The browser rebuilds
+    the exact row-oriented payload (see decodeChartData in core.callbacks).
+    """
+    candles = chart_data.get("candlestick", [])
+    times = [bar["time"] for bar in candles]
+    position = {time: i for i, time in enumerate(times)}
+
+    encoded = {
+        "format": "columnar",
+        "time": _b64(times, "<u4"),
+        "candlestick": {
+            field: _scaled([bar[field] for bar in candles], CANDLE_DECIMALS)
+            for field in ("open", "high", "low", "close")
+        },
+        "series": {},
+    }
+    encoded["candlestick"]["volume_formatted"] = encode_strings(
+        [bar.get("volume_formatted", "") for bar in candles]
+    )
+
+    for key, points in chart_data.items():
+        if key in ("candlestick", "panels") or not isinstance(points, list):
+            continue
+        column = {}
+        point_times = [point["time"] for point in points]
+        if point_times != times:
+            column["index"] = _b64([position[time] for time in point_times], "<u4")
+        decimals = SERIES_DECIMALS.get(key, 0)
+        column["value"] = _scaled([point["value"] for point in points], decimals)
+        if points and "color" in points[0]:
+            column["color"] = _codes([point["color"] for point in points])
+        if points and "formatted" in points[0]:
+            column["formatted"] = encode_strings([point["formatted"] for point in points])
+        encoded["series"][key] = column
+
+    if "resolution" in chart_data:
+        encoded["resolution"] = chart_data["resolution"]
+
+    panels = chart_data.get("panels")
+    if panels is not None:
+        rows = panels["rows"]
+        encoded["panels"] = {
+            "version": panels["version"],
+            "instrument": panels.get("instrument"),
+            "columns": panels["columns"],
+            "data": [
+                encode_strings([row[i] for row in rows])
+                for i in range(len(panels["columns"]))
+            ],
+        }
+    return encoded
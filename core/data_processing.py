@@ -1,8 +1,9 @@
 # data_processing.py with FIXED mean and volume
 
+import time
 import pandas as pd
-import json
 from .ib_client import IBClient
+from .metrics import observe, timed
 
 
 def format_value(value, decimals=3):
@@ -35,6 +36,120 @@ def format_volume(volume_value):
         return str(volume_value), str(volume_value)
 
 
+# Per-bar panel fields: (key, source column, format spec)
+PANEL_NUMERIC_FIELDS = [
+    ("price", "Close", ".2f"),
+    ("open", "Open", ".2f"),
+    ("high", "High", ".2f"),
+    ("low", "Low", ".2f"),
+    ("close", "Close", ".2f"),
+    ("mean", "Mean", ".2f"),
+    ("sma", "SMA_20", ".2f"),
+    ("trigger", "BB_middle", ".2f"),
+    ("trigger_avg", "BB_middle_avg", ".2f"),
+    ("upper_band", "BB_upper", ".2f"),
+    ("lower_band", "BB_lower", ".2f"),
+    ("momentum_histogram", "Momentum_Histogram", ".3f"),
+    ("squeeze_dots", "Squeeze_Dots", ".0f"),
+    ("squeeze", "Squeeze", ".0f"),
+    ("momentum", "Momentum", ".2f"),
+    ("range", "Range", ".2f"),
+    ("atr", "ATR", ".2f"),
+]
+
+PANEL_FIELDS = [
+    "instrument",
+    "week",
+    "date",
+    *[key for key, _, _ in PANEL_NUMERIC_FIELDS],
+    "volume",
+    "volume_abbreviated",
+]
+
+_panel_table_cache = {}
+
+
+def dataset_version(df):
+    """Cheap fingerprint of a processed bar frame, used to key derived tables"""
+    if df is None or df.empty:
+        return "empty"
+    last = df.iloc[-1]
+    return (
+        f"{len(df)}:{df.index[0].isoformat()}:{df.index[-1].isoformat()}:"
+        f"{last.get('Close')}:{last.get('Volume')}"
+    )
+
+
+def _numeric_column(df, column):
+    """A panel source column as floats, 0 when the column is absent"""
+    if column not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[column], errors="coerce")
+
+
+def build_panel_table(df, symbol=None):
+    """
+    Precompute the formatted data panel values for every bar
+
+    Returns a DataFrame of display strings, one row per bar position and one
+    column per PANEL_FIELDS key, so rendering a panel is a row lookup.
+    """
+    index = pd.DatetimeIndex(df.index)
+    table = pd.DataFrame(index=pd.RangeIndex(len(df)))
+
+    if "Instrument" in df.columns:
+        table["instrument"] = df["Instrument"].astype(str).to_numpy()
+    else:
+        table["instrument"] = symbol
+
+    iso_week = index.isocalendar().week.to_numpy()
+    table["week"] = [f"{week}/{year}" for week, year in zip(iso_week, index.year)]
+    table["date"] = index.strftime("%m/%d/%Y")
+
+    for key, column, spec in PANEL_NUMERIC_FIELDS:
+        values = _numeric_column(df, column)
+        if key == "mean":
+            # Mean is shown as 0 rather than nan when missing
+            values = values.fillna(0)
+        table[key] = values.map(lambda x: format(x, spec)).to_numpy()
+
+    volumes = [format_volume(value) for value in df["Volume"]]
+    table["volume"] = [full for full, _ in volumes]
+    table["volume_abbreviated"] = [abbreviated for _, abbreviated in volumes]
+
+    return table[PANEL_FIELDS]
+
+
+def get_panel_table(df, symbol=None):
+    """build_panel_table, computed once per dataset version"""
+    key = (dataset_version(df), symbol)
+    table = _panel_table_cache.get(key)
+    if table is None:
+        table = build_panel_table(df, symbol)
+        _panel_table_cache.clear()
+        _panel_table_cache[key] = table
+    return table
+
+
+def panel_table_to_store(table, version=None):
+    """
+    Compact column/row layout of a panel table for a dcc.Store
+
+    The instrument is the same on every bar, so it is sent once rather than
+    as a column.
+    """
+    instrument = None
+    if "instrument" in table.columns:
+        instrument = table["instrument"].iloc[-1] if len(table) else None
+        table = table.drop(columns="instrument")
+    return {
+        "version": version,
+        "instrument": instrument,
+        "columns": list(table.columns),
+        "rows": table.to_numpy().tolist(),
+    }
+
+
 def fetch_and_process_data(symbol=None, period=None, interval=None):
     """Fetch stock data from Render server and prepare it for charting"""
     print("Fetching and processing data from Render server")
@@ -43,12 +158,14 @@ def fetch_and_process_data(symbol=None, period=None, interval=None):
         print("Start fetching data from Render server")
         # Fetch data from Render server
         ib_client = IBClient()
-        df = ib_client.get_historical_data()
+        df = ib_client.get_historical_data(symbol)
         print(f"Retrieved {len(df)} bars")
 
         if df.empty:
             return None, "No data available from server"
 
+        started = time.perf_counter()
+
         # FIXED: Correct column mapping
         column_mapping = {
             "open": "Open",
@@ -108,6 +225,8 @@ def fetch_and_process_data(symbol=None, period=None, interval=None):
 
         # Make sure index is datetime
         df.index = pd.to_datetime(df.index)
+        observe("format", time.perf_counter() - started)
+        started = time.perf_counter()
 
         # Initialize chart_data
         chart_data = {
@@ -207,7 +326,16 @@ def fetch_and_process_data(symbol=None, period=None, interval=None):
                     }
                 )
 
-        return df, json.dumps(chart_data)
+        observe("chart_build", time.perf_counter() - started)
+
+        # Per-bar panel values travel with the chart so the browser can fill
+        # the data panels on click without a server round trip
+        with timed("panel_render"):
+            chart_data["panels"] = panel_table_to_store(
+                get_panel_table(df, symbol), dataset_version(df)
+            )
+
+        return df, chart_data
 
     except Exception as e:
         import traceback
@@ -4,11 +4,39 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from contextlib import contextmanager
+from core.metrics import timed
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 DB_PATH = Path('data/trades.db')
 
+DEFAULT_CHUNK_SIZE = 5000
+
+# Identical journal writes within this many seconds are collapsed into one row
+DEFAULT_DEDUPE_WINDOW_SECONDS = 60
+
+def get_journal_version():
+    """
+    Return a value that changes whenever the journal is modified
+
+    Read from the database itself, so writes from other worker processes
+    or the journal_io CLI are seen too: AUTOINCREMENT never reuses ids, so
+    the last id handed out changes on every insert, and triggers created by
+    init_database bump a one-row counter on every update and delete. None
+    when the journal does not exist yet.
+    """
+    try:
+        with get_connection() as conn:
+            row = conn.execute('''
+                SELECT
+                    (SELECT seq FROM sqlite_sequence
+                     WHERE name = 'trade_calculator_results'),
+                    (SELECT changes FROM journal_version WHERE id = 1)
+            ''').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return tuple(row)
+
 def init_database():
     """Initialize the database schema"""
     DB_PATH.parent.mkdir(exist_ok=True)
@@ -55,6 +83,40 @@ def init_database():
             )
         ''')
         
+        # Indexes backing the analytics GROUP BY queries
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_results_ticker_direction
+            ON trade_calculator_results (ticker, direction)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_results_trade_date
+            ON trade_calculator_results (trade_date)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_results_created_at
+            ON trade_calculator_results (created_at)
+        ''')
+        
+        # Update/delete counter read by get_journal_version; inserts already
+        # move sqlite_sequence, so bulk imports pay no trigger per row
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS journal_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                changes INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute(
+            'INSERT OR IGNORE INTO journal_version (id, changes) VALUES (1, 0)'
+        )
+        for event in ('UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS journal_version_after_{event.lower()}
+                AFTER {event} ON trade_calculator_results
+                BEGIN
+                    UPDATE journal_version SET changes = changes + 1 WHERE id = 1;
+                END
+            ''')
+        
         conn.commit()
         logging.info("✓ Database initialized at data/trades.db")
 
@@ -82,9 +144,16 @@ def insert_trade_result(
     tradable_flag,
     inputs_dict,
     market_cycle_date=None,
-    description=None
+    description=None,
+    dedupe_window=None
 ):
-    """Insert a new trade calculation result"""
+    """
+    Insert a new trade calculation result
+    
+    When dedupe_window is set (in seconds), an identical result saved within
+    that window is reused and its id returned instead of inserting a duplicate.
+    """
+    inputs_json = json.dumps(inputs_dict, sort_keys=True)
     
     # Calculate option mid
     option_mid = (option_bid + option_ask) / 2
@@ -95,7 +164,20 @@ def insert_trade_result(
     iv_formula = f"IV = {intrinsic_value:.2f}"
     ev_formula = f"{option_mid:.2f} - {intrinsic_value:.2f} = {extrinsic_value:.2f}"
     
-    with get_connection() as conn:
+    with timed("db_insert"), get_connection() as conn:
+        # The duplicate check and the insert share one write transaction, so
+        # two concurrent identical saves cannot both miss the check
+        conn.execute('BEGIN IMMEDIATE')
+        if dedupe_window:
+            existing_id = find_duplicate_result(
+                trade_date, ticker, direction, scenario, description,
+                market_cycle_date, inputs_json, dedupe_window, conn=conn
+            )
+            if existing_id is not None:
+                conn.rollback()
+                logging.info(f"↺ Skipped duplicate of trade result #{existing_id} for {ticker} {direction}")
+                return existing_id
+        
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -111,7 +193,7 @@ def insert_trade_result(
             description, target_price_formula, target_price_value,
             option_bid, option_ask, option_mid, option_formula,
             intrinsic_value, extrinsic_value, target_size,
-            iv_formula, ev_formula, tradable_flag, json.dumps(inputs_dict)
+            iv_formula, ev_formula, tradable_flag, inputs_json
         ))
         
         conn.commit()
@@ -120,46 +202,201 @@ def insert_trade_result(
         logging.info(f"✓ Saved trade result #{trade_id} for {ticker} {direction}")
         return trade_id
 
-def fetch_recent_results(limit=20):
-    """Fetch recent trade calculation results"""
+def find_duplicate_result(trade_date, ticker, direction, scenario, description,
+                          market_cycle_date, inputs_json, window_seconds, conn=None):
+    """
+    Return the id of an identical result saved in the last window_seconds, if any
+
+    Runs on `conn` when given, so a caller can check and insert in one
+    transaction.
+    """
+    if conn is None:
+        with get_connection() as conn:
+            return find_duplicate_result(
+                trade_date, ticker, direction, scenario, description,
+                market_cycle_date, inputs_json, window_seconds, conn=conn
+            )
+    
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id FROM trade_calculator_results
+        WHERE created_at >= datetime('now', ?)
+          AND trade_date = ? AND ticker = ? AND direction = ? AND scenario = ?
+          AND description IS ? AND market_cycle_date IS ? AND inputs_json = ?
+        ORDER BY id DESC
+        LIMIT 1
+    ''', (
+        f'-{int(window_seconds)} seconds', trade_date, ticker, direction,
+        scenario, description, market_cycle_date, inputs_json
+    ))
+    row = cursor.fetchone()
+    return row['id'] if row else None
+
+RESULT_COLUMNS = (
+    'id', 'created_at', 'trade_date', 'market_cycle_date', 'ticker',
+    'direction', 'scenario', 'description', 'target_price_formula',
+    'target_price_value', 'option_bid', 'option_ask', 'option_mid',
+    'option_formula', 'intrinsic_value', 'extrinsic_value', 'target_size',
+    'iv_formula', 'ev_formula', 'tradable_flag', 'notes', 'inputs_json'
+)
+
+# NumPy dtypes used when results are returned as a record array
+RESULT_DTYPES = {
+    'id': 'i8',
+    'target_price_value': 'f8',
+    'option_bid': 'f8',
+    'option_ask': 'f8',
+    'option_mid': 'f8',
+    'intrinsic_value': 'f8',
+    'extrinsic_value': 'f8',
+    'target_size': 'f8',
+    'tradable_flag': '?',
+}
+
+
+def _resolve_columns(columns):
+    """Validate a column projection against the journal schema"""
+    if columns is None:
+        return list(RESULT_COLUMNS)
+    
+    columns = list(columns)
+    unknown = [col for col in columns if col not in RESULT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown trade result columns: {', '.join(unknown)}")
+    if not columns:
+        raise ValueError("At least one column must be selected")
+    return columns
+
+# Orderings a results query may use; created_at keeps imported rows (which
+# get new ids) in the order they were originally saved
+RESULT_ORDERINGS = {
+    'id': 'id',
+    'created_at': 'created_at {order}, id',
+}
+
+def _build_results_query(columns, ticker=None, direction=None, after_id=None,
+                         order='ASC', limit=None, order_by='id'):
+    """Build a projected SELECT over trade_calculator_results"""
+    clauses = []
+    params = []
+    
+    if ticker is not None:
+        clauses.append('ticker = ?')
+        params.append(ticker)
+    if direction is not None:
+        clauses.append('direction = ?')
+        params.append(direction)
+    if after_id is not None:
+        clauses.append('id > ?')
+        params.append(after_id)
+    
+    order = order.upper()
+    if order not in ('ASC', 'DESC'):
+        raise ValueError("order must be 'ASC' or 'DESC'")
+    
+    if order_by not in RESULT_ORDERINGS:
+        raise ValueError(f"order_by must be one of: {', '.join(RESULT_ORDERINGS)}")
+    
+    query = f"SELECT {', '.join(columns)} FROM trade_calculator_results"
+    if clauses:
+        query += ' WHERE ' + ' AND '.join(clauses)
+    # Ordering by the INTEGER PRIMARY KEY walks the rowid b-tree directly,
+    # so streaming never needs a sort step; created_at uses its index
+    query += f' ORDER BY {RESULT_ORDERINGS[order_by].format(order=order)} {order}'
+    if limit is not None:
+        query += ' LIMIT ?'
+        params.append(limit)
+    
+    return query, params
+
+def iter_result_chunks(columns=None, chunk_size=DEFAULT_CHUNK_SIZE, ticker=None,
+                       direction=None, after_id=None, order='ASC', limit=None,
+                       order_by='id'):
+    """
+    Stream trade calculation results as lists of tuples, chunk_size rows at a time.
+    Only the requested columns are read, and at most one chunk is held in memory.
+    """
+    columns = _resolve_columns(columns)
+    query, params = _build_results_query(
+        columns, ticker, direction, after_id, order, limit, order_by
+    )
+    
     with get_connection() as conn:
+        # Plain tuples are cheaper than sqlite3.Row for bulk reads
+        conn.row_factory = None
         cursor = conn.cursor()
+        cursor.arraysize = chunk_size
+        cursor.execute(query, params)
         
-        cursor.execute('''
-            SELECT * FROM trade_calculator_results
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        rows = cursor.fetchall()
-        
-        results = []
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+def iter_results(columns=None, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """Stream trade calculation results one dict per row"""
+    columns = _resolve_columns(columns)
+    
+    for rows in iter_result_chunks(columns, chunk_size, **filters):
         for row in rows:
-            results.append({
-                'id': row['id'],
-                'created_at': row['created_at'],
-                'trade_date': row['trade_date'],
-                'market_cycle_date': row['market_cycle_date'],
-                'ticker': row['ticker'],
-                'direction': row['direction'],
-                'scenario': row['scenario'],
-                'description': row['description'],
-                'target_price_formula': row['target_price_formula'],
-                'target_price_value': row['target_price_value'],
-                'option_bid': row['option_bid'],
-                'option_ask': row['option_ask'],
-                'option_mid': row['option_mid'],
-                'option_formula': row['option_formula'],
-                'intrinsic_value': row['intrinsic_value'],
-                'extrinsic_value': row['extrinsic_value'],
-                'target_size': row['target_size'],
-                'iv_formula': row['iv_formula'],
-                'ev_formula': row['ev_formula'],
-                'tradable_flag': bool(row['tradable_flag']),
-                'inputs_json': row['inputs_json']
-            })
-        
-        return results
+            result = dict(zip(columns, row))
+            if 'tradable_flag' in result:
+                result['tradable_flag'] = bool(result['tradable_flag'])
+            yield result
+
+def iter_results_frames(columns=None, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """Stream trade calculation results as pandas DataFrames of chunk_size rows"""
+    import pandas as pd
+    
+    columns = _resolve_columns(columns)
+    
+    for rows in iter_result_chunks(columns, chunk_size, **filters):
+        frame = pd.DataFrame.from_records(rows, columns=columns)
+        if 'tradable_flag' in frame.columns:
+            frame['tradable_flag'] = frame['tradable_flag'].fillna(0).astype(bool)
+        yield frame
+
+def fetch_results_frame(columns=None, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """Fetch trade calculation results into a single pandas DataFrame"""
+    import pandas as pd
+    
+    columns = _resolve_columns(columns)
+    frames = list(iter_results_frames(columns, chunk_size, **filters))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+def fetch_results_records(columns=None, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """Fetch trade calculation results into a NumPy record array"""
+    import numpy as np
+    
+    columns = _resolve_columns(columns)
+    dtype = [(col, RESULT_DTYPES.get(col, 'O')) for col in columns]
+    
+    chunks = []
+    for rows in iter_result_chunks(columns, chunk_size, **filters):
+        chunk = np.empty(len(rows), dtype=dtype)
+        for i, col in enumerate(columns):
+            values = [row[i] for row in rows]
+            if chunk.dtype[col].kind == 'f':
+                values = [np.nan if v is None else v for v in values]
+            elif chunk.dtype[col].kind in 'ib':
+                values = [0 if v is None else v for v in values]
+            chunk[col] = values
+        chunks.append(chunk)
+    
+    if not chunks:
+        return np.rec.array(np.empty(0, dtype=dtype))
+    return np.rec.array(np.concatenate(chunks))
+
+def fetch_recent_results(limit=20, columns=None):
+    """Fetch recent trade calculation results, newest first (all of them for limit=None)"""
+    chunk_size = DEFAULT_CHUNK_SIZE if limit is None else max(limit, 1)
+    return list(iter_results(
+        columns, chunk_size=chunk_size, order='DESC', limit=limit,
+        order_by='created_at'
+    ))
 
 def delete_trade_result(trade_id):
     """Delete a trade result by ID"""
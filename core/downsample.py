@@ -0,0 +1,220 @@
+import math
+import numpy as np
+from core.data_processing import format_volume
+
+# Chart points per pixel of chart width; the chart cannot show more than this
+POINTS_PER_PIXEL = 1
+# Point budgets are rounded up to a multiple of this, so the handful of
+# common chart widths share a few cached views
+POINT_STEP = 256
+MIN_POINTS = 256
+MAX_POINTS = 4096
+# Oscillators drawn as histograms; these keep the largest bar of each bucket
+HISTOGRAM_KEYS = ("momentum", "squeeze")
+# Additive histograms; these show each bucket's total, like the candle volume
+SUMMED_KEYS = ("volume",)
+
+
+def target_points(width):
+    """Point budget for a chart `width` pixels wide, or None for no limit"""
+    if not width or width <= 0:
+        return None
+    points = math.ceil(width * POINTS_PER_PIXEL / POINT_STEP) * POINT_STEP
+    return min(max(points, MIN_POINTS), MAX_POINTS)
+
+
+def _bucket_ends(count, buckets):
+    """
+    Exclusive end position of each of `buckets` runs of bars over `count` bars
+
+    The last bar is always a bucket of its own, so the newest (still forming)
+    bar is sent as is and push deltas can replace it.
+    """
+    edges = np.linspace(0, count - 1, buckets, dtype=int)[1:]
+    return np.append(edges, count)
+
+
+def _aggregate_candles(candles, ends):
+    """One OHLC bar per bucket, labelled with the time of its last bar"""
+    aggregated = []
+    start = 0
+    for end in ends:
+        bucket = candles[start:end]
+        last = bucket[-1]
+        bar = {
+            "time": last["time"],
+            "open": bucket[0]["open"],
+            "high": max(candle["high"] for candle in bucket),
+            "low": min(candle["low"] for candle in bucket),
+            "close": last["close"],
+        }
+        if "volume_formatted" in last:
+            try:
+                volume = sum(
+                    int(candle["volume_formatted"].replace(",", "")) for candle in bucket
+                )
+                bar["volume_formatted"] = f"{volume:,}"
+            except (ValueError, AttributeError):
+                bar["volume_formatted"] = last["volume_formatted"]
+        aggregated.append(bar)
+        start = end
+    return aggregated
+
+
+def _point_buckets(points, bucket_times):
+    """Bucket number of each point, from the bucket (end) times of the candles"""
+    times = [point["time"] for point in points]
+    return np.searchsorted(bucket_times, times, side="left")
+
+
+def _runs(buckets):
+    """(bucket, start, end) for each run of points in the same bucket"""
+    if not len(buckets):
+        return []
+    breaks = np.flatnonzero(np.diff(buckets)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(buckets)]))
+    return list(zip(buckets[starts].tolist(), starts.tolist(), ends.tolist()))
+
+
+def lttb(points, buckets, bucket_times):
+    """
+    Largest-Triangle-Three-Buckets selection over the candle buckets
+
+    Within each bucket, keeps the point forming the largest triangle with the
+    point kept for the previous bucket and the mean of the next bucket, which
+    preserves the visual peaks and troughs of the line. Kept points are
+    relabelled with their bucket's time so every series lines up with the
+    aggregated candles on the shared time scale.
+    """
+    runs = _runs(buckets)
+    if not runs:
+        return []
+    y = [point["value"] for point in points]
+    starts = [start for _, start, _ in runs]
+    sizes = np.diff(starts + [len(points)])
+    # Centroid of each bucket, the third corner for the bucket before it
+    mean_x = np.add.reduceat(np.arange(len(points), dtype=float), starts) / sizes
+    mean_y = np.add.reduceat(np.asarray(y, dtype=float), starts) / sizes
+
+    selected = []
+    previous = None
+    for i, (bucket, start, end) in enumerate(runs):
+        if previous is None or end - start == 1:
+            choice = start
+        else:
+            if i + 1 < len(runs):
+                cx, cy = mean_x[i + 1], mean_y[i + 1]
+            else:
+                cx, cy = end - 1, y[end - 1]
+            ax, ay = previous, y[previous]
+            choice = max(
+                range(start, end),
+                key=lambda j: abs((ax - cx) * (y[j] - ay) - (ax - j) * (cy - ay)),
+            )
+        previous = choice
+        selected.append({**points[choice], "time": bucket_times[bucket]})
+    return selected
+
+
+def max_histogram(points, buckets, bucket_times):
+    """The largest (by magnitude) bar of each bucket, so spikes stay visible"""
+    selected = []
+    for bucket, start, end in _runs(buckets):
+        choice = max(range(start, end), key=lambda j: abs(points[j]["value"]))
+        selected.append({**points[choice], "time": bucket_times[bucket]})
+    return selected
+
+
+def summed_histogram(points, buckets, bucket_times, candles):
+    """
+    Each bucket's total, so bars agree with the aggregated candles' volume
+
+    Bars are coloured by the direction of their aggregated candle, as
+    fetch_and_process_data colours single bars.
+    """
+    selected = []
+    for bucket, start, end in _runs(buckets):
+        total = sum(points[j]["value"] for j in range(start, end))
+        point = {**points[end - 1], "time": bucket_times[bucket], "value": total}
+        if "formatted" in point:
+            point["formatted"] = format_volume(total)[1]
+        if "color" in point:
+            candle = candles[bucket]
+            point["color"] = "#00ff88" if candle["close"] > candle["open"] else "#ff4444"
+        selected.append(point)
+    return selected
+
+
+def _slice(points, start, end):
+    return [
+        point
+        for point in points
+        if (start is None or point["time"] >= start) and (end is None or point["time"] <= end)
+    ]
+
+
+def downsample_chart_data(chart_data, points=None, start=None, end=None):
+    """
+    The chart payload for a time window at a point budget
+
+    Restricts every series and the panel rows to bars with start <= time <=
+    end (unix seconds; None for unbounded), then, if that window holds more
+    bars than `points`, reduces it to `points` buckets: candles are aggregated
+    OHLC-wise, volume is summed, oscillator histograms keep their largest bar
+    and line indicators are thinned with LTTB. Each bucket shows the panel row
+    of its last bar.
+
+    The result carries "resolution": {"bars", "points", "start", "end"} so
+    the browser knows whether it is looking at full resolution and fetches
+    the zoomed window again when it is not.
+    """
+    candles = chart_data.get("candlestick", [])
+    first = 0
+    last = len(candles)
+    if start is not None or end is not None:
+        times = [bar["time"] for bar in candles]
+        first = np.searchsorted(times, start, side="left") if start is not None else 0
+        last = np.searchsorted(times, end, side="right") if end is not None else len(times)
+    window = candles[first:last]
+    count = len(window)
+
+    result = {}
+    panels = chart_data.get("panels")
+    if points is None or count <= points:
+        result["candlestick"] = window
+        for key, series in chart_data.items():
+            if key not in ("candlestick", "panels", "resolution") and isinstance(series, list):
+                result[key] = _slice(series, start, end)
+        if panels is not None:
+            result["panels"] = {**panels, "rows": panels["rows"][first:last]}
+        shown = count
+    else:
+        ends = _bucket_ends(count, max(points, 2))
+        result["candlestick"] = _aggregate_candles(window, ends)
+        bucket_times = [bar["time"] for bar in result["candlestick"]]
+        for key, series in chart_data.items():
+            if key in ("candlestick", "panels", "resolution") or not isinstance(series, list):
+                continue
+            series = _slice(series, start, end)
+            buckets = _point_buckets(series, bucket_times)
+            if key in SUMMED_KEYS:
+                result[key] = summed_histogram(
+                    series, buckets, bucket_times, result["candlestick"]
+                )
+            elif key in HISTOGRAM_KEYS:
+                result[key] = max_histogram(series, buckets, bucket_times)
+            else:
+                result[key] = lttb(series, buckets, bucket_times)
+        if panels is not None:
+            rows = panels["rows"][first:last]
+            result["panels"] = {**panels, "rows": [rows[stop - 1] for stop in ends]}
+        shown = len(ends)
+
+    result["resolution"] = {
+        "bars": count,
+        "points": shown,
+        "start": window[0]["time"] if window else start,
+        "end": window[-1]["time"] if window else end,
+    }
+    return result
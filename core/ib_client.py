@@ -6,6 +6,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.metrics import timed
+
 # Use your Render server URL
 try:
     from config import RENDER_SERVER_URL
@@ -55,21 +57,27 @@ class IBClient:
     ):
         """
         Fetch historical data from Render server.
-        Note: Parameters are kept for compatibility but not used for Render server.
+        ticker is sent as the `instrument` query parameter so a server that
+        serves several instruments can pick one; the other parameters are kept
+        for compatibility but not used for Render server.
         """
         try:
-            logging.info(f"Fetching data from {self.server_url}/data/full")
+            logging.info(f"Fetching {ticker or 'data'} from {self.server_url}/data/full")
 
             # Fetch complete data from Render server
-            response = requests.get(
-                f"{self.server_url}/data/full", timeout=self.timeout
-            )
-            data = response.json()
+            params = {"instrument": ticker} if ticker else None
+            with timed("http_fetch"):
+                response = requests.get(
+                    f"{self.server_url}/data/full", params=params, timeout=self.timeout
+                )
+            with timed("json_decode"):
+                data = response.json()
 
             if data.get("status") == "success" and "data" in data:
                 # Convert the received data to DataFrame
                 bars_data = data["data"]
-                df = self._convert_to_dataframe(bars_data)
+                with timed("convert_dataframe"):
+                    df = self._convert_to_dataframe(bars_data)
 
                 logging.info(
                     f"Received {len(df)} bars for {data['summary']['instrument']}"
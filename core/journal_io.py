@@ -0,0 +1,404 @@
+"""
+Bulk export/import of the trade journal (trade_calculator_results)
+
+Usage:
+    python -m core.journal_io export journal.csv
+    python -m core.journal_io export journal.parquet --ticker QQQ
+    python -m core.journal_io import journal.csv --commit-every 20
+    python -m core.journal_io import journal.csv --resume
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from core.db import (
+    DEFAULT_CHUNK_SIZE,
+    RESULT_COLUMNS,
+    RESULT_DTYPES,
+    get_connection,
+    init_database,
+    iter_result_chunks,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Arrow types for the Parquet schema; everything else is stored as text
+ARROW_TYPES = {"i8": "int64", "f8": "float64", "?": "bool"}
+
+
+def _detect_format(path, fmt=None):
+    fmt = fmt or Path(path).suffix.lstrip(".").lower()
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported journal format: {fmt!r} (use csv or parquet)")
+    if fmt == "parquet" and pq is None:
+        raise ImportError("Parquet support requires pyarrow (pip install pyarrow)")
+    return fmt
+
+
+def _progress_path(path):
+    return Path(f"{path}.progress")
+
+
+def _read_progress(path):
+    progress_file = _progress_path(path)
+    if not progress_file.exists():
+        return {}
+    with open(progress_file) as f:
+        return json.load(f)
+
+
+def _write_progress(path, state):
+    progress_file = _progress_path(path)
+    tmp_file = progress_file.with_name(progress_file.name + ".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, progress_file)
+
+
+def _log_progress(operation, rows_done):
+    logging.info(f"{operation}: {rows_done:,} rows")
+
+
+def _arrow_schema(columns):
+    return pa.schema(
+        [(col, ARROW_TYPES.get(RESULT_DTYPES.get(col), "string")) for col in columns]
+    )
+
+
+def export_journal(
+    path,
+    fmt=None,
+    columns=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    resume=False,
+    progress=None,
+    **filters,
+):
+    """
+    Stream the journal to a CSV or Parquet file in chunks of chunk_size rows
+
+    With resume=True a CSV export continues after the last id recorded in
+    the `<path>.progress` sidecar, appending to the existing file; this also
+    turns a finished export into an incremental archive of newer rows. The
+    sidecar records the columns and filters, and resuming with different ones
+    raises ValueError rather than appending mismatched rows. Parquet files
+    cannot be appended to, so they are written to a temporary file and
+    renamed into place once complete.
+    Returns the number of rows written.
+    """
+    fmt = _detect_format(path, fmt)
+    columns = list(columns or RESULT_COLUMNS)
+    if "id" not in columns:
+        # The id is the resume watermark, so it is always exported
+        columns.insert(0, "id")
+    filters = {name: value for name, value in filters.items() if value is not None}
+    progress = progress or (lambda rows: _log_progress("Exported", rows))
+    id_position = columns.index("id")
+
+    state = _read_progress(path) if resume and fmt == "csv" else {}
+    if state.get("operation") != "export":
+        state = {}
+    if state:
+        _check_resumable(path, state, columns, filters)
+    after_id = last_id = state.get("last_id")
+    rows_written = state.get("rows", 0)
+    chunks = iter_result_chunks(
+        columns, chunk_size, after_id=after_id, order="ASC", **filters
+    )
+
+    if fmt == "csv":
+        append = after_id is not None and Path(path).exists()
+        with open(path, "a" if append else "w", newline="") as f:
+            writer = csv.writer(f)
+            if not append:
+                writer.writerow(columns)
+            for rows in chunks:
+                writer.writerows(rows)
+                f.flush()
+                rows_written += len(rows)
+                last_id = rows[-1][id_position]
+                _write_progress(
+                    path,
+                    {
+                        "operation": "export",
+                        "columns": columns,
+                        "filters": filters,
+                        "last_id": last_id,
+                        "rows": rows_written,
+                    },
+                )
+                progress(rows_written)
+    else:
+        schema = _arrow_schema(columns)
+        tmp_path = f"{path}.tmp"
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for rows in chunks:
+                arrays = []
+                for i, field in enumerate(schema):
+                    values = [row[i] for row in rows]
+                    if pa.types.is_boolean(field.type):
+                        # SQLite stores BOOLEAN columns as 0/1 integers
+                        values = [None if v is None else bool(v) for v in values]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows_written += len(rows)
+                last_id = rows[-1][id_position]
+                progress(rows_written)
+        os.replace(tmp_path, path)
+
+    _write_progress(
+        path,
+        {
+            "operation": "export",
+            "columns": columns,
+            "filters": filters,
+            "last_id": last_id,
+            "rows": rows_written,
+            "complete": True,
+        },
+    )
+    logging.info(f"✓ Exported {rows_written:,} journal rows to {path}")
+    return rows_written
+
+
+def _check_resumable(path, state, columns, filters):
+    """Refuse to append to an export made with other columns or filters"""
+    if state.get("columns") != columns or state.get("filters") != filters:
+        raise ValueError(
+            f"{path} was exported with columns {state.get('columns')} and "
+            f"filters {state.get('filters')}; resume with the same options "
+            "or export to a new file"
+        )
+    if Path(path).exists():
+        with open(path, newline="") as f:
+            header = next(csv.reader(f), None)
+        if header is not None and header != columns:
+            raise ValueError(f"{path} has columns {header}, expected {columns}")
+
+
+def _convert_value(column, value):
+    """Convert a CSV cell back to the type stored in the journal"""
+    kind = RESULT_DTYPES.get(column)
+    if value is None or (value == "" and kind is not None):
+        # CSV writes NULL as an empty cell; text columns keep empty strings
+        return None
+    if kind == "f8":
+        return float(value)
+    if kind == "i8":
+        return int(value)
+    if kind == "?":
+        if isinstance(value, str):
+            return 1 if value.strip().lower() in ("1", "true", "t", "yes") else 0
+        return int(bool(value))
+    return value
+
+
+def _iter_source_batches(path, fmt, batch_size):
+    """Yield (columns, rows) batches from a CSV or Parquet journal file"""
+    if fmt == "csv":
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            columns = next(reader, None)
+            if columns is None:
+                return
+            batch = []
+            for row in reader:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield columns, batch
+                    batch = []
+            if batch:
+                yield columns, batch
+    else:
+        parquet_file = pq.ParquetFile(path)
+        columns = parquet_file.schema_arrow.names
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield columns, list(zip(*(col.to_pylist() for col in record_batch.columns)))
+
+
+def _log_rejected(row_number, row, error):
+    logging.warning(f"Rejected journal row {row_number}: {error}")
+
+
+def _insert_batch(cursor, statement, rows, first_row, on_reject):
+    """
+    Insert a batch with executemany, falling back to row by row if any row
+    breaks a constraint so the offending rows can be reported and skipped
+    """
+    cursor.execute("SAVEPOINT batch")
+    try:
+        cursor.executemany(statement, rows)
+    except sqlite3.IntegrityError:
+        cursor.execute("ROLLBACK TO batch")
+        for offset, row in enumerate(rows):
+            try:
+                cursor.execute(statement, row)
+            except sqlite3.IntegrityError as e:
+                on_reject(first_row + offset, row, e)
+    cursor.execute("RELEASE batch")
+
+
+def import_journal(
+    path,
+    fmt=None,
+    batch_size=DEFAULT_CHUNK_SIZE,
+    keep_ids=False,
+    commit_every=None,
+    resume=False,
+    progress=None,
+    on_reject=None,
+):
+    """
+    Import a CSV or Parquet journal file with batched executemany
+
+    By default every batch is inserted inside a single transaction, so a failed
+    import leaves the journal untouched. Set commit_every=N to commit after
+    every N batches instead; the number of committed source rows is then
+    checkpointed to `<path>.progress` and resume=True skips them on the next run.
+    With keep_ids=True source ids are preserved and rows whose id already
+    exists are skipped, which also makes re-running an import idempotent.
+    Rows that break any other constraint (such as a missing ticker) are not
+    imported; on_reject(row_number, values, error) is called for each, and by
+    default logs a warning. Row numbers count source data rows from 1.
+    Returns the number of source rows processed.
+    """
+    fmt = _detect_format(path, fmt)
+    progress = progress or (lambda rows: _log_progress("Imported", rows))
+    rejected = 0
+
+    def reject(row_number, row, error):
+        nonlocal rejected
+        rejected += 1
+        (on_reject or _log_rejected)(row_number, row, error)
+
+    init_database()
+
+    state = _read_progress(path) if resume else {}
+    if state.get("complete") and state.get("operation") == "import":
+        logging.info(f"{path} was already imported, nothing to resume")
+        return 0
+    skip_rows = state.get("rows", 0) if state.get("operation") == "import" else 0
+    rows_done = skip_rows
+
+    with get_connection() as conn:
+        # Explicit transaction control; executemany batches share it
+        conn.isolation_level = None
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute("BEGIN")
+        statement = None
+        batches_since_commit = 0
+
+        try:
+            for columns, rows in _iter_source_batches(path, fmt, batch_size):
+                if statement is None:
+                    unknown = [col for col in columns if col not in RESULT_COLUMNS]
+                    if unknown:
+                        raise ValueError(
+                            f"Unknown journal columns in {path}: {', '.join(unknown)}"
+                        )
+                    target_columns = [
+                        col for col in columns if keep_ids or col != "id"
+                    ]
+                    positions = [columns.index(col) for col in target_columns]
+                    placeholders = ", ".join("?" for _ in target_columns)
+                    statement = (
+                        f"INSERT INTO trade_calculator_results "
+                        f"({', '.join(target_columns)}) VALUES ({placeholders})"
+                    )
+                    if keep_ids:
+                        # Only existing ids are skipped; other constraint
+                        # failures still surface as rejected rows
+                        statement += " ON CONFLICT(id) DO NOTHING"
+
+                if skip_rows >= len(rows):
+                    skip_rows -= len(rows)
+                    continue
+                rows = rows[skip_rows:]
+                skip_rows = 0
+
+                values = [
+                    tuple(
+                        _convert_value(target_columns[i], row[pos])
+                        for i, pos in enumerate(positions)
+                    )
+                    for row in rows
+                ]
+                _insert_batch(cursor, statement, values, rows_done + 1, reject)
+                rows_done += len(rows)
+                batches_since_commit += 1
+
+                if commit_every and batches_since_commit >= commit_every:
+                    cursor.execute("COMMIT")
+                    _write_progress(path, {"operation": "import", "rows": rows_done})
+                    cursor.execute("BEGIN")
+                    batches_since_commit = 0
+                progress(rows_done)
+
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    _write_progress(path, {"operation": "import", "rows": rows_done, "complete": True})
+    if rejected:
+        logging.warning(f"{rejected:,} journal rows in {path} were rejected")
+    logging.info(f"✓ Imported {rows_done:,} journal rows from {path}")
+    return rows_done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trade journal export/import")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export the journal")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=["csv", "parquet"])
+    export_parser.add_argument("--columns", help="Comma-separated column list")
+    export_parser.add_argument("--ticker")
+    export_parser.add_argument("--direction", choices=["long", "short"])
+    export_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    export_parser.add_argument("--resume", action="store_true")
+
+    import_parser = subparsers.add_parser("import", help="Import a journal file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "parquet"])
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    import_parser.add_argument("--keep-ids", action="store_true")
+    import_parser.add_argument("--commit-every", type=int)
+    import_parser.add_argument("--resume", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_journal(
+            args.path,
+            fmt=args.format,
+            columns=args.columns.split(",") if args.columns else None,
+            chunk_size=args.chunk_size,
+            resume=args.resume,
+            ticker=args.ticker,
+            direction=args.direction,
+        )
+    else:
+        import_journal(
+            args.path,
+            fmt=args.format,
+            batch_size=args.batch_size,
+            keep_ids=args.keep_ids,
+            commit_every=args.commit_every,
+            resume=args.resume,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+# Served by main.py; this module stays free of Flask so db and the journal_io
+# CLI can time their stages without the web stack installed
+METRICS_ROUTE = "/metrics"
+# Each web worker process writes its histograms here so /metrics can merge them
+METRICS_DIR = Path("data/metrics")
+FLUSH_SECONDS = 10
+# Upper bounds (seconds) of the stage timing histogram buckets
+STAGE_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+STAGE_METRIC = "ticon_stage_seconds"
+STAGE_HELP = "Time spent in each stage of fetching, processing and serving data"
+
+
+class Histogram:
+    """
+    Cumulative timing histogram with one series per label value
+
+    Kept per process; snapshot() is the JSON-friendly state that /metrics
+    merges across worker processes.
+    """
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label, seconds):
+        position = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            if position < len(self.buckets):
+                series["buckets"][position] += 1
+            series["sum"] += seconds
+            series["count"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                label: {**series, "buckets": list(series["buckets"])}
+                for label, series in self._series.items()
+            }
+
+
+stage_seconds = Histogram()
+# Process that started the flush thread; a forked worker starts its own
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def observe(stage, seconds):
+    """Record `seconds` spent in `stage`"""
+    stage_seconds.observe(stage, seconds)
+
+
+@contextmanager
+def timed(stage):
+    """
+    Time the enclosed block as one observation of `stage`
+
+    Stages in use: http_fetch, json_decode, convert_dataframe, format,
+    chart_build, panel_render, serialise, compress and db_insert. Failed
+    blocks are timed too.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started)
+
+
+def flush():
+    """Write this process's histograms where other workers can read them"""
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    path = METRICS_DIR / f"{os.getpid()}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(stage_seconds.snapshot()))
+    os.replace(tmp, path)
+
+
+def _flush_forever():
+    while True:
+        time.sleep(FLUSH_SECONDS)
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def start_flusher():
+    """
+    Flush this process's histograms every FLUSH_SECONDS from a daemon thread
+
+    Only the web app (main.py) calls this, once per worker process; CLI runs,
+    scripts and tests keep their timings in memory.
+    """
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid != os.getpid():
+            threading.Thread(
+                target=_flush_forever, name="metrics-flush", daemon=True
+            ).start()
+            _flusher_pid = os.getpid()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect():
+    """
+    Stage histograms summed over every live worker process
+
+    Other workers' figures are at most FLUSH_SECONDS old. Snapshots left by
+    exited workers are removed, so their counts drop out (Prometheus treats
+    that as a counter reset). Without os.kill liveness checks (Windows) only
+    this process is reported.
+    """
+    merged = {}
+
+    def add(snapshot):
+        for label, series in snapshot.items():
+            total = merged.setdefault(
+                label, {"buckets": [0] * len(STAGE_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            total["buckets"] = [
+                a + b for a, b in zip(total["buckets"], series["buckets"])
+            ]
+            total["sum"] += series["sum"]
+            total["count"] += series["count"]
+
+    add(stage_seconds.snapshot())
+    if os.name != "posix" or not METRICS_DIR.exists():
+        return merged
+
+    for path in METRICS_DIR.glob("*.json"):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        if not _alive(pid):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            add(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return merged
+
+
+def render_metrics(merged):
+    """Prometheus text exposition of the merged stage histograms"""
+    lines = [
+        f"# HELP {STAGE_METRIC} {STAGE_HELP}",
+        f"# TYPE {STAGE_METRIC} histogram",
+    ]
+    for stage in sorted(merged):
+        series = merged[stage]
+        cumulative = 0
+        for bound, count in zip(STAGE_BUCKETS, series["buckets"]):
+            cumulative += count
+            lines.append(
+                f'{STAGE_METRIC}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+            )
+        lines.append(
+            f'{STAGE_METRIC}_bucket{{stage="{stage}",le="+Inf"}} {series["count"]}'
+        )
+        lines.append(f'{STAGE_METRIC}_sum{{stage="{stage}"}} {series["sum"]:.6f}')
+        lines.append(f'{STAGE_METRIC}_count{{stage="{stage}"}} {series["count"]}')
+    return "\n".join(lines) + "\n"
+
@@ -0,0 +1,56 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Below this many rows a process pool costs more than it saves
+PARALLEL_MIN_ROWS = 1_000_000
+
+
+def resolve_workers(n_rows, workers=None, min_rows=PARALLEL_MIN_ROWS):
+    """Pick a worker count: 1 for small jobs, otherwise `workers` or all CPUs"""
+    if workers is not None:
+        return max(1, int(workers))
+    if n_rows < min_rows:
+        return 1
+    return os.cpu_count() or 1
+
+
+def run_sharded(func, arrays, workers=None, min_rows=PARALLEL_MIN_ROWS, **kwargs):
+    """
+    Evaluate func over row shards of equally sized arrays, in a process pool
+
+    `arrays` maps names to 1-D arrays of the same length; each shard receives
+    the same mapping restricted to a contiguous row range plus **kwargs, and
+    must return a dict of 1-D arrays. Shard results are concatenated in order.
+    func must be a module-level function so it can be pickled.
+    """
+    n_rows = len(next(iter(arrays.values()))) if arrays else 0
+    workers = resolve_workers(n_rows, workers, min_rows)
+
+    if workers == 1 or n_rows == 0:
+        return func(arrays, **kwargs)
+
+    # A few shards per worker keeps the pool busy when shards run unevenly
+    bounds = np.linspace(0, n_rows, workers * 4 + 1, dtype=int)
+    shards = [
+        {key: values[start:stop] for key, values in arrays.items()}
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+    logging.info(
+        f"Evaluating {n_rows:,} rows in {len(shards)} shards on {workers} processes"
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [(func, shard, kwargs) for shard in shards]
+        results = list(pool.map(_call_shard, jobs))
+
+    return {
+        key: np.concatenate([result[key] for result in results]) for key in results[0]
+    }
+
+
+def _call_shard(job):
+    func, shard, kwargs = job
+    return func(shard, **kwargs)
@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import threading
+from urllib.parse import urlencode
+import brotli
+import orjson
+from flask import Response, request
+from core.columnar import encode_chart_data
+from core.downsample import downsample_chart_data, target_points
+from core.metrics import timed
+
+try:
+    from config import CHART_TRANSPORT
+except ImportError:
+    CHART_TRANSPORT = "columnar"
+
+CHART_DATA_ROUTE = "/chart-data"
+# "json" is the row-oriented payload; "columnar" the typed-array form
+CHART_FORMATS = ("json", "columnar")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(obj):
+    """Serialise to compact JSON bytes"""
+    with timed("serialise"):
+        return orjson.dumps(obj)
+
+
+def loads(data):
+    return orjson.loads(data)
+
+
+class ChartPayload:
+    """
+    One version of a chart payload, serialised once
+
+    The JSON bytes are built when the version is installed; the columnar
+    form (core.columnar), the downsampled views for each point budget
+    (core.downsample) and the gzip and brotli encodings are built on first
+    use and then reused for every client that asks for this version.
+    """
+
+    def __init__(self, body, version, chart_data=None):
+        self.body = body
+        self.version = version
+        self.chart_data = chart_data
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self._encoded = {("json", "identity", None): body}
+        self._lock = threading.Lock()
+
+    def render(self, fmt="json", points=None, start=None, end=None):
+        """
+        Uncompressed bytes of the payload, or of a window of it reduced to a
+        point budget (see downsample_chart_data)
+        """
+        if fmt == "json" and points is None and start is None and end is None:
+            return self.body
+        chart_data = self.chart_data
+        if chart_data is None:
+            chart_data = loads(self.body)
+        if points is not None or start is not None or end is not None:
+            chart_data = downsample_chart_data(chart_data, points, start, end)
+        if fmt == "columnar":
+            chart_data = encode_chart_data(chart_data)
+        return dumps(chart_data)
+
+    def encoded(self, encoding="identity", fmt="json", points=None):
+        """
+        The whole-range payload in a format, point budget and content
+        encoding, built at most once
+        """
+        key = (fmt, encoding, points)
+        with self._lock:
+            if key in self._encoded:
+                return self._encoded[key]
+        if encoding == "identity":
+            data = self.render(fmt, points)
+        else:
+            data = compress(self.encoded("identity", fmt, points), encoding)
+        with self._lock:
+            return self._encoded.setdefault(key, data)
+
+
+def compress(body, encoding):
+    if encoding == "identity":
+        return body
+    with timed("compress"):
+        if encoding == "br":
+            return brotli.compress(body, quality=BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _pick_encoding(accept_encoding):
+    accepted = {
+        token.split(";")[0].strip().lower() for token in accept_encoding.split(",")
+    }
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def chart_data_url(symbol, interval, version, fmt=CHART_TRANSPORT):
+    """Where the browser fetches a chart payload; version busts stale URLs"""
+    query = urlencode(
+        {"symbol": symbol, "interval": interval, "v": version, "format": fmt}
+    )
+    return f"{CHART_DATA_ROUTE}?{query}"
+
+
+def register_payload_routes(server):
+    """
+    Serve cached chart payloads straight from the Flask server
+
+    GET /chart-data?symbol=QQQ&interval=1d&format=json|columnar returns the
+    watchlist's current payload for the instrument as precompressed bytes
+    (brotli or gzip, following Accept-Encoding), with an ETag so unchanged
+    versions cost a 304.
+
+    With width=<pixels> the payload is downsampled to what a chart that wide
+    can show; adding start= and end= (unix seconds) returns just that window,
+    at full resolution once it fits the width. Whole-range views are cached
+    per point budget; windows are built per request.
+    """
+
+    # Imported here: the watchlist itself builds ChartPayloads
+    from core.watchlist import UnknownInstrumentError, get_watchlist
+
+    @server.route(CHART_DATA_ROUTE)
+    def chart_data():
+        symbol = request.args.get("symbol") or "QQQ"
+        interval = request.args.get("interval") or None
+        fmt = request.args.get("format") or "json"
+        if fmt not in CHART_FORMATS:
+            return Response(f"Unknown format {fmt!r}", status=400)
+        points = target_points(request.args.get("width", type=int))
+        start = request.args.get("start", type=int)
+        end = request.args.get("end", type=int)
+        try:
+            entry = get_watchlist().get_or_fetch(symbol, interval)
+        except UnknownInstrumentError:
+            return Response(f"Unknown instrument {symbol!r}", status=404)
+        payload = entry.payload
+        if payload is None:
+            return Response(status=503, headers={"Retry-After": "5"})
+
+        etag = f"{payload.etag}-{fmt}-{points}-{start}-{end}"
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        encoding = _pick_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if start is None and end is None:
+            body = payload.encoded(encoding, fmt, points)
+        else:
+            body = compress(payload.render(fmt, points, start, end), encoding)
+        return Response(body, mimetype="application/json", headers=headers)
@@ -0,0 +1,283 @@
+import math
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    _ndtr = None
+
+# Chebyshev coefficients of the erfc approximation used without scipy
+# (Numerical Recipes erfcc; fractional error below 1.2e-7 everywhere)
+_ERFC_COEFFS = (
+    -1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+    0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277,
+)
+
+# Volatility bracket searched by the implied volatility solver
+IV_LOWER = 1e-6
+IV_UPPER = 5.0
+
+
+def erfc(x):
+    """Complementary error function over arrays, without scipy"""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = np.zeros_like(t)
+    for coeff in reversed(_ERFC_COEFFS[1:]):
+        poly = t * (coeff + poly)
+    result = t * np.exp(-z * z + _ERFC_COEFFS[0] + poly)
+    return np.where(x >= 0, result, 2.0 - result)
+
+
+def norm_cdf(x):
+    """Standard normal CDF over arrays (scipy's ndtr when installed)"""
+    x = np.asarray(x, dtype=float)
+    if _ndtr is not None:
+        return _ndtr(x)
+    return 0.5 * erfc(-x / math.sqrt(2.0))
+
+
+def norm_pdf(x):
+    """Standard normal density over arrays"""
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+def _is_call(option_type):
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    return np.char.lower(option_type.astype(str)) != "put"
+
+
+def _d1_d2(spot, strike, time, rate, vol, dividend):
+    sqrt_time = np.sqrt(time)
+    vol_sqrt_time = vol * sqrt_time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (
+            np.log(spot / strike) + (rate - dividend + 0.5 * vol * vol) * time
+        ) / vol_sqrt_time
+    return d1, d1 - vol_sqrt_time, sqrt_time
+
+
+def _broadcast(spot, strike, time, rate, vol, option_type, dividend):
+    numeric = (spot, strike, time, rate, vol, dividend)
+    return np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in numeric),
+        _is_call(option_type),
+    )
+
+
+def bs_price(spot, strike, time, rate, vol, option_type="call", dividend=0.0):
+    """
+    Black-Scholes value of European calls and puts over broadcast arrays
+
+    time is in years, rate, vol and dividend are annualised decimals, and
+    option_type is "call"/"put" (or a boolean is-call array).
+    """
+    spot, strike, time, rate, vol, dividend, is_call = _broadcast(
+        spot, strike, time, rate, vol, option_type, dividend
+    )
+    d1, d2, _ = _d1_d2(spot, strike, time, rate, vol, dividend)
+    spot_disc = spot * np.exp(-dividend * time)
+    strike_disc = strike * np.exp(-rate * time)
+
+    call = spot_disc * norm_cdf(d1) - strike_disc * norm_cdf(d2)
+    put = strike_disc * norm_cdf(-d2) - spot_disc * norm_cdf(-d1)
+    price = np.where(is_call, call, put)
+
+    # Expired or zero-vol options are worth their discounted intrinsic value
+    degenerate = (time <= 0) | (vol <= 0)
+    if degenerate.any():
+        intrinsic = np.where(
+            is_call,
+            np.maximum(spot_disc - strike_disc, 0.0),
+            np.maximum(strike_disc - spot_disc, 0.0),
+        )
+        price = np.where(degenerate, intrinsic, price)
+    return price
+
+
+def bs_vega(spot, strike, time, rate, vol, dividend=0.0):
+    """Vega (price change per 1.00 of volatility) over broadcast arrays"""
+    spot, strike, time, rate, vol, dividend, _ = _broadcast(
+        spot, strike, time, rate, vol, "call", dividend
+    )
+    d1, _, sqrt_time = _d1_d2(spot, strike, time, rate, vol, dividend)
+    vega = spot * np.exp(-dividend * time) * norm_pdf(d1) * sqrt_time
+    return np.where((time > 0) & (vol > 0), vega, 0.0)
+
+
+def bs_greeks(spot, strike, time, rate, vol, option_type="call", dividend=0.0):
+    """
+    Delta, gamma, vega, theta and rho over broadcast arrays
+
+    vega and rho are per 1.00 change in vol/rate and theta is per year;
+    divide by 100 / 365 respectively for the usual quoting conventions.
+    """
+    spot, strike, time, rate, vol, dividend, is_call = _broadcast(
+        spot, strike, time, rate, vol, option_type, dividend
+    )
+    d1, d2, sqrt_time = _d1_d2(spot, strike, time, rate, vol, dividend)
+    div_disc = np.exp(-dividend * time)
+    rate_disc = np.exp(-rate * time)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(d1)
+    cdf_d2 = norm_cdf(d2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = div_disc * pdf_d1 / (spot * vol * sqrt_time)
+        decay = -spot * div_disc * pdf_d1 * vol / (2 * sqrt_time)
+
+    call_theta = (
+        decay - rate * strike * rate_disc * cdf_d2 + dividend * spot * div_disc * cdf_d1
+    )
+    put_theta = (
+        decay
+        + rate * strike * rate_disc * (1 - cdf_d2)
+        - dividend * spot * div_disc * (1 - cdf_d1)
+    )
+
+    return {
+        "delta": np.where(is_call, div_disc * cdf_d1, div_disc * (cdf_d1 - 1)),
+        "gamma": gamma,
+        "vega": spot * div_disc * pdf_d1 * sqrt_time,
+        "theta": np.where(is_call, call_theta, put_theta),
+        "rho": np.where(
+            is_call,
+            strike * time * rate_disc * cdf_d2,
+            -strike * time * rate_disc * (1 - cdf_d2),
+        ),
+    }
+
+
+def implied_volatility(
+    price,
+    spot,
+    strike,
+    time,
+    rate=0.0,
+    option_type="call",
+    dividend=0.0,
+    tol=1e-8,
+    max_iter=100,
+):
+    """
+    Implied volatility for arrays of option prices
+
+    Runs a safeguarded Newton iteration on all contracts at once: every
+    contract keeps a [low, high] bracket, takes a Newton step when it stays
+    inside the bracket and bisects otherwise, so it always converges.
+    Prices outside the no-arbitrage bounds, or with no time left, give NaN.
+    """
+    price, spot, strike, time, rate, dividend, is_call = _broadcast(
+        price, spot, strike, time, rate, option_type, dividend
+    )
+    shape = price.shape
+    price, spot, strike, time, rate, dividend, is_call = (
+        np.ravel(values).copy()
+        for values in (price, spot, strike, time, rate, dividend, is_call)
+    )
+
+    spot_disc = spot * np.exp(-dividend * time)
+    strike_disc = strike * np.exp(-rate * time)
+    lower_bound = np.where(
+        is_call,
+        np.maximum(spot_disc - strike_disc, 0.0),
+        np.maximum(strike_disc - spot_disc, 0.0),
+    )
+    upper_bound = np.where(is_call, spot_disc, strike_disc)
+    valid = (
+        np.isfinite(price)
+        & (time > 0)
+        & (price > lower_bound)
+        & (price < upper_bound)
+    )
+
+    low = np.full(price.shape, IV_LOWER)
+    high = np.full(price.shape, IV_UPPER)
+    # Brenner-Subrahmanyam style starting point, clipped into the bracket
+    safe_time = np.where(time > 0, time, 1.0)
+    safe_spot = np.where(spot > 0, spot, 1.0)
+    vol = np.sqrt(2 * np.pi / safe_time) * price / safe_spot
+    vol = np.clip(np.nan_to_num(vol, nan=0.2), 0.05, 1.0)
+
+    active = np.flatnonzero(valid)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        args = (spot[active], strike[active], time[active], rate[active])
+        model = bs_price(*args, vol[active], is_call[active], dividend[active])
+        diff = model - price[active]
+
+        converged = np.abs(diff) < tol
+        too_high = diff > 0
+        high[active] = np.where(too_high, vol[active], high[active])
+        low[active] = np.where(too_high, low[active], vol[active])
+
+        vega = bs_vega(*args, vol[active], dividend[active])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = vol[active] - diff / vega
+        in_bracket = (newton > low[active]) & (newton < high[active])
+        in_bracket &= vega > 1e-12
+        bisect = 0.5 * (low[active] + high[active])
+        step = np.where(in_bracket, newton, bisect)
+        vol[active] = np.where(converged, vol[active], step)
+
+        still_active = ~converged & ((high[active] - low[active]) > tol)
+        active = active[still_active]
+
+    vol = np.where(valid, vol, np.nan)
+    return vol.reshape(shape)
+
+
+def price_chain(chain, spot, time, rate=0.0, dividend=0.0, vol=None):
+    """
+    Implied volatility, theoretical value and Greeks for a normalised chain
+
+    `chain` is a DataFrame with strike, option_type, bid and ask (see
+    core.screener.normalize_chain). Returns a copy with implied_vol, delta,
+    gamma, vega, theta and theoretical_value columns. implied_vol is solved
+    from the mid; the value and Greeks use `vol` when given, else implied_vol.
+    """
+    strike = chain["strike"].to_numpy(dtype=float)
+    option_type = chain["option_type"].to_numpy()
+    bid = chain["bid"].to_numpy(dtype=float)
+    ask = chain["ask"].to_numpy(dtype=float)
+    mid = (bid + ask) / 2
+
+    implied = implied_volatility(mid, spot, strike, time, rate, option_type, dividend)
+    model_vol = implied if vol is None else vol
+    greeks = bs_greeks(spot, strike, time, rate, model_vol, option_type, dividend)
+
+    priced = chain.copy()
+    priced["implied_vol"] = implied
+    priced["theoretical_value"] = bs_price(
+        spot, strike, time, rate, model_vol, option_type, dividend
+    )
+    for name in ("delta", "gamma", "vega", "theta"):
+        priced[name] = greeks[name]
+    return priced
+
+
+def price_option(
+    price, spot, strike, time, rate=0.0, option_type="call", vol=None, dividend=0.0
+):
+    """
+    price_chain for a single contract quoted at `price`, as a dict of floats
+
+    Keys: implied_vol, theoretical_value, delta, gamma, vega and theta (NaN
+    where the quote has no implied volatility and no `vol` is given).
+    """
+    implied = implied_volatility(price, spot, strike, time, rate, option_type, dividend)
+    model_vol = implied if vol is None else vol
+    greeks = bs_greeks(spot, strike, time, rate, model_vol, option_type, dividend)
+    result = {
+        "implied_vol": implied,
+        "theoretical_value": bs_price(
+            spot, strike, time, rate, model_vol, option_type, dividend
+        ),
+        **{name: greeks[name] for name in ("delta", "gamma", "vega", "theta")},
+    }
+    return {name: float(value) for name, value in result.items()}
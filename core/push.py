@@ -0,0 +1,202 @@
+import json
+import logging
+import threading
+import time
+from flask import Response, request, stream_with_context
+from core.watchlist import get_watchlist
+
+try:
+    from config import STREAM_MAX_CONNECTIONS, STREAM_LIFETIME_SECONDS
+except ImportError:
+    STREAM_MAX_CONNECTIONS = 4
+    STREAM_LIFETIME_SECONDS = 300
+
+STREAM_ROUTE = "/stream"
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+# Seconds a browser waits before reopening a stream that ended
+RECONNECT_SECONDS = 3
+# Seconds a refused client is told to wait before trying to stream again
+REFUSED_RETRY_SECONDS = 30
+# Clients further behind than this many bars reload the full chart instead
+MAX_DELTA_BARS = 500
+# Chart series that are lists of {"time": ...} points
+SERIES_KEYS = (
+    "candlestick",
+    "sma20",
+    "bb_upper",
+    "bb_middle",
+    "bb_lower",
+    "atr",
+    "momentum",
+    "squeeze",
+    "volume",
+    "mean",
+)
+
+
+def chart_delta(chart_data, since=None, version=None):
+    """
+    The part of a chart payload a client holding bars up to `since` lacks
+
+    Returns {"version", "start", "series", "panels"}: every series point with
+    time >= since (the last known bar is resent since it may still be
+    forming), and the panel rows from candle position `start` on. When the
+    client has no bars or is more than MAX_DELTA_BARS behind, returns
+    {"version", "reset": True} so it reloads the full chart instead.
+    """
+    candles = chart_data.get("candlestick", [])
+    if since is None or not candles or candles[0]["time"] > since:
+        return {"version": version, "reset": True}
+
+    start = next(
+        (i for i, bar in enumerate(candles) if bar["time"] >= since), len(candles)
+    )
+    if len(candles) - start > MAX_DELTA_BARS:
+        return {"version": version, "reset": True}
+
+    series = {
+        key: [point for point in chart_data.get(key, []) if point["time"] >= since]
+        for key in SERIES_KEYS
+    }
+    panels = chart_data.get("panels", {}).get("rows", [])
+    return {
+        "version": version,
+        "start": start,
+        "series": series,
+        "panels": panels[start:],
+    }
+
+
+class StreamSlots:
+    """
+    Caps the push streams one worker process holds open at a time
+
+    Every open stream keeps a server thread busy for as long as it lasts, so
+    the cap has to leave threads free for ordinary requests (see render.yaml).
+    """
+
+    def __init__(self, limit=STREAM_MAX_CONNECTIONS):
+        self.limit = limit
+        self.open = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a slot; False (and counted as refused) when all are in use"""
+        with self._lock:
+            if self.open >= self.limit:
+                self.refused += 1
+                return False
+            self.open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.open -= 1
+
+
+stream_slots = StreamSlots()
+
+
+def _event(name, data, event_id=None):
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _event_id(version, since):
+    """SSE event id: where a reconnecting browser resumes from"""
+    return f"{'' if since is None else since} {version}"
+
+
+def _parse_event_id(value):
+    """(version, since) from a Last-Event-ID header, or None"""
+    since, _, version = (value or "").partition(" ")
+    if not version:
+        return None
+    try:
+        return version, int(since) if since else None
+    except ValueError:
+        return None
+
+
+def _stream(entry, version, since, lifetime=STREAM_LIFETIME_SECONDS):
+    """
+    Delta events for one client until `lifetime` seconds have passed
+
+    Ending the stream frees its server thread; the browser's EventSource
+    reconnects after RECONNECT_SECONDS, resuming from the last event id.
+    """
+    watchlist = get_watchlist()
+    deadline = time.monotonic() + lifetime
+    yield f"retry: {RECONNECT_SECONDS * 1000}\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if entry.version != version and entry.chart_data is not None:
+            chart_data, version = entry.chart_data, entry.version
+            delta = chart_delta(chart_data, since, version)
+            candles = chart_data.get("candlestick", [])
+            since = candles[-1]["time"] if candles else None
+            yield _event("delta", delta, _event_id(version, since))
+        elif not watchlist.wait_for_change(
+            entry, version, min(HEARTBEAT_SECONDS, remaining)
+        ):
+            # Comments keep proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+
+
+def register_push_routes(server):
+    """
+    Add a server-sent events endpoint to the Flask server under Dash
+
+    GET /stream?symbol=QQQ&interval=1d&version=...&since=<unix time> holds the
+    connection open and sends a "delta" event (see chart_delta) each time the
+    watchlist refreshes the instrument to a new dataset version. Idle clients
+    only receive keep-alive comments, so they make no requests at all.
+
+    Each stream ties up a server thread, so a worker holds at most
+    STREAM_MAX_CONNECTIONS of them and closes each after
+    STREAM_LIFETIME_SECONDS; the browser then reconnects, sending the last
+    event id so it resumes where it left off. Beyond the cap the request is
+    refused with 503 and the page keeps polling.
+    """
+
+    @server.route(STREAM_ROUTE)
+    def stream_updates():
+        symbol = request.args.get("symbol") or "QQQ"
+        interval = request.args.get("interval") or None
+        version = request.args.get("version") or None
+        since = request.args.get("since", type=int)
+        resume = _parse_event_id(request.headers.get("Last-Event-ID"))
+        if resume is not None:
+            version, since = resume
+
+        watchlist = get_watchlist()
+        if not watchlist.allows(symbol, interval):
+            return Response(f"Unknown instrument {symbol!r}", status=404)
+        if not stream_slots.acquire():
+            logging.warning(
+                f"Push stream refused for {symbol}: {stream_slots.limit} open"
+            )
+            return Response(
+                "Too many open streams\n",
+                status=503,
+                mimetype="text/plain",
+                headers={"Retry-After": str(REFUSED_RETRY_SECONDS)},
+            )
+        try:
+            entry = watchlist.add(symbol, interval)
+        except Exception:
+            stream_slots.release()
+            raise
+        logging.info(f"Push stream opened for {entry.symbol} at {version}")
+        response = Response(
+            stream_with_context(_stream(entry, version, since)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        # Runs when the server closes the response, however the stream ended
+        response.call_on_close(stream_slots.release)
+        return response
@@ -0,0 +1,109 @@
+import logging
+import random
+import threading
+import time
+from core.trading_calendar import poll_seconds, session_phase
+
+# Failed refreshes back off exponentially up to this many seconds
+MAX_BACKOFF_SECONDS = 600
+
+
+class RefreshScheduler:
+    """
+    Runs a refresh job on a server-side cadence, independent of clients
+
+    The gap between runs comes from `cadence` (by default the trading
+    calendar's poll_seconds: fast around the open and close, slower intraday,
+    idle outside sessions). A job that raises or returns False counts as a
+    failure and the next run backs off exponentially (with jitter) from the
+    current cadence up to max_backoff_seconds. request_refresh() wakes the
+    scheduler early; any number of requests between two runs collapse into a
+    single run.
+    """
+
+    def __init__(
+        self,
+        job,
+        cadence=poll_seconds,
+        max_backoff_seconds=MAX_BACKOFF_SECONDS,
+        name="refresh-scheduler",
+    ):
+        self.job = job
+        self.cadence = cadence
+        self.max_backoff_seconds = max_backoff_seconds
+        self.name = name
+        self.failures = 0
+        self.last_run = None
+        self.last_success = None
+        self.next_run = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self):
+        """Seconds until the next run, given the cadence and failures"""
+        base = self.cadence()
+        if not self.failures:
+            return base
+        backoff = min(base * 2**self.failures, self.max_backoff_seconds)
+        return max(base, backoff * random.uniform(0.8, 1.2))
+
+    def run_once(self):
+        """Run the job now and update the failure count"""
+        self.last_run = time.time()
+        try:
+            ok = self.job() is not False
+        except Exception as e:
+            logging.error(f"{self.name}: refresh failed: {e}")
+            ok = False
+
+        if ok:
+            self.failures = 0
+            self.last_success = self.last_run
+        else:
+            self.failures += 1
+        return ok
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            delay = self.next_delay()
+            self.next_run = time.time() + delay
+            if self.failures:
+                logging.warning(
+                    f"{self.name}: {self.failures} consecutive failures, "
+                    f"retrying in {delay:.0f}s"
+                )
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def request_refresh(self):
+        """Ask for an early run without waiting for it"""
+        self._wake.set()
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def status(self):
+        """Timestamps and failure count, for diagnostics"""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "session_phase": session_phase(),
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_success": self.last_success,
+            "next_run": self.next_run,
+        }
@@ -0,0 +1,229 @@
+import json
+import logging
+from pathlib import Path
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+import requests
+from core.calculators import calculate_trade_analysis_batch
+from core.pricing import price_chain
+
+try:
+    from config import OPTION_CHAIN_DIR, OPTION_CHAIN_URLS
+except ImportError:
+    OPTION_CHAIN_DIR = "data/chains"
+    OPTION_CHAIN_URLS = []
+
+# Column aliases accepted when loading a chain
+TYPE_COLUMNS = ("option_type", "type", "right", "put_call")
+CALL_VALUES = ("call", "c")
+PUT_VALUES = ("put", "p")
+CHAIN_SUFFIXES = (".csv", ".json", ".parquet")
+
+
+class ChainSourceError(ValueError):
+    """An option chain source outside the configured directory and URLs"""
+
+
+def _allowed_url(source, allowed_urls):
+    url = urlparse(source)
+    for allowed in allowed_urls:
+        base = urlparse(allowed)
+        path = base.path.rstrip("/")
+        if (url.scheme, url.netloc) == (base.scheme, base.netloc) and (
+            url.path == path or url.path.startswith(f"{path}/")
+        ):
+            return True
+    return False
+
+
+def resolve_chain_source(source, chain_dir=None, allowed_urls=None):
+    """
+    The chain file or URL a user-supplied source name refers to
+
+    Only bare file names inside chain_dir (default OPTION_CHAIN_DIR) and URLs
+    under one of allowed_urls (default OPTION_CHAIN_URLS) are accepted, so
+    the screener cannot be pointed at arbitrary files or hosts. Raises
+    ChainSourceError otherwise.
+    """
+    source = str(source).strip()
+    allowed_urls = OPTION_CHAIN_URLS if allowed_urls is None else allowed_urls
+
+    if source.startswith(("http://", "https://")):
+        if _allowed_url(source, allowed_urls):
+            return source
+        raise ChainSourceError("Option chain URL is not on the allowed list")
+
+    chain_dir = Path(OPTION_CHAIN_DIR if chain_dir is None else chain_dir).resolve()
+    if (
+        not source
+        or Path(source).name != source
+        or Path(source).suffix.lower() not in CHAIN_SUFFIXES
+    ):
+        raise ChainSourceError(
+            f"Option chain must be a {'/'.join(CHAIN_SUFFIXES)} file name"
+        )
+    path = (chain_dir / source).resolve()
+    if path.parent != chain_dir or not path.is_file():
+        raise ChainSourceError(f"No option chain named {source}")
+    return str(path)
+
+
+def load_chain(source, timeout=30):
+    """
+    Load an option chain from a CSV/JSON/Parquet file or an HTTP endpoint
+
+    HTTP endpoints may return a list of contracts or the server's usual
+    {"status": "success", "data": [...]} envelope. The source is trusted;
+    resolve names typed by users with resolve_chain_source first.
+    """
+    source = str(source)
+
+    if source.startswith(("http://", "https://")):
+        logging.info(f"Fetching option chain from {source}")
+        response = requests.get(source, timeout=timeout)
+        response.raise_for_status()
+        payload = response.json()
+        if isinstance(payload, dict):
+            if payload.get("status", "success") != "success":
+                raise ValueError(payload.get("message", "Option chain request failed"))
+            payload = payload.get("data", payload.get("chain", []))
+        return normalize_chain(pd.DataFrame(payload))
+
+    suffix = Path(source).suffix.lower()
+    if suffix == ".csv":
+        chain = pd.read_csv(source)
+    elif suffix == ".parquet":
+        chain = pd.read_parquet(source)
+    elif suffix == ".json":
+        with open(source) as f:
+            payload = json.load(f)
+        if isinstance(payload, dict):
+            payload = payload.get("data", payload.get("chain", []))
+        chain = pd.DataFrame(payload)
+    else:
+        raise ValueError(f"Unsupported option chain file: {source}")
+
+    return normalize_chain(chain)
+
+
+def normalize_chain(chain):
+    """
+    Normalise a chain to one row per contract: strike, option_type, bid, ask
+
+    Accepts either long format (a strike, a call/put type column, bid and ask)
+    or wide format (strike, call_bid, call_ask, put_bid, put_ask). Any other
+    columns, such as expiry, are carried through.
+    """
+    chain = chain.rename(columns=str.lower)
+
+    if "strike" not in chain.columns:
+        raise ValueError("Option chain is missing a 'strike' column")
+
+    if {"call_bid", "call_ask", "put_bid", "put_ask"} <= set(chain.columns):
+        extra = [
+            col
+            for col in chain.columns
+            if col not in ("strike", "call_bid", "call_ask", "put_bid", "put_ask")
+        ]
+        calls = chain[["strike", *extra, "call_bid", "call_ask"]].rename(
+            columns={"call_bid": "bid", "call_ask": "ask"}
+        )
+        calls["option_type"] = "call"
+        puts = chain[["strike", *extra, "put_bid", "put_ask"]].rename(
+            columns={"put_bid": "bid", "put_ask": "ask"}
+        )
+        puts["option_type"] = "put"
+        chain = pd.concat([calls, puts], ignore_index=True)
+    else:
+        type_column = next((col for col in TYPE_COLUMNS if col in chain.columns), None)
+        if type_column is None or not {"bid", "ask"} <= set(chain.columns):
+            raise ValueError(
+                "Option chain needs strike/type/bid/ask or "
+                "strike/call_bid/call_ask/put_bid/put_ask columns"
+            )
+        option_type = chain[type_column].astype(str).str.strip().str.lower()
+        chain = chain.drop(columns=[type_column]).assign(
+            option_type=np.select(
+                [option_type.isin(CALL_VALUES), option_type.isin(PUT_VALUES)],
+                ["call", "put"],
+                default="",
+            )
+        )
+        chain = chain[chain["option_type"] != ""]
+
+    chain = chain.assign(
+        **{
+            col: pd.to_numeric(chain[col], errors="coerce")
+            for col in ("strike", "bid", "ask")
+        }
+    )
+
+    # Contracts without a two-sided quote cannot be evaluated
+    quoted = np.isfinite(chain[["strike", "bid", "ask"]].to_numpy()).all(axis=1)
+    return chain[quoted].reset_index(drop=True)
+
+
+def screen_chain(
+    chain,
+    open_price,
+    current_price,
+    atr_value,
+    intrinsic_adjustment=1.0,
+    custom_intrinsic_value=None,
+    tradable_only=True,
+    top=None,
+    time_to_expiry=None,
+    rate=0.0,
+    vol=None,
+):
+    """
+    Apply the calculator's tradability rule to every contract in a chain
+
+    Calls are evaluated as long trades and puts as short trades, exactly as
+    calculate_trade_analysis would for each strike, including the intrinsic
+    adjustment or custom intrinsic value override. Results are ranked by
+    margin (target_size - target_price), best first.
+
+    When time_to_expiry (in years) is given, each contract is also priced with
+    core.pricing: implied volatility from the mid, and the theoretical value
+    and Greeks at `vol` (annualised decimal) or, without it, at that implied
+    volatility.
+    """
+    if not isinstance(chain, pd.DataFrame) or "option_type" not in chain.columns:
+        chain = normalize_chain(pd.DataFrame(chain))
+
+    direction = np.where(chain["option_type"].to_numpy() == "put", "short", "long")
+
+    results = calculate_trade_analysis_batch(
+        {
+            "open_price": open_price,
+            "current_price": current_price,
+            "strike_price": chain["strike"].to_numpy(),
+            "atr_value": atr_value,
+            "bid_price": chain["bid"].to_numpy(),
+            "ask_price": chain["ask"].to_numpy(),
+            "trade_direction": direction,
+            "intrinsic_adjustment": intrinsic_adjustment,
+            "custom_intrinsic_value": np.nan
+            if custom_intrinsic_value is None
+            else custom_intrinsic_value,
+        }
+    )
+
+    if time_to_expiry is not None:
+        chain = price_chain(chain, current_price, time_to_expiry, rate, vol=vol)
+
+    screened = chain.assign(direction=direction, **results)
+    screened["margin"] = screened["target_size"] - screened["target_price"]
+
+    if tradable_only:
+        screened = screened[screened["is_tradable"]]
+
+    screened = screened.sort_values(
+        ["margin", "strike"], ascending=[False, True], kind="stable"
+    ).reset_index(drop=True)
+
+    if top is not None:
+        screened = screened.head(top)
+    return screened
@@ -0,0 +1,166 @@
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from core.snapshots import SNAPSHOT_DIR, attach, publish_frame
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SNAPSHOT_DB_PATH = Path("data/snapshots.db")
+LEADER_LOCK_PATH = Path("data/refresh.lock")
+
+
+class SharedSnapshotCache:
+    """
+    Chart snapshots shared by every worker process on the host
+
+    One worker at a time holds an exclusive lock on LEADER_LOCK_PATH and is
+    the leader: it fetches from the data server and publishes each processed
+    (symbol, interval) snapshot, the chart payload in SQLite and the bar frame
+    as memory-mapped column files (see core.snapshots). The other workers load
+    the published snapshots instead of fetching, so adding gunicorn workers
+    adds request capacity without adding upstream fetches. The lock is released by the OS
+    when the leader exits, and the next worker to try takes over.
+
+    Without fcntl (Windows) every process is its own leader.
+    """
+
+    def __init__(
+        self,
+        db_path=SNAPSHOT_DB_PATH,
+        lock_path=LEADER_LOCK_PATH,
+        snapshot_dir=SNAPSHOT_DIR,
+    ):
+        self.db_path = Path(db_path)
+        self.lock_path = Path(lock_path)
+        self.snapshot_dir = Path(snapshot_dir)
+        self._lock_file = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    version TEXT,
+                    instrument TEXT,
+                    fetched_at REAL,
+                    chart_data BLOB,
+                    PRIMARY KEY (symbol, interval)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watched (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    PRIMARY KEY (symbol, interval)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def is_leader(self):
+        """Whether this process fetches for everyone; tries to take over if free"""
+        if fcntl is None or self._lock_file is not None:
+            return True
+        lock_file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+        logging.info(f"Process {os.getpid()} is now the refresh leader")
+        return True
+
+    def watch(self, symbol, interval):
+        """Ask the leader to keep an instrument warm"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO watched (symbol, interval) VALUES (?, ?)",
+                (symbol, interval),
+            )
+
+    def watched(self):
+        """Every (symbol, interval) any worker has asked for"""
+        with self._connect() as conn:
+            return conn.execute("SELECT symbol, interval FROM watched").fetchall()
+
+    def publish(self, symbol, interval, version, instrument, chart_data_body, df):
+        """
+        Store the latest processed snapshot of an instrument
+
+        The frame is written first, so a version visible in SQLite always has
+        its column files in place.
+        """
+        publish_frame(df, symbol, interval, version, root=self.snapshot_dir)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO snapshots
+                    (symbol, interval, version, instrument, fetched_at, chart_data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (symbol, interval, version, instrument, time.time(), chart_data_body),
+            )
+
+    def version(self, symbol, interval):
+        """Published version of an instrument, or None; cheap to poll"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM snapshots WHERE symbol = ? AND interval = ?",
+                (symbol, interval),
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, symbol, interval):
+        """
+        The published snapshot as a dict (version, instrument, fetched_at,
+        chart_data_body, df), or None if nothing has been published yet
+
+        df is backed by read-only memory maps shared with every other worker.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT version, instrument, fetched_at, chart_data
+                FROM snapshots WHERE symbol = ? AND interval = ?
+                """,
+                (symbol, interval),
+            ).fetchone()
+        if row is None:
+            return None
+        version, instrument, fetched_at, chart_data_body = row
+        snapshot = attach(symbol, interval, root=self.snapshot_dir)
+        return {
+            "version": version,
+            "instrument": instrument,
+            "fetched_at": fetched_at,
+            "chart_data_body": chart_data_body,
+            "df": snapshot.to_frame() if snapshot is not None else None,
+        }
+
+    def frame(self, symbol, interval):
+        """The published bar frame as memory-mapped views, or None"""
+        snapshot = attach(symbol, interval, root=self.snapshot_dir)
+        return snapshot.to_frame() if snapshot is not None else None
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = Path("data/snapshots")
+MANIFEST_NAME = "manifest.json"
+# Superseded versions kept on disk for readers that are still switching over
+KEEP_VERSIONS = 2
+# Missing values of string columns, stored as codes: code - 1 indexes this
+MISSING_VALUES = (None, np.nan, pd.NaT, pd.NA)
+NAN_CODE = 2
+
+
+def _instrument_dir(root, symbol, interval):
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", f"{symbol}_{interval}")
+    return Path(root) / name
+
+
+def _version_dirname(version):
+    return hashlib.sha1(str(version).encode()).hexdigest()[:16]
+
+
+def _missing_codes(values):
+    """Per-row MISSING_VALUES codes (0 = present), or None if nothing is missing"""
+    missing = pd.isna(values)
+    if not missing.any():
+        return None
+    codes = np.zeros(len(values), dtype=np.int8)
+    for position in np.flatnonzero(missing):
+        value = values[position]
+        codes[position] = next(
+            (
+                code
+                for code, marker in enumerate(MISSING_VALUES, 1)
+                if value is marker
+            ),
+            NAN_CODE,
+        )
+    return codes
+
+
+def _restore_missing(values, codes):
+    """String column values with the missing entries put back"""
+    values = values.astype(object)
+    for code, marker in enumerate(MISSING_VALUES, 1):
+        values[codes == code] = marker
+    return values
+
+
+def publish_frame(df, symbol, interval, version, root=SNAPSHOT_DIR):
+    """
+    Write a processed bar frame as a read-only columnar snapshot
+
+    Every column becomes one .npy file in a directory for this version;
+    numeric columns keep their dtype and everything else is stored as fixed
+    width strings, with a code file marking which rows were None, NaN, NaT
+    or NA so they come back as such rather than as "None" or "nan". The
+    snapshot goes live when manifest.json is swapped in with
+    os.replace, so readers see either the old version or the new one, never a
+    partial write. Returns the manifest.
+    """
+    base = _instrument_dir(root, symbol, interval)
+    version_dir = base / _version_dirname(version)
+    staging = version_dir.with_name(f"{version_dir.name}.tmp{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    index = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+    np.save(staging / "index.npy", index)
+
+    columns = []
+    for position, name in enumerate(df.columns):
+        values = df[name].to_numpy()
+        column = {"name": name, "file": f"c{position}.npy"}
+        if values.dtype.kind not in "biuf":
+            codes = _missing_codes(values)
+            if codes is not None:
+                column["missing"] = f"c{position}.missing.npy"
+                np.save(staging / column["missing"], codes)
+                values = np.where(codes > 0, "", values)
+            values = values.astype(str)
+        np.save(staging / column["file"], values)
+        column["dtype"] = values.dtype.str
+        columns.append(column)
+
+    manifest = {
+        "version": version,
+        "path": version_dir.name,
+        "rows": len(df),
+        "index_name": df.index.name,
+        "columns": columns,
+    }
+
+    try:
+        os.replace(staging, version_dir)
+    except OSError:
+        # Already published by another worker
+        shutil.rmtree(staging, ignore_errors=True)
+
+    manifest_tmp = base / f"{MANIFEST_NAME}.tmp{os.getpid()}"
+    manifest_tmp.write_text(json.dumps(manifest))
+    os.replace(manifest_tmp, base / MANIFEST_NAME)
+
+    _prune(base, keep=version_dir.name)
+    return manifest
+
+
+def _prune(base, keep):
+    """Remove all but the newest KEEP_VERSIONS version directories"""
+    versions = sorted(
+        (path for path in base.iterdir() if path.is_dir() and ".tmp" not in path.name),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in versions[KEEP_VERSIONS:]:
+        if path.name != keep:
+            # Open memory maps stay valid after their files are unlinked
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class BarSnapshot:
+    """
+    A published bar frame attached as read-only memory maps
+
+    Columns are NumPy views of the snapshot files, so every worker process
+    attached to the same version shares one copy in the page cache.
+    """
+
+    def __init__(self, base, manifest):
+        self.version = manifest["version"]
+        self.rows = manifest["rows"]
+        version_dir = Path(base) / manifest["path"]
+        self.index = pd.DatetimeIndex(
+            np.load(version_dir / "index.npy", mmap_mode="r").view("M8[ns]"),
+            name=manifest.get("index_name"),
+        )
+        # Plain ndarray views of the maps, so pandas treats them like any array
+        self.columns = {}
+        self._restored = set()
+        for column in manifest["columns"]:
+            values = np.load(version_dir / column["file"], mmap_mode="r")
+            values = values.view(np.ndarray)
+            if "missing" in column:
+                # Columns with missing values become private object arrays
+                codes = np.load(version_dir / column["missing"])
+                values = _restore_missing(values, codes)
+                self._restored.add(column["name"])
+            self.columns[column["name"]] = values
+
+    def to_frame(self):
+        """The snapshot as a DataFrame whose numeric columns are views"""
+        columns = {
+            name: (
+                # Kept as object so pandas does not turn None into NaN
+                pd.Series(values, index=self.index, dtype=object, copy=False)
+                if name in self._restored
+                else values
+            )
+            for name, values in self.columns.items()
+        }
+        return pd.DataFrame(columns, index=self.index, copy=False)
+
+
+_attached = {}
+_attached_lock = threading.Lock()
+
+
+def read_manifest(symbol, interval, root=SNAPSHOT_DIR):
+    path = _instrument_dir(root, symbol, interval) / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def attach(symbol, interval, root=SNAPSHOT_DIR):
+    """
+    The live snapshot of an instrument, or None if none was published
+
+    The attached snapshot is reused until the manifest names a new version.
+    """
+    key = (str(root), symbol, interval)
+    for _ in range(3):
+        manifest = read_manifest(symbol, interval, root)
+        if manifest is None:
+            return None
+
+        with _attached_lock:
+            snapshot = _attached.get(key)
+            if snapshot is not None and snapshot.version == manifest["version"]:
+                return snapshot
+
+        try:
+            snapshot = BarSnapshot(_instrument_dir(root, symbol, interval), manifest)
+        except FileNotFoundError:
+            # Pruned between reading the manifest and opening it; a newer
+            # manifest is already in place
+            logging.info(f"Snapshot {manifest['version']} of {symbol} was replaced")
+            continue
+
+        with _attached_lock:
+            _attached[key] = snapshot
+        return snapshot
+    return None
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from core.calculators import BATCH_OUTPUT_FIELDS, calculate_trade_analysis_batch
+from core.parallel import run_sharded
+
+SWEEP_DIMS = ("atr_multiplier", "intrinsic_adjustment", "price_offset")
+
+# Grids smaller than this are evaluated in-process
+SWEEP_PARALLEL_MIN_POINTS = 2_000_000
+
+
+def _evaluate_grid(arrays, base=None, offset_field="current_price"):
+    """Evaluate one shard of flattened grid points"""
+    inputs = dict(base)
+    inputs["atr_value"] = base["atr_value"] * arrays["atr_multiplier"]
+    inputs["intrinsic_adjustment"] = arrays["intrinsic_adjustment"]
+    inputs[offset_field] = base[offset_field] + arrays["price_offset"]
+    return calculate_trade_analysis_batch(inputs)
+
+
+def sweep_trade_analysis(
+    base_inputs,
+    atr_multipliers=(1.0,),
+    intrinsic_adjustments=(1.0,),
+    price_offsets=(0.0,),
+    offset_field="current_price",
+    workers=None,
+):
+    """
+    Evaluate calculate_trade_analysis over a grid of parameter variations
+
+    `base_inputs` is the calculator's usual input dict. Every combination of
+    ATR multiplier (scales atr_value), intrinsic adjustment and price offset
+    (added to offset_field, the current price by default) is evaluated in one
+    vectorised pass; grids above SWEEP_PARALLEL_MIN_POINTS are sharded across a
+    process pool.
+
+    Returns a result cube: {"dims", "coords", <output>: ndarray} where every
+    output array has shape (len(atr_multipliers), len(intrinsic_adjustments),
+    len(price_offsets)).
+    """
+    if offset_field not in ("current_price", "open_price", "strike_price"):
+        raise ValueError(f"Cannot apply price offsets to {offset_field!r}")
+
+    base = {
+        key: float(base_inputs[key])
+        for key in (
+            "open_price",
+            "current_price",
+            "strike_price",
+            "atr_value",
+            "bid_price",
+            "ask_price",
+        )
+    }
+    base["trade_direction"] = base_inputs.get("trade_direction", "long")
+    if base_inputs.get("custom_intrinsic_value") is not None:
+        base["custom_intrinsic_value"] = float(base_inputs["custom_intrinsic_value"])
+
+    coords = {
+        "atr_multiplier": np.asarray(atr_multipliers, dtype=float),
+        "intrinsic_adjustment": np.asarray(intrinsic_adjustments, dtype=float),
+        "price_offset": np.asarray(price_offsets, dtype=float),
+    }
+    shape = tuple(len(coords[dim]) for dim in SWEEP_DIMS)
+
+    mesh = np.meshgrid(*(coords[dim] for dim in SWEEP_DIMS), indexing="ij")
+    grid = {dim: values.ravel() for dim, values in zip(SWEEP_DIMS, mesh)}
+
+    results = run_sharded(
+        _evaluate_grid,
+        grid,
+        workers=workers,
+        min_rows=SWEEP_PARALLEL_MIN_POINTS,
+        base=base,
+        offset_field=offset_field,
+    )
+
+    cube = {"dims": SWEEP_DIMS, "coords": coords}
+    for field in BATCH_OUTPUT_FIELDS:
+        cube[field] = results[field].reshape(shape)
+    cube["margin"] = cube["target_size"] - cube["target_price"]
+    return cube
+
+
+def sweep_to_frame(cube):
+    """Flatten a sweep cube into a long DataFrame, one row per grid point"""
+    index = pd.MultiIndex.from_product(
+        [cube["coords"][dim] for dim in cube["dims"]], names=cube["dims"]
+    )
+    fields = [*BATCH_OUTPUT_FIELDS, "margin"]
+    return pd.DataFrame(
+        {field: cube[field].ravel() for field in fields}, index=index
+    ).reset_index()
+
+
+def tradability_heatmap(
+    cube, rows="atr_multiplier", columns="price_offset", value="is_tradable"
+):
+    """
+    Two-dimensional heatmap of a sweep output
+
+    The remaining dimension is averaged out, so with value="is_tradable" each
+    cell is the share of tradable combinations.
+    """
+    dims = list(cube["dims"])
+    if rows not in dims or columns not in dims or rows == columns:
+        raise ValueError(f"rows and columns must be two different dims of {dims}")
+
+    values = cube[value].astype(float)
+    remaining = tuple(i for i, dim in enumerate(dims) if dim not in (rows, columns))
+    if remaining:
+        values = values.mean(axis=remaining)
+    if dims.index(rows) > dims.index(columns):
+        values = values.T
+
+    return pd.DataFrame(
+        values,
+        index=pd.Index(cube["coords"][rows], name=rows),
+        columns=pd.Index(cube["coords"][columns], name=columns),
+    )
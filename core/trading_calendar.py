@@ -0,0 +1,195 @@
+from datetime import date, datetime, time as dt_time, timedelta
+from functools import lru_cache
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:
+    ZoneInfo = None
+
+try:
+    from config import (
+        REFRESH_SECONDS_EDGE,
+        REFRESH_SECONDS_INTRADAY,
+        REFRESH_SECONDS_CLOSED,
+    )
+except ImportError:
+    REFRESH_SECONDS_EDGE = 15
+    REFRESH_SECONDS_INTRADAY = 60
+    REFRESH_SECONDS_CLOSED = 3600
+
+MARKET_TIMEZONE = "America/New_York"
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+EARLY_CLOSE = dt_time(13, 0)
+# Minutes after the open and before the close that are polled at the fast rate
+EDGE_MINUTES = 30
+# Minutes after the close that are still polled at the intraday rate, so the
+# settled final bar is picked up
+SETTLE_MINUTES = 15
+
+
+def _market_tz():
+    if ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(MARKET_TIMEZONE)
+    except ZoneInfoNotFoundError:
+        return None
+
+
+MARKET_TZ = _market_tz()
+
+
+def _nth_weekday(year, month, weekday, n):
+    """The nth given weekday of a month (n=-1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    following = date(year + month // 12, month % 12 + 1, 1)
+    last = following - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    day = (h + l - 7 * m + 33 * month + 19) % 32
+    return date(year, month, day)
+
+
+def _observed(day):
+    """Weekend holidays move to the nearest weekday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=64)
+def holidays(year):
+    """NYSE full-day holidays for a year"""
+    days = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day is not moved back into the previous year when it falls on
+    # a Saturday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return frozenset(days)
+
+
+@lru_cache(maxsize=64)
+def early_closes(year):
+    """Sessions that close at 13:00 ET"""
+    days = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}  # Day after Thanksgiving
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() < 5:
+            days.add(day)
+    return frozenset(days - holidays(year))
+
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def session_bounds(day):
+    """(open, close) datetimes in market time for a trading day, else None"""
+    if not is_trading_day(day):
+        return None
+    close = EARLY_CLOSE if day in early_closes(day.year) else MARKET_CLOSE
+    return (
+        datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ),
+        datetime.combine(day, close, tzinfo=MARKET_TZ),
+    )
+
+
+def _market_now(now=None):
+    now = now or datetime.now(MARKET_TZ)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=MARKET_TZ)
+    return now.astimezone(MARKET_TZ)
+
+
+def next_open(now=None):
+    """The next session open strictly after now"""
+    now = _market_now(now)
+    day = now.date()
+    for _ in range(15):
+        bounds = session_bounds(day)
+        if bounds and bounds[0] > now:
+            return bounds[0]
+        day += timedelta(days=1)
+    return None
+
+
+def session_phase(now=None):
+    """
+    Where now falls in the trading day
+
+    "opening" and "closing" are the first and last EDGE_MINUTES of a session,
+    "intraday" the rest of it, and "closed" anything outside a session
+    (weekends, holidays, after an early close). Without timezone data every
+    moment counts as "intraday".
+    """
+    if MARKET_TZ is None:
+        return "intraday"
+    now = _market_now(now)
+    bounds = session_bounds(now.date())
+    if bounds is None or not bounds[0] <= now < bounds[1]:
+        return "closed"
+    edge = timedelta(minutes=EDGE_MINUTES)
+    if now < bounds[0] + edge:
+        return "opening"
+    if now >= bounds[1] - edge:
+        return "closing"
+    return "intraday"
+
+
+def is_market_open(now=None):
+    """Whether a regular session is in progress"""
+    return session_phase(now) != "closed"
+
+
+def poll_seconds(now=None):
+    """
+    How often market data should be polled right now
+
+    Fast (REFRESH_SECONDS_EDGE) around the open and close, slower intraday
+    and for SETTLE_MINUTES after the close, and idle outside sessions:
+    REFRESH_SECONDS_CLOSED, but never sleeping through the next open.
+    """
+    phase = session_phase(now)
+    if phase in ("opening", "closing"):
+        return REFRESH_SECONDS_EDGE
+    if phase == "intraday":
+        return REFRESH_SECONDS_INTRADAY
+
+    now = _market_now(now)
+    bounds = session_bounds(now.date())
+    if bounds and bounds[1] <= now < bounds[1] + timedelta(minutes=SETTLE_MINUTES):
+        return REFRESH_SECONDS_INTRADAY
+
+    upcoming = next_open(now)
+    if upcoming is None:
+        return REFRESH_SECONDS_CLOSED
+    until_open = (upcoming - now).total_seconds()
+    return max(REFRESH_SECONDS_EDGE, min(REFRESH_SECONDS_CLOSED, until_open))
@@ -1,303 +1,227 @@
+from functools import lru_cache
+
 from dash import html
 
-import pandas as pd
-
-
-def styled_row(label, value, label_color="#cccccc", value_color="#ffffff"):
-    """Create a two-cell row with specific colors"""
-    row_style = {
-        "display": "grid",
-        "gridTemplateColumns": "1fr 1fr",
-        "borderBottom": "1px solid #555",
-        "fontSize": "12px",
-        "lineHeight": "1.6",
-    }
-
-    label_style = {
-        "backgroundColor": label_color,
-        "color": "#000000",
-        "padding": "4px 8px",
-        "fontWeight": "bold",
-        "borderRight": "1px solid #555",
-    }
-
-    value_style = {
-        "backgroundColor": "#ffffff",
-        "color": "#000000",
-        "padding": "4px 8px",
-        "textAlign": "right",
-        "fontWeight": "normal",
-    }
+from core.data_processing import get_panel_table
+
+# Shared styles, built once instead of per row and per render
+ROW_STYLE = {
+    "display": "grid",
+    "gridTemplateColumns": "1fr 1fr",
+    "borderBottom": "1px solid #555",
+    "fontSize": "12px",
+    "lineHeight": "1.6",
+}
+
+LABEL_STYLE = {
+    "color": "#000000",
+    "padding": "4px 8px",
+    "fontWeight": "bold",
+    "borderRight": "1px solid #555",
+}
+
+VALUE_STYLE = {
+    "backgroundColor": "#ffffff",
+    "color": "#000000",
+    "padding": "4px 8px",
+    "textAlign": "right",
+    "fontWeight": "normal",
+}
+
+PANEL_STYLE = {
+    "backgroundColor": "#fff",
+    "border": "2px solid #333",
+    "marginBottom": "10px",
+}
+
+PANEL_TITLE_STYLE = {
+    "backgroundColor": "#ccc",
+    "color": "#000",
+    "padding": "4px 8px",
+    "fontWeight": "bold",
+    "fontSize": "12px",
+    "textAlign": "center",
+    "borderBottom": "1px solid #555",
+}
+
+INSTRUMENT_STYLE = {**PANEL_TITLE_STYLE, "backgroundColor": "#fff"}
+
+DATA_BOX_TITLE_STYLE = {
+    "backgroundColor": "#FF6600",
+    "color": "#ffffff",
+    "padding": "4px 8px",
+    "fontWeight": "bold",
+    "fontSize": "12px",
+    "borderBottom": "1px solid #555",
+}
+
+WEEK_ROW_STYLE = {
+    "display": "flex",
+    "borderBottom": "1px solid #555",
+    "fontSize": "12px",
+}
+
+WEEK_LABEL_STYLE = {
+    "flex": 1,
+    "backgroundColor": "#333",
+    "color": "#fff",
+    "padding": "4px 8px",
+    "fontWeight": "bold",
+}
+
+WEEK_VALUE_STYLE = {
+    "flex": 1,
+    "backgroundColor": "#fff",
+    "color": "#000",
+    "padding": "4px 8px",
+    "textAlign": "right",
+}
+
+# Rows of each panel: (label, panel table field, label color)
+DATA_BOX_ROWS = [
+    ("Date", "date", "#cccccc"),
+    ("Price", "price", "#cccccc"),
+    ("Open", "open", "#cccccc"),
+    ("High", "high", "#cccccc"),
+    ("Low", "low", "#cccccc"),
+    ("Close", "close", "#cccccc"),
+    # FIXED: Use full volume format for Panel 1
+    ("Volume", "volume", "#cccccc"),
+    ("Mean", "mean", "#FF8C00"),
+    ("SMA", "sma", "#0000FF"),
+    ("Trigger", "trigger", "#FF00FF"),
+    ("Trigger Ave...", "trigger_avg", "#00FFFF"),
+    ("Upper band", "upper_band", "#8B0000"),
+    ("Lower band", "lower_band", "#8B0000"),
+]
+
+PANELS = [
+    (
+        "Panel 2",
+        [
+            ("Momentum...", "momentum_histogram", "#008000"),
+            ("SqueezeDots", "squeeze_dots", "#0000FF"),
+        ],
+    ),
+    (
+        "Panel 3",
+        [
+            ("Squeeze", "squeeze", "#0000FF"),
+            ("Momentum", "momentum", "#FF0000"),
+        ],
+    ),
+    # FIXED: Use abbreviated volume format for Panel 4
+    ("Panel 4", [("Volume", "volume_abbreviated", "#8B0000")]),
+    (
+        "Panel 5",
+        [
+            ("Range value", "range", "#008B8B"),
+            ("ATR", "atr", "#008B8B"),
+        ],
+    ),
+]
 
-    return html.Div(
-        [html.Div(label, style=label_style), html.Div(value, style=value_style)],
-        style=row_style,
-    )
+# Value cells in layout order, which is also the order Dash uses for
+# ALL-wildcard panel-value outputs
+PANEL_VALUE_FIELDS = [
+    "week",
+    "instrument",
+    *[field for _, field, _ in DATA_BOX_ROWS],
+    *[field for _, rows in PANELS for _, field, _ in rows],
+]
 
+PANEL_PLACEHOLDER = "--"
 
-def format_volume_full(v):
-    """Format volume with commas for Panel 1 (45,891,110)"""
-    try:
-        volume_int = int(v)
-        return f"{volume_int:,}"
-    except (ValueError, TypeError):
-        return str(v)
-
-
-def format_volume_abbreviated(v):
-    """Format volume abbreviated for Panel 4 (45M) - FIXED"""
-    try:
-        volume_int = int(v)
-        if volume_int >= 1_000_000_000:
-            return f"{volume_int // 1_000_000_000}B"  # ✅ Uses floor division
-        elif volume_int >= 1_000_000:
-            return (
-                f"{volume_int // 1_000_000}M"  # ✅ Uses floor division - this gives 45M
-            )
-        elif volume_int >= 1_000:
-            return f"{volume_int // 1_000}K"  # ✅ Uses floor division
-        return str(volume_int)
-    except (ValueError, TypeError):
-        return str(v)
-
-
-def create_data_panels(df, symbol, bar_index=-1):
-    """Create NT8-style data panels matching the screenshot"""
-    if df is None or df.empty:
-        return "No data", "No data", "No data", "No data", "No data"
 
-    latest = df.iloc[bar_index]
-    latest_date = latest.name
-    instrument = latest.get("Instrument", symbol)
+def panel_value_id(field):
+    """Pattern-matching id of a panel value cell"""
+    return {"type": "panel-value", "field": field}
 
-    week_num = latest_date.isocalendar()[1]
-    year = latest_date.year
 
-    # FIXED: Use correct Mean value and volume formatting
-    mean_value = latest.get("Mean", 0)
-    if pd.isna(mean_value):
-        mean_value = 0
+def _value_cell(field, values, style):
+    if values is None:
+        return html.Div(PANEL_PLACEHOLDER, id=panel_value_id(field), style=style)
+    value = values[field]
+    if field == "instrument":
+        value = f"{value} (Daily)"
+    return html.Div(value, style=style)
 
-    # FIXED: Different volume formatting for Panel 1 and Panel 4
-    volume_panel1 = format_volume_full(latest["Volume"])  # "45,891,110"
-    volume_panel4 = format_volume_abbreviated(latest["Volume"])  # "45M"
 
-    data_box = html.Div(
-        [
-            html.Div(
-                "Data Box",
-                style={
-                    "backgroundColor": "#FF6600",
-                    "color": "#ffffff",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            html.Div(
-                [
-                    html.Div(
-                        "Week",
-                        style={
-                            "flex": 1,
-                            "backgroundColor": "#333",
-                            "color": "#fff",
-                            "padding": "4px 8px",
-                            "fontWeight": "bold",
-                        },
-                    ),
-                    html.Div(
-                        f"{week_num}/{year}",
-                        style={
-                            "flex": 1,
-                            "backgroundColor": "#fff",
-                            "color": "#000",
-                            "padding": "4px 8px",
-                            "textAlign": "right",
-                        },
-                    ),
-                ],
-                style={
-                    "display": "flex",
-                    "borderBottom": "1px solid #555",
-                    "fontSize": "12px",
-                },
-            ),
-            html.Div(
-                "Panel 1",
-                style={
-                    "backgroundColor": "#ccc",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            html.Div(
-                f"{instrument} (Daily)",
-                style={
-                    "backgroundColor": "#fff",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            styled_row("Date", latest_date.strftime("%m/%d/%Y")),
-            styled_row("Price", f"{latest['Close']:.2f}"),
-            styled_row("Open", f"{latest['Open']:.2f}"),
-            styled_row("High", f"{latest['High']:.2f}"),
-            styled_row("Low", f"{latest['Low']:.2f}"),
-            styled_row("Close", f"{latest['Close']:.2f}"),
-            # FIXED: Use full volume format for Panel 1
-            styled_row("Volume", volume_panel1),
-            # FIXED: Use correct Mean value
-            styled_row("Mean", f"{mean_value:.2f}", label_color="#FF8C00"),
-            styled_row(
-                "SMA",
-                f"{latest.get('SMA_20', 0):.2f}",
-                label_color="#0000FF",
-                value_color="#ffffff",
-            ),
-            styled_row(
-                "Trigger", f"{latest.get('BB_middle', 0):.2f}", label_color="#FF00FF"
-            ),
-            styled_row(
-                "Trigger Ave...",
-                f"{latest.get('BB_middle_avg', 0):.2f}",
-                label_color="#00FFFF",
-            ),
-            styled_row(
-                "Upper band", f"{latest.get('BB_upper', 0):.2f}", label_color="#8B0000"
-            ),
-            styled_row(
-                "Lower band", f"{latest.get('BB_lower', 0):.2f}", label_color="#8B0000"
-            ),
-        ],
-        style={
-            "backgroundColor": "#fff",
-            "border": "2px solid #333",
-            "marginBottom": "10px",
-        },
-    )
+@lru_cache(maxsize=None)
+def _label_cell(label, label_color):
+    return html.Div(label, style={**LABEL_STYLE, "backgroundColor": label_color})
 
-    panel_2 = html.Div(
-        [
-            html.Div(
-                "Panel 2",
-                style={
-                    "backgroundColor": "#ccc",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            styled_row(
-                "Momentum...",
-                f"{latest.get('Momentum_Histogram', 0):.3f}",
-                label_color="#008000",
-            ),
-            styled_row(
-                "SqueezeDots",
-                f"{latest.get('Squeeze_Dots', 0):.0f}",
-                label_color="#0000FF",
-                value_color="#ffffff",
-            ),
-        ],
-        style={
-            "backgroundColor": "#fff",
-            "border": "2px solid #333",
-            "marginBottom": "10px",
-        },
-    )
 
-    panel_3 = html.Div(
-        [
-            html.Div(
-                "Panel 3",
-                style={
-                    "backgroundColor": "#ccc",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            styled_row(
-                "Squeeze",
-                f"{latest.get('Squeeze', 0):.0f}",
-                label_color="#0000FF",
-                value_color="#ffffff",
-            ),
-            styled_row(
-                "Momentum", f"{latest.get('Momentum', 0):.2f}", label_color="#FF0000"
-            ),
-        ],
-        style={
-            "backgroundColor": "#fff",
-            "border": "2px solid #333",
-            "marginBottom": "10px",
-        },
-    )
+@lru_cache(maxsize=None)
+def _title(text, style_key):
+    styles = {"data_box": DATA_BOX_TITLE_STYLE, "panel": PANEL_TITLE_STYLE}
+    return html.Div(text, style=styles[style_key])
 
-    panel_4 = html.Div(
-        [
-            html.Div(
-                "Panel 4",
-                style={
-                    "backgroundColor": "#ccc",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            # FIXED: Use abbreviated volume format for Panel 4
-            styled_row("Volume", volume_panel4, label_color="#8B0000"),
-        ],
-        style={
-            "backgroundColor": "#fff",
-            "border": "2px solid #333",
-            "marginBottom": "10px",
-        },
+
+WEEK_LABEL = html.Div("Week", style=WEEK_LABEL_STYLE)
+
+
+def _panel_row(label, field, label_color, values):
+    return html.Div(
+        [_label_cell(label, label_color), _value_cell(field, values, VALUE_STYLE)],
+        style=ROW_STYLE,
     )
 
-    panel_5 = html.Div(
+
+def build_panels(values=None):
+    """
+    Build the five data panel trees
+
+    Titles, labels and styles are shared, cached subtrees; only the value
+    cells depend on `values` (one row of the panel table). With values=None
+    the value cells get pattern-matching ids and placeholders instead, giving
+    the static skeleton that the clientside panel callback fills per bar.
+    """
+    data_box = html.Div(
         [
+            _title("Data Box", "data_box"),
             html.Div(
-                "Panel 5",
-                style={
-                    "backgroundColor": "#ccc",
-                    "color": "#000",
-                    "padding": "4px 8px",
-                    "fontWeight": "bold",
-                    "fontSize": "12px",
-                    "textAlign": "center",
-                    "borderBottom": "1px solid #555",
-                },
-            ),
-            styled_row(
-                "Range value", f"{latest.get('Range', 0):.2f}", label_color="#008B8B"
-            ),
-            styled_row("ATR", f"{latest.get('ATR', 0):.2f}", label_color="#008B8B"),
+                [WEEK_LABEL, _value_cell("week", values, WEEK_VALUE_STYLE)],
+                style=WEEK_ROW_STYLE,
+            ),
+            _title("Panel 1", "panel"),
+            _value_cell("instrument", values, INSTRUMENT_STYLE),
+            *[
+                _panel_row(label, field, color, values)
+                for label, field, color in DATA_BOX_ROWS
+            ],
         ],
-        style={
-            "backgroundColor": "#fff",
-            "border": "2px solid #333",
-            "marginBottom": "10px",
-        },
+        style=PANEL_STYLE,
     )
 
-    return data_box, panel_2, panel_3, panel_4, panel_5
+    panels = [
+        html.Div(
+            [
+                _title(title, "panel"),
+                *[
+                    _panel_row(label, field, color, values)
+                    for label, field, color in rows
+                ],
+            ],
+            style=PANEL_STYLE,
+        )
+        for title, rows in PANELS
+    ]
+
+    return (data_box, *panels)
+
+
+@lru_cache(maxsize=1)
+def create_panel_skeleton():
+    """Static data panels for the layout, with id'd value cells"""
+    return build_panels(None)
+
+
+def create_data_panels(df, symbol, bar_index=-1, panel_table=None):
+    """Create NT8-style data panels matching the screenshot"""
+    if df is None or df.empty:
+        return "No data", "No data", "No data", "No data", "No data"
+
+    if panel_table is None:
+        panel_table = get_panel_table(df, symbol)
+    return build_panels(panel_table.iloc[bar_index].to_dict())
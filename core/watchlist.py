@@ -0,0 +1,338 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.data_processing import fetch_and_process_data
+from core.ib_client import IBClient
+from core.payload import ChartPayload, dumps, loads
+from core.scheduler import RefreshScheduler
+from core.shared_cache import SharedSnapshotCache
+from core.trading_calendar import poll_seconds
+
+try:
+    from config import WATCHLIST_SYMBOLS, WATCHLIST_INTERVALS
+except ImportError:
+    WATCHLIST_SYMBOLS = ["QQQ"]
+    WATCHLIST_INTERVALS = ["1d", "1wk"]
+
+DEFAULT_PERIOD = "10y"
+DEFAULT_INTERVAL = "1d"
+DEFAULT_MAX_WORKERS = 8
+# Seconds between checks of the shared snapshot cache by follower workers
+SHARED_POLL_SECONDS = 5
+
+
+class UnknownInstrumentError(ValueError):
+    """A client asked for an instrument the watchlist does not serve"""
+
+
+class WatchlistEntry:
+    """The latest processed data for one (symbol, interval)"""
+
+    def __init__(self, symbol, interval):
+        self.symbol = symbol
+        self.interval = interval
+        self.df = None
+        self.chart_data = None
+        # The chart data serialised once, for serving as-is (core.payload)
+        self.payload = None
+        self.instrument = symbol
+        self.version = None
+        self.fetched_at = None
+        self.error = None
+
+    @property
+    def is_warm(self):
+        return self.chart_data is not None
+
+
+class Watchlist:
+    """
+    Tracks many instruments and keeps their chart data warm
+
+    Every tracked (symbol, interval) has a cache entry that a RefreshScheduler
+    refreshes on a server-side cadence, fetching all instruments concurrently
+    on a thread pool, so the fetch load does not depend on how many browsers
+    are open. Readers get the cached entry without blocking; only the first
+    request for an instrument that has never been loaded waits for a fetch,
+    and concurrent requests for the same instrument share that one fetch.
+
+    With a SharedSnapshotCache, only the leader worker fetches; the others
+    pick up its published snapshots (see core.shared_cache).
+
+    Only add() registers new instruments. Symbols coming from clients are
+    checked with allows() first, since every tracked instrument is refreshed
+    (and, when shared, persisted) for good.
+    """
+
+    def __init__(
+        self,
+        symbols=None,
+        period=DEFAULT_PERIOD,
+        interval=DEFAULT_INTERVAL,
+        cadence=poll_seconds,
+        max_workers=DEFAULT_MAX_WORKERS,
+        fetch=fetch_and_process_data,
+        shared=None,
+    ):
+        self.period = period
+        self.interval = interval
+        self.intervals = set(WATCHLIST_INTERVALS) | {interval}
+        self.fetch = fetch
+        self.cadence = cadence
+        self.shared = shared
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="watchlist"
+        )
+        self._lock = threading.Lock()
+        # Notified whenever an entry's dataset version changes
+        self._changed = threading.Condition(self._lock)
+        self._entries = {}
+        self._inflight = {}
+        self._discovered = False
+        self.scheduler = RefreshScheduler(
+            self._scheduled_refresh,
+            cadence=self._scheduler_cadence,
+            name="watchlist-refresh",
+        )
+
+        for symbol in symbols if symbols is not None else WATCHLIST_SYMBOLS:
+            self.add(symbol)
+
+    def _key(self, symbol, interval=None):
+        return (symbol.strip().upper(), interval or self.interval)
+
+    def add(self, symbol, interval=None):
+        """Start tracking an instrument; returns its cache entry"""
+        key = self._key(symbol, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            created = entry is None
+            if created:
+                entry = self._entries[key] = WatchlistEntry(*key)
+        if created and self.shared is not None:
+            self.shared.watch(*key)
+        return entry
+
+    def remove(self, symbol, interval=None):
+        """Stop tracking an instrument and drop its cached data"""
+        with self._lock:
+            self._entries.pop(self._key(symbol, interval), None)
+
+    def symbols(self):
+        """Tracked symbols, in the order they were added"""
+        with self._lock:
+            return list(dict.fromkeys(symbol for symbol, _ in self._entries))
+
+    def get(self, symbol, interval=None):
+        """The cached entry for an instrument, or None; never fetches"""
+        with self._lock:
+            return self._entries.get(self._key(symbol, interval))
+
+    def allows(self, symbol, interval=None):
+        """
+        Whether clients may ask for an instrument
+
+        That is any tracked symbol (configured, discovered from the data
+        server, or tracked by another worker) at one of the served intervals.
+        """
+        name, interval = self._key(symbol, interval)
+        if interval not in self.intervals:
+            return False
+        with self._lock:
+            if any(tracked == name for tracked, _ in self._entries):
+                return True
+        return self.shared is not None and any(
+            tracked == name for tracked, _ in self.shared.watched()
+        )
+
+    def get_or_fetch(self, symbol, interval=None):
+        """
+        The cached entry for an instrument, fetching it first if it is cold
+
+        Raises UnknownInstrumentError for instruments allows() rejects.
+        """
+        if not self.allows(symbol, interval):
+            raise UnknownInstrumentError(f"Unknown instrument {symbol} {interval}")
+        entry = self.add(symbol, interval)
+        if not entry.is_warm:
+            self._submit(entry).result()
+        return entry
+
+    def _submit(self, entry):
+        """Schedule a refresh of one entry, sharing any fetch already running"""
+        key = (entry.symbol, entry.interval)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._refresh_entry, entry)
+            self._inflight[key] = future
+        # Registered outside the lock: a future that is already done runs the
+        # callback immediately, in this thread
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def _finish(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _is_follower(self):
+        return self.shared is not None and not self.shared.is_leader()
+
+    def _scheduler_cadence(self):
+        seconds = self.cadence()
+        if self._is_follower():
+            return min(seconds, SHARED_POLL_SECONDS)
+        return seconds
+
+    def _load_shared(self, entry):
+        """Install the leader's published snapshot; False if there is none"""
+        version = self.shared.version(entry.symbol, entry.interval)
+        if version is None:
+            return False
+        if version != entry.version:
+            snapshot = self.shared.load(entry.symbol, entry.interval)
+            body = snapshot["chart_data_body"]
+            chart_data = loads(body)
+            self._install(
+                entry,
+                snapshot["df"],
+                chart_data,
+                ChartPayload(body, snapshot["version"], chart_data),
+                snapshot["instrument"],
+                snapshot["version"],
+                snapshot["fetched_at"],
+            )
+        return True
+
+    def _install(self, entry, df, chart_data, payload, instrument, version, fetched_at):
+        # Swap the new data in with one assignment per field under the lock so
+        # readers never see a half-updated entry
+        with self._lock:
+            changed = version != entry.version
+            entry.df = df
+            entry.chart_data = chart_data
+            entry.payload = payload
+            entry.instrument = instrument
+            entry.version = version
+            entry.fetched_at = fetched_at
+            entry.error = None
+            if changed:
+                self._changed.notify_all()
+
+    def _refresh_entry(self, entry):
+        # Followers take the leader's snapshot, and only fetch an instrument
+        # themselves when nothing has been published for it yet
+        if self._is_follower() and self._load_shared(entry):
+            return entry
+
+        started = time.perf_counter()
+        try:
+            df, chart_data = self.fetch(entry.symbol, self.period, entry.interval)
+        except Exception as e:
+            df, chart_data = None, f"Error: {e}"
+
+        if df is None:
+            # Keep serving the last good data when a refresh fails
+            entry.error = chart_data
+            logging.warning(f"Watchlist refresh failed for {entry.symbol}: {entry.error}")
+            return entry
+
+        instrument = (
+            df["Instrument"].iloc[0]
+            if "Instrument" in df.columns and not df.empty
+            else entry.symbol
+        )
+        version = chart_data.get("panels", {}).get("version")
+        # Serialised once per version; every client gets these same bytes
+        body = dumps(chart_data)
+
+        if self.shared is not None:
+            self.shared.publish(
+                entry.symbol, entry.interval, version, instrument, body, df
+            )
+            # Keep the shared memory-mapped copy rather than a private one
+            df = self.shared.frame(entry.symbol, entry.interval)
+        self._install(
+            entry,
+            df,
+            chart_data,
+            ChartPayload(body, version, chart_data),
+            instrument,
+            version,
+            time.time(),
+        )
+
+        logging.info(
+            f"Watchlist refreshed {entry.symbol} ({len(df)} bars) in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+        return entry
+
+    def wait_for_change(self, entry, version, timeout=None):
+        """Block until entry moves past `version`; True if it did in time"""
+        with self._changed:
+            return self._changed.wait_for(lambda: entry.version != version, timeout)
+
+    def refresh(self, symbols=None):
+        """Refresh tracked instruments concurrently and wait for them all"""
+        wanted = None
+        if symbols is not None:
+            wanted = {self._key(symbol)[0] for symbol in symbols}
+        with self._lock:
+            entries = [
+                entry
+                for (symbol, _), entry in self._entries.items()
+                if wanted is None or symbol in wanted
+            ]
+        futures = [self._submit(entry) for entry in entries]
+        for future in futures:
+            future.result()
+        return entries
+
+    def discover(self):
+        """Add the instruments the data server currently advertises"""
+        for symbol in IBClient().get_tickers():
+            if symbol:
+                self.add(symbol)
+
+    def _scheduled_refresh(self):
+        """One scheduler run; fails (and backs off) when every fetch failed"""
+        if not self._is_follower():
+            if not self._discovered:
+                self.discover()
+                self._discovered = True
+            if self.shared is not None:
+                # Instruments other workers were asked for
+                for symbol, interval in self.shared.watched():
+                    self.add(symbol, interval)
+        entries = self.refresh()
+        return not entries or any(entry.error is None for entry in entries)
+
+    def request_refresh(self):
+        """Ask the scheduler for an early refresh without blocking"""
+        self.scheduler.request_refresh()
+
+    def start(self):
+        """Start the background refresh scheduler (idempotent)"""
+        self.scheduler.start()
+        return self
+
+    def stop(self):
+        """Stop the background refresh scheduler"""
+        self.scheduler.stop()
+
+
+_watchlist = None
+_watchlist_lock = threading.Lock()
+
+
+def get_watchlist():
+    """The process-wide watchlist"""
+    global _watchlist
+    with _watchlist_lock:
+        if _watchlist is None:
+            _watchlist = Watchlist(shared=SharedSnapshotCache())
+        return _watchlist
@@ -1,12 +1,25 @@
 import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
+from flask import Response
+from flask_compress import Compress
 from core.calculator_ui import create_calculator_panel
+from core.ui_components import create_panel_skeleton
+from core.watchlist import get_watchlist
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+# WSGI entry point for gunicorn (see app.py)
+server = app.server
+
+# Compress Dash's own responses; cached chart payloads are served
+# precompressed (core.payload) and carry their own Content-Encoding
+Compress(server)
 
 # Import callbacks to register them with the app - MUST be after app initialization
 from core.callbacks import register_clientside_callbacks, register_python_callbacks
+from core.metrics import METRICS_ROUTE, collect, render_metrics, start_flusher
+from core.payload import register_payload_routes
+from core.push import register_push_routes
 
 app.index_string = """
 <!DOCTYPE html>
@@ -130,6 +143,25 @@ app.layout = html.Div(
                         "cursor": "not-allowed",
                     },
                 ),
+                html.Label(
+                    "Watchlist:", style={"color": "white", "marginRight": "5px"}
+                ),
+                dcc.Dropdown(
+                    id="watchlist-dropdown",
+                    options=[
+                        {"label": symbol, "value": symbol}
+                        for symbol in get_watchlist().symbols()
+                    ],
+                    value=(get_watchlist().symbols() or ["QQQ"])[0],
+                    clearable=False,
+                    className="control-input",
+                    style={
+                        "width": "100px",
+                        "marginRight": "10px",
+                        "backgroundColor": "#ffffff",
+                        "color": "#404040",
+                    },
+                ),
                 html.Label(
                     "Interval:",
                     style={
@@ -163,11 +195,11 @@ app.layout = html.Div(
             [
                 html.Div(
                     [
-                        html.Div(id="data-box"),
-                        html.Div(id="panel-2"),
-                        html.Div(id="panel-3"),
-                        html.Div(id="panel-4"),
-                        html.Div(id="panel-5"),
+                        html.Div(panel, id=panel_id)
+                        for panel_id, panel in zip(
+                            ["data-box", "panel-2", "panel-3", "panel-4", "panel-5"],
+                            create_panel_skeleton(),
+                        )
                     ],
                     className="left-panel",
                     style={"overflowY": "auto"},
@@ -212,20 +244,37 @@ app.layout = html.Div(
             ],
             className="trading-container",
         ),
+        dcc.Store(id="chart-url"),
         dcc.Store(id="chart-data"),
-        dcc.Store(id="dataframe-store"),
         dcc.Store(id="clicked-bar-index"),
         dcc.Store(id="last-symbol-store"),
+        dcc.Store(id="chart-version-store"),
+        dcc.Store(id="push-reload"),
+        dcc.Store(id="push-status"),
     ]
 )
 
 register_clientside_callbacks(app)
 register_python_callbacks(app)
+register_push_routes(server)
+register_payload_routes(server)
+
+
+@server.route(METRICS_ROUTE)
+def metrics():
+    """Stage timing histograms, summed over all workers, for Prometheus"""
+    return Response(render_metrics(collect()), mimetype="text/plain; version=0.0.4")
+
 
 # Initialize database
 from core.db import init_database
 
 init_database()
 
+# Keep every watchlist instrument warm in the background
+get_watchlist().start()
+# Share this worker's stage timings with the others' /metrics
+start_flusher()
+
 if __name__ == "__main__":
     app.run(debug=False, host="0.0.0.0", port=5000)
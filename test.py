@@ -1,4 +1,3 @@
-import json
 from core.data_processing import fetch_and_process_data, format_volume
 
 
@@ -14,7 +13,7 @@ def test_data_processing():
     )
 
     # Test fetching data
-    df, chart_json = fetch_and_process_data()
+    df, chart_data = fetch_and_process_data()
 
     if df is not None:
         print("✓ Data fetching successful")
@@ -33,8 +32,7 @@ def test_data_processing():
         if "Panel_4_Volume" in df.columns:
             print(f"✓ Panel_4_Volume exists")
 
-    if chart_json:
-        chart_data = json.loads(chart_json)
+    if df is not None and chart_data:
         print("✓ Chart data generated")
 
         # Check what's in the chart data
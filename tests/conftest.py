@@ -0,0 +1,30 @@
+import pytest
+from core import db
+
+
+@pytest.fixture
+def journal_db(tmp_path, monkeypatch):
+    """An empty trade journal in a scratch directory"""
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "trades.db")
+    db.init_database()
+    return db.DB_PATH
+
+
+def save_result(ticker="QQQ", direction="long", **overrides):
+    """Insert one journal row with plausible values; returns its id"""
+    fields = {
+        "trade_date": "01/02/2025",
+        "ticker": ticker,
+        "direction": direction,
+        "scenario": "standard",
+        "target_price_value": 100.0,
+        "option_bid": 1.0,
+        "option_ask": 1.2,
+        "intrinsic_value": 0.5,
+        "extrinsic_value": 0.6,
+        "target_size": 2.0,
+        "tradable_flag": True,
+        "inputs_dict": {"current_price": 102.0},
+    }
+    fields.update(overrides)
+    return db.insert_trade_result(**fields)
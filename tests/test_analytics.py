@@ -0,0 +1,101 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import save_result
+from core import analytics, db
+
+
+@pytest.fixture
+def journal(journal_db):
+    analytics.clear_cache()
+    rng = np.random.default_rng(1)
+    for i in range(60):
+        trade_id = save_result(
+            ticker=("QQQ", "SPY", "IWM")[i % 3],
+            direction=("long", "short")[i % 2],
+            trade_date=f"01/{1 + i % 5:02d}/2025",
+            tradable_flag=bool(rng.integers(0, 2)),
+            extrinsic_value=float(rng.uniform(0, 5)),
+            target_size=float(rng.uniform(1, 10)),
+        )
+        if i % 7 == 0:
+            # Rows saved before target_size was recorded
+            with db.get_connection() as conn:
+                conn.execute(
+                    "UPDATE trade_calculator_results SET target_size = NULL"
+                    " WHERE id = ?",
+                    (trade_id,),
+                )
+                conn.commit()
+    return db.fetch_results_frame()
+
+
+def nearest_rank(values, p):
+    values = np.sort(values.dropna().to_numpy())
+    if not len(values):
+        return None
+    return values[int(np.ceil(p * len(values))) - 1]
+
+
+def test_summary_by_ticker_matches_pandas(journal):
+    summary = {row["ticker"]: row for row in analytics.summary_by_ticker()}
+    assert set(summary) == set(journal["ticker"])
+
+    for ticker, group in journal.groupby("ticker"):
+        row = summary[ticker]
+        assert row["count"] == len(group)
+        assert row["tradable_count"] == group["tradable_flag"].sum()
+        assert row["tradable_ratio"] == pytest.approx(group["tradable_flag"].mean())
+        assert row["avg_extrinsic_value"] == pytest.approx(
+            group["extrinsic_value"].mean()
+        )
+        sizes = group["target_size"]
+        assert row["target_size_min"] == pytest.approx(sizes.min())
+        assert row["target_size_max"] == pytest.approx(sizes.max())
+        assert row["target_size_avg"] == pytest.approx(sizes.mean())
+        for name, p in analytics.PERCENTILES.items():
+            assert row[f"target_size_{name}"] == pytest.approx(nearest_rank(sizes, p))
+
+
+def test_summary_by_ticker_and_direction_counts(journal):
+    rows = analytics.summarize(("ticker", "direction"))
+    expected = journal.groupby(["ticker", "direction"]).size()
+    assert {(r["ticker"], r["direction"]): r["count"] for r in rows} == expected.to_dict()
+
+
+def test_daily_trend_running_totals(journal):
+    trend = analytics.daily_trend(window=2)
+    daily = journal.assign(
+        day=pd.to_datetime(journal["trade_date"], format="%m/%d/%Y").dt.strftime(
+            "%Y-%m-%d"
+        )
+    ).groupby("day")
+    counts = daily.size()
+    tradable = daily["tradable_flag"].sum()
+
+    assert [row["day"] for row in trend] == list(counts.index)
+    assert [row["cumulative_count"] for row in trend] == counts.cumsum().tolist()
+    rolling = tradable.rolling(2, min_periods=1).sum() / counts.rolling(
+        2, min_periods=1
+    ).sum()
+    assert [row["rolling_tradable_ratio"] for row in trend] == pytest.approx(
+        rolling.tolist()
+    )
+
+
+def test_cache_sees_writes_from_other_connections(journal):
+    before = analytics.summary_by_ticker()
+
+    # Another worker or the journal_io CLI writes with its own connection
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.execute(
+        "INSERT INTO trade_calculator_results (trade_date, ticker, direction, scenario)"
+        " VALUES ('01/06/2025', 'DIA', 'long', 'standard')"
+    )
+    conn.commit()
+    conn.close()
+
+    after = analytics.summary_by_ticker()
+    assert len(after) == len(before) + 1
+    assert any(row["ticker"] == "DIA" for row in after)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.backtest import evaluate_history, run_backtest, synthetic_quotes
+from core.calculators import calculate_trade_analysis
+
+
+def history(bars=60, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 400 + np.cumsum(rng.normal(0, 3, bars))
+    open_price = close + rng.normal(0, 1.5, bars)
+    return pd.DataFrame(
+        {
+            "Open": open_price,
+            "High": np.maximum(open_price, close) + rng.uniform(0, 4, bars),
+            "Low": np.minimum(open_price, close) - rng.uniform(0, 4, bars),
+            "Close": close,
+            "ATR": rng.uniform(2, 6, bars),
+        },
+        index=pd.date_range("2024-01-02", periods=bars, freq="D"),
+    )
+
+
+def test_evaluated_rows_match_the_scalar_calculator():
+    bars = history()
+    quotes = synthetic_quotes(bars, noise=0.3, seed=1)
+    evaluated = evaluate_history(bars, quotes, intrinsic_adjustment=0.8)
+    assert len(evaluated) == len(quotes)
+
+    for row, quote in zip(evaluated.itertuples(), quotes.itertuples()):
+        bar = bars.loc[row.time]
+        expected = calculate_trade_analysis(
+            {
+                "open_price": bar["Open"],
+                "current_price": bar["Open"],
+                "strike_price": quote.strike,
+                "atr_value": bar["ATR"],
+                "bid_price": quote.bid,
+                "ask_price": quote.ask,
+                "trade_direction": "short" if quote.option_type == "put" else "long",
+                "intrinsic_adjustment": 0.8,
+            }
+        )
+        assert row.time == quote.time
+        assert row.strike == quote.strike
+        assert row.target_price == expected["target_price"]
+        assert row.target_size == expected["target_size"]
+        assert row.is_tradable == expected["is_tradable"]
+        if row.direction == "short":
+            assert row.target_hit == (bar["Low"] <= row.target_price)
+        else:
+            assert row.target_hit == (bar["High"] >= row.target_price)
+
+
+def test_quotes_without_a_bar_are_skipped():
+    bars = history(bars=10)
+    quotes = synthetic_quotes(bars)
+    stray = quotes.iloc[:3].assign(time=pd.Timestamp("2030-01-01"))
+    evaluated = evaluate_history(bars, pd.concat([quotes, stray]))
+    assert len(evaluated) == len(quotes)
+
+
+# Other tests leave daemon threads running; the shards touch none of them
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+@pytest.mark.parametrize("workers", [2, 3])
+def test_sharded_backtest_equals_the_serial_run(workers):
+    bars = history(bars=200)
+    serial = run_backtest(bars, workers=1, noise=0.2, seed=3)
+    sharded = run_backtest(bars, workers=workers, noise=0.2, seed=3)
+
+    assert sharded["overall"] == serial["overall"]
+    for key in ("evaluated", "by_direction", "by_moneyness"):
+        pd.testing.assert_frame_equal(sharded[key], serial[key])
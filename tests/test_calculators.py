@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.calculators import (
+    BATCH_OUTPUT_FIELDS,
+    _memoized_trade_analysis,
+    calculate_trade_analysis,
+    calculate_trade_analysis_batch,
+    calculate_trade_analysis_cached,
+    clear_calculation_cache,
+    round_like_python,
+)
+
+# Values whose fourth-decimal rounding is a .5 tie in decimal
+TIES = [k / 10_000 + 0.00005 for k in range(0, 5_000, 37)] + [2.675, 1.00005, 0.00015]
+
+
+@pytest.mark.parametrize("value", TIES)
+def test_round_like_python_on_scalars(value):
+    rounded = round_like_python(value)
+    assert rounded.shape == ()
+    assert float(rounded) == round(value, 4)
+
+
+def test_round_like_python_on_arrays():
+    values = np.array(TIES).reshape(-1, 1)
+    rounded = round_like_python(values)
+    assert rounded.shape == values.shape
+    assert rounded.ravel().tolist() == [round(v, 4) for v in TIES]
+
+
+def scenarios(count=400, seed=3):
+    rng = np.random.default_rng(seed)
+    # Quarter-cent prices make target sizes land on .5 ties at 4 decimals
+    ticks = lambda low, high: rng.integers(low * 400, high * 400, count) / 400
+    frame = pd.DataFrame(
+        {
+            "open_price": ticks(50, 500) + 0.00005,
+            "current_price": ticks(50, 500),
+            "strike_price": ticks(50, 500),
+            "atr_value": ticks(1, 10) + 0.00005,
+            "bid_price": ticks(0, 20),
+            "ask_price": ticks(0, 20) + 0.0001,
+            "trade_direction": rng.choice(["long", "short"], count),
+            "intrinsic_adjustment": rng.choice([1.0, 0.5, 1.25], count),
+            "custom_intrinsic_value": np.where(
+                rng.random(count) < 0.2, ticks(0, 5) + 0.00005, np.nan
+            ),
+        }
+    )
+    return frame
+
+
+def test_batch_matches_scalar_calculator():
+    frame = scenarios()
+    batch = calculate_trade_analysis_batch(frame)
+
+    for i, row in enumerate(frame.to_dict("records")):
+        if np.isnan(row["custom_intrinsic_value"]):
+            del row["custom_intrinsic_value"]
+        scalar = calculate_trade_analysis(row)
+        for field in BATCH_OUTPUT_FIELDS:
+            assert batch[field].iloc[i] == scalar[field], (i, field)
+
+
+def test_batch_of_one_scalar_input():
+    row = {
+        "open_price": 100.00005,
+        "current_price": 101.0,
+        "strike_price": 100.0,
+        "atr_value": 2.0,
+        "bid_price": 1.5,
+        "ask_price": 1.6,
+    }
+    batch = calculate_trade_analysis_batch(row)
+    scalar = calculate_trade_analysis(dict(row))
+    for field in BATCH_OUTPUT_FIELDS:
+        assert float(batch[field]) == scalar[field]
+
+
+def test_cached_analysis_matches_and_hits_the_cache():
+    clear_calculation_cache()
+    inputs = scenarios(count=20).to_dict("records")
+    for data in inputs:
+        if np.isnan(data["custom_intrinsic_value"]):
+            del data["custom_intrinsic_value"]
+    for data in inputs:
+        cached_data = dict(data)
+        assert calculate_trade_analysis_cached(cached_data) == (
+            calculate_trade_analysis(dict(data))
+        )
+        assert "intrinsic_calculation_method" in cached_data
+    misses = _memoized_trade_analysis.cache_info().misses
+    assert misses == len(inputs)
+
+    for data in inputs:
+        result = calculate_trade_analysis_cached(dict(data))
+        # Callers get copies, so this must not reach the memo
+        result["target_price"] = None
+    info = _memoized_trade_analysis.cache_info()
+    assert info.misses == misses
+    assert info.hits == len(inputs)
+    assert calculate_trade_analysis_cached(dict(inputs[0]))["target_price"] is not None
+
+
+def test_cache_key_treats_ints_and_floats_alike():
+    clear_calculation_cache()
+    data = {
+        "open_price": 100,
+        "current_price": 102,
+        "strike_price": 100,
+        "atr_value": 2,
+        "bid_price": 3,
+        "ask_price": 3.5,
+        "trade_direction": "long",
+    }
+    calculate_trade_analysis_cached(dict(data))
+    calculate_trade_analysis_cached({**data, "open_price": 100.0})
+    assert _memoized_trade_analysis.cache_info().hits == 1
@@ -0,0 +1,130 @@
+import base64
+import json
+import shutil
+import subprocess
+import numpy as np
+import pytest
+from core.columnar import encode_chart_data, encode_strings
+
+
+def decode_strings(column):
+    """Python mirror of the browser's strings() decoder"""
+    if column["type"] == "list":
+        return column["data"]
+    if column["type"] == "dict":
+        codes = np.frombuffer(base64.b64decode(column["codes"]), column["dtype"])
+        return [column["values"][code] for code in codes]
+    dtype = column.get("dtype", "f8")
+    digits = np.frombuffer(base64.b64decode(column["data"]), dtype).astype(np.int64)
+    if column["type"] == "grouped":
+        return [f"{value:,}" for value in digits]
+    scale = column["scale"]
+    decoded = []
+    for value in digits:
+        text = str(abs(value)).rjust(scale + 1, "0")
+        sign = "-" if value < 0 else ""
+        decoded.append(sign + (f"{text[:-scale]}.{text[-scale:]}" if scale else text))
+    return decoded
+
+
+@pytest.mark.parametrize(
+    "values, kind",
+    [
+        (["400.38", "-1.24", "0.05", "-0.50"], "decimal"),
+        (["12", "-7", "0"], "decimal"),
+        (["33,231,874", "999", "1,000", "-4,500"], "grouped"),
+        (["Bull", "Bear"] * 8, "dict"),
+        (["-0.00", "1.00"], "list"),
+        (["1.5", "1.25"], "list"),
+        (["a", "b", "c"], "list"),
+        ([], "list"),
+    ],
+)
+def test_encode_strings_round_trip(values, kind):
+    column = encode_strings(values)
+    assert column["type"] == kind
+    assert decode_strings(column) == values
+
+
+def chart_data():
+    times = [1735776000 + 86400 * i for i in range(6)]
+    candles = [
+        {
+            "time": t,
+            "open": 100.01 + i,
+            "high": 101.5 + i,
+            "low": 99.25 + i,
+            "close": 100.75 + i,
+            "volume_formatted": f"{1_234_567 * (i + 1):,}",
+        }
+        for i, t in enumerate(times)
+    ]
+    return {
+        "candlestick": candles,
+        # Skips the first bars, so it carries positions into the time axis
+        "sma20": [{"time": t, "value": 100.123 + i} for i, t in enumerate(times[2:])],
+        "volume": [
+            {
+                "time": t,
+                "value": 1_234_567 * (i + 1),
+                "color": "#26a69a" if i % 2 else "#ef5350",
+            }
+            for i, t in enumerate(times)
+        ],
+        "momentum": [
+            {"time": t, "value": -1.5 + i, "formatted": f"{-1.5 + i:.3f}"}
+            for i, t in enumerate(times)
+        ],
+        "resolution": {"bars": 6, "points": 6},
+        "panels": {
+            "version": "v1",
+            "instrument": "QQQ (Daily)",
+            "columns": ["date", "close", "volume", "trend"],
+            "rows": [
+                [
+                    f"01/0{i + 2}/2025",
+                    f"{100.75 + i:.2f}",
+                    f"{1_234_567 * (i + 1):,}",
+                    "Up",
+                ]
+                for i in range(6)
+            ],
+        },
+    }
+
+
+HARNESS = """
+const fs = require("fs");
+global.window = { dash_clientside: { no_update: "NO_UPDATE" } };
+global.document = { getElementById: () => null };
+const payload = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+global.fetch = async () => ({ ok: true, json: async () => payload });
+eval(fs.readFileSync(process.argv[3], "utf8"));
+const funcs = window.dash_clientside._dashprivate_clientside_funcs;
+const load = Object.values(funcs).find((f) => f.name === "loadChartData");
+load("/chart-data?symbol=QQQ").then((data) => console.log(JSON.stringify(data)));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_browser_decoder_rebuilds_the_payload(tmp_path):
+    dash = pytest.importorskip("dash")
+    from core.callbacks import register_clientside_callbacks
+
+    app = dash.Dash(__name__)
+    register_clientside_callbacks(app)
+    (tmp_path / "callbacks.js").write_text("\n".join(app._inline_scripts))
+    (tmp_path / "harness.js").write_text(HARNESS)
+    original = chart_data()
+    (tmp_path / "payload.json").write_text(json.dumps(encode_chart_data(original)))
+
+    result = subprocess.run(
+        ["node", "harness.js", "payload.json", "callbacks.js"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    decoded = json.loads(result.stdout)
+    assert decoded.pop("url") == "/chart-data?symbol=QQQ"
+    assert decoded == original
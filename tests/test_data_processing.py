@@ -0,0 +1,30 @@
+import pandas as pd
+from core.data_processing import build_panel_table, panel_table_to_store
+
+
+def frame(bars=3):
+    index = pd.date_range("2025-01-02", periods=bars, freq="D")
+    return pd.DataFrame(
+        {
+            "Open": [100.0 + i for i in range(bars)],
+            "Close": [101.0 + i for i in range(bars)],
+            "Volume": [1_500_000 * (i + 1) for i in range(bars)],
+            "Instrument": "QQQ",
+        },
+        index=index,
+    )
+
+
+def test_panel_store_sends_the_instrument_once():
+    store = panel_table_to_store(build_panel_table(frame()), version="v1")
+    assert store["instrument"] == "QQQ"
+    assert "instrument" not in store["columns"]
+    assert len(store["rows"]) == 3
+    assert all(len(row) == len(store["columns"]) for row in store["rows"])
+    assert "QQQ" not in {value for row in store["rows"] for value in row}
+
+
+def test_panel_store_falls_back_to_the_symbol():
+    df = frame().drop(columns="Instrument")
+    store = panel_table_to_store(build_panel_table(df, symbol="SPY"))
+    assert store["instrument"] == "SPY"
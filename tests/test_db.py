@@ -0,0 +1,83 @@
+import threading
+from conftest import save_result
+from core import db
+
+
+def test_recent_results_follow_created_at(journal_db):
+    first = save_result(description="older")
+    second = save_result(description="newer")
+    # An imported row keeps its original timestamp but gets a higher id
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE trade_calculator_results SET created_at = ? WHERE id = ?",
+            ("2020-01-01 00:00:00", second),
+        )
+        conn.execute(
+            "UPDATE trade_calculator_results SET created_at = ? WHERE id = ?",
+            ("2024-01-01 00:00:00", first),
+        )
+        conn.commit()
+
+    recent = db.fetch_recent_results(limit=1, columns=["id"])
+    assert [row["id"] for row in recent] == [first]
+
+
+def test_recent_results_without_limit(journal_db):
+    ids = [save_result() for _ in range(3)]
+    recent = db.fetch_recent_results(limit=None, columns=["id"])
+    assert sorted(row["id"] for row in recent) == ids
+
+
+def journal_ids():
+    return [row["id"] for row in db.fetch_recent_results(columns=["id"])]
+
+
+def test_identical_save_within_the_window_returns_the_first_id(journal_db):
+    window = db.DEFAULT_DEDUPE_WINDOW_SECONDS
+    first = save_result(dedupe_window=window)
+    assert save_result(dedupe_window=window) == first
+    other = save_result(dedupe_window=window, inputs_dict={"current_price": 103.0})
+    assert other != first
+    # Without a window every save is a new row
+    assert save_result() not in (first, other)
+    assert len(journal_ids()) == 3
+
+
+def test_concurrent_identical_saves_insert_once(journal_db):
+    start = threading.Barrier(8)
+    ids = []
+
+    def save():
+        start.wait()
+        ids.append(save_result(dedupe_window=db.DEFAULT_DEDUPE_WINDOW_SECONDS))
+
+    threads = [threading.Thread(target=save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 1
+    assert journal_ids() == ids[:1]
+
+
+def test_journal_version_changes_on_every_write(journal_db, tmp_path, monkeypatch):
+    versions = [db.get_journal_version()]
+    trade_id = save_result()
+    versions.append(db.get_journal_version())
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE trade_calculator_results SET notes = 'checked' WHERE id = ?",
+            (trade_id,),
+        )
+        conn.commit()
+    versions.append(db.get_journal_version())
+    db.delete_trade_result(trade_id)
+    versions.append(db.get_journal_version())
+    assert len(set(versions)) == len(versions)
+
+    # Re-running the schema setup keeps the counter
+    db.init_database()
+    assert db.get_journal_version() == versions[-1]
+
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "missing.db")
+    assert db.get_journal_version() is None
@@ -0,0 +1,162 @@
+import math
+import numpy as np
+import pytest
+from core.downsample import (
+    _bucket_ends,
+    downsample_chart_data,
+    lttb,
+    target_points,
+)
+
+DAY = 86400
+
+
+def chart_data(bars=1000):
+    times = [1_600_000_000 + DAY * i for i in range(bars)]
+    volumes = [1_000 + 7 * i for i in range(bars)]
+    return {
+        "candlestick": [
+            {
+                "time": t,
+                "open": 100.0 + i % 7,
+                "high": 110.0 + i % 11,
+                "low": 90.0 - i % 5,
+                "close": 101.0 + i % 3,
+                "volume_formatted": f"{volumes[i]:,}",
+            }
+            for i, t in enumerate(times)
+        ],
+        "sma20": [{"time": t, "value": math.sin(i / 20)} for i, t in enumerate(times)],
+        "momentum": [
+            {"time": t, "value": (-1) ** i * (i % 13), "color": "#00ff88"}
+            for i, t in enumerate(times)
+        ],
+        "volume": [
+            {"time": t, "value": v, "color": "#00ff88", "formatted": "1K"}
+            for t, v in zip(times, volumes)
+        ],
+        "panels": {
+            "version": "v1",
+            "columns": ["date"],
+            "rows": [[str(t)] for t in times],
+        },
+    }
+
+
+def volume(bar):
+    return int(bar["volume_formatted"].replace(",", ""))
+
+
+def test_target_points():
+    assert target_points(None) is None
+    assert target_points(0) is None
+    assert target_points(100) == 256
+    assert target_points(1000) == 1024
+    assert target_points(100_000) == 4096
+
+
+@pytest.mark.parametrize("count, buckets", [(1000, 256), (10, 3), (257, 256)])
+def test_buckets_cover_every_bar_and_keep_the_last_alone(count, buckets):
+    ends = _bucket_ends(count, buckets)
+    assert len(ends) == buckets
+    assert ends[-1] == count
+    assert ends[-2] == count - 1
+    assert all(b > a for a, b in zip(ends, ends[1:]))
+
+
+def test_full_resolution_when_it_fits():
+    data = chart_data(100)
+    result = downsample_chart_data(data, points=256)
+    assert result["candlestick"] == data["candlestick"]
+    assert result["resolution"] == {
+        "bars": 100,
+        "points": 100,
+        "start": data["candlestick"][0]["time"],
+        "end": data["candlestick"][-1]["time"],
+    }
+
+
+def test_aggregated_candles():
+    data = chart_data()
+    result = downsample_chart_data(data, points=256)
+    candles = result["candlestick"]
+    assert len(candles) == result["resolution"]["points"] == 256
+    assert candles[-1] == data["candlestick"][-1]
+    assert sum(volume(bar) for bar in candles) == sum(
+        volume(bar) for bar in data["candlestick"]
+    )
+    times = [bar["time"] for bar in candles]
+    for key in ("sma20", "momentum", "volume"):
+        assert [point["time"] for point in result[key]] == times
+    assert len(result["panels"]["rows"]) == 256
+    assert result["panels"]["rows"][-1] == data["panels"]["rows"][-1]
+
+
+def test_volume_bars_match_the_candle_volume():
+    result = downsample_chart_data(chart_data(), points=256)
+    for bar, point in zip(result["candlestick"], result["volume"]):
+        assert point["value"] == volume(bar)
+        up = bar["close"] > bar["open"]
+        assert point["color"] == ("#00ff88" if up else "#ff4444")
+
+
+def test_oscillators_keep_the_largest_bar():
+    data = chart_data()
+    result = downsample_chart_data(data, points=256)
+    largest = max(abs(point["value"]) for point in data["momentum"])
+    assert max(abs(point["value"]) for point in result["momentum"]) == largest
+
+
+def test_lttb_keeps_peaks():
+    points = [{"time": i, "value": 0.0} for i in range(100)]
+    points[41]["value"] = 50.0
+    points[77]["value"] = -30.0
+    buckets = np.arange(100) // 10
+    selected = lttb(points, buckets, list(range(10)))
+    values = [point["value"] for point in selected]
+    assert len(selected) == 10
+    assert 50.0 in values and -30.0 in values
+    assert [point["time"] for point in selected] == list(range(10))
+
+
+def test_window_slicing():
+    data = chart_data()
+    times = [bar["time"] for bar in data["candlestick"]]
+    result = downsample_chart_data(data, points=256, start=times[100], end=times[199])
+    assert result["candlestick"] == data["candlestick"][100:200]
+    assert result["sma20"] == data["sma20"][100:200]
+    assert result["panels"]["rows"] == data["panels"]["rows"][100:200]
+    assert result["resolution"]["bars"] == result["resolution"]["points"] == 100
+
+
+def splice(current, detail, key="candlestick"):
+    """The browser's refine splice (renderChart)"""
+    fetched = detail["resolution"]
+    return [
+        *[point for point in current[key] if point["time"] < fetched["start"]],
+        *detail[key],
+        *[point for point in current[key] if point["time"] > fetched["end"]],
+    ]
+
+
+@pytest.mark.parametrize("offset", [0, 1, 2])
+def test_refine_widened_to_whole_points_leaves_no_gap(offset):
+    data = chart_data()
+    overview = downsample_chart_data(data, points=256)
+    shown = overview["candlestick"]
+    # A zoom window starting part-way into a point, as refine() widens it
+    visible_from = shown[40]["time"] - offset * DAY
+    visible_to = shown[60]["time"] - DAY
+    first = next(i for i, bar in enumerate(shown) if bar["time"] >= visible_from)
+    last = next(i for i, bar in enumerate(shown) if bar["time"] >= visible_to)
+    detail = downsample_chart_data(
+        data, points=256, start=shown[first - 1]["time"] + 1, end=shown[last]["time"]
+    )
+    assert detail["resolution"]["points"] == detail["resolution"]["bars"]
+
+    candles = splice(overview, detail)
+    times = [bar["time"] for bar in candles]
+    assert times == sorted(set(times))
+    assert sum(volume(bar) for bar in candles) == sum(
+        volume(bar) for bar in data["candlestick"]
+    )
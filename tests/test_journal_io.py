@@ -0,0 +1,133 @@
+import csv
+import pandas as pd
+import pytest
+from conftest import save_result
+from core import db, journal_io
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def journal(journal_db):
+    for i in range(25):
+        save_result(
+            ticker=("QQQ", "SPY")[i % 2],
+            description="" if i % 5 == 0 else f"trade {i}",
+        )
+    return db.fetch_results_frame()
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def interrupt_after(chunks):
+    def progress(rows):
+        if rows >= chunks * 10:
+            raise Interrupted
+
+    return progress
+
+
+def test_resumed_export_matches_full_export(journal, tmp_path):
+    full = tmp_path / "full.csv"
+    journal_io.export_journal(full, chunk_size=10)
+
+    resumed = tmp_path / "resumed.csv"
+    with pytest.raises(Interrupted):
+        journal_io.export_journal(resumed, chunk_size=10, progress=interrupt_after(1))
+    assert len(read_csv(resumed)) == 11
+    journal_io.export_journal(resumed, chunk_size=10, resume=True)
+
+    assert read_csv(resumed) == read_csv(full)
+
+
+def test_resume_refuses_other_columns_or_filters(journal, tmp_path):
+    path = tmp_path / "journal.csv"
+    with pytest.raises(Interrupted):
+        journal_io.export_journal(
+            path, columns=["ticker"], chunk_size=10, progress=interrupt_after(1)
+        )
+
+    with pytest.raises(ValueError):
+        journal_io.export_journal(path, columns=["ticker", "direction"], resume=True)
+    with pytest.raises(ValueError):
+        journal_io.export_journal(path, columns=["ticker"], resume=True, ticker="QQQ")
+
+    journal_io.export_journal(path, columns=["ticker"], resume=True)
+    rows = read_csv(path)
+    assert rows[0] == ["id", "ticker"]
+    assert len(rows) == len(journal) + 1
+
+
+@pytest.mark.parametrize("suffix", ["csv", "parquet"])
+def test_round_trip(journal, tmp_path, monkeypatch, suffix):
+    if suffix == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"journal.{suffix}"
+    journal_io.export_journal(path, chunk_size=7)
+
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "copy.db")
+    journal_io.import_journal(path, batch_size=6, keep_ids=True)
+    copy = db.fetch_results_frame()
+
+    expected = journal
+    if suffix == "csv":
+        # CSV has no NULL for text, so unset text columns come back empty
+        text = [col for col in db.RESULT_COLUMNS if col not in db.RESULT_DTYPES]
+        expected = journal.fillna({col: "" for col in text})
+    pd.testing.assert_frame_equal(copy, expected, check_dtype=False)
+    # Empty text survives; it is not turned into NULL
+    assert (copy["description"] == "").sum() == 5
+
+
+def test_resumed_import_skips_committed_rows(journal, tmp_path, monkeypatch):
+    path = tmp_path / "journal.csv"
+    journal_io.export_journal(path)
+
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "copy.db")
+    with pytest.raises(Interrupted):
+        journal_io.import_journal(
+            path, batch_size=5, commit_every=1, progress=interrupt_after(1)
+        )
+    journal_io.import_journal(path, batch_size=5, commit_every=1, resume=True)
+
+    copy = db.fetch_results_frame()
+    assert len(copy) == len(journal)
+    assert copy["description"].tolist() == journal["description"].tolist()
+
+
+def test_keep_ids_skips_existing_and_reports_rejected(journal, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    columns = ["id", "ticker", "trade_date", "direction", "scenario"]
+    path = tmp_path / "journal.parquet"
+    journal_io.export_journal(path, columns=columns)
+    table = pq.read_table(path)
+    extra = pa.table(
+        {
+            "id": [1000, 1001],
+            "ticker": [None, "DIA"],
+            "trade_date": ["01/02/2025"] * 2,
+            "direction": ["long"] * 2,
+            "scenario": ["standard"] * 2,
+        },
+        schema=table.schema,
+    )
+    pq.write_table(pa.concat_tables([table, extra]), path)
+
+    rejected = []
+    journal_io.import_journal(
+        path,
+        keep_ids=True,
+        on_reject=lambda number, values, error: rejected.append(number),
+    )
+
+    # Existing ids are skipped silently; the row without a ticker is reported
+    assert rejected == [len(journal) + 1]
+    tickers = db.fetch_results_frame(["id", "ticker"]).set_index("id")["ticker"]
+    assert len(tickers) == len(journal) + 1
+    assert tickers[1001] == "DIA"
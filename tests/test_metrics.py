@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from pathlib import Path
+from core.metrics import Histogram, STAGE_BUCKETS, render_metrics
+
+
+def test_db_and_journal_io_do_not_need_flask():
+    code = (
+        "import sys\n"
+        "import core.db, core.journal_io, core.metrics\n"
+        "assert 'flask' not in sys.modules, 'flask imported'\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_histogram_and_exposition():
+    histogram = Histogram()
+    histogram.observe("db_insert", 0.002)
+    histogram.observe("db_insert", 0.2)
+    histogram.observe("db_insert", 100)
+    snapshot = histogram.snapshot()
+    assert snapshot["db_insert"]["count"] == 3
+    assert sum(snapshot["db_insert"]["buckets"]) == 2
+    assert len(snapshot["db_insert"]["buckets"]) == len(STAGE_BUCKETS)
+
+    text = render_metrics(snapshot)
+    assert 'ticon_stage_seconds_bucket{stage="db_insert",le="0.0025"} 1' in text
+    assert 'ticon_stage_seconds_bucket{stage="db_insert",le="+Inf"} 3' in text
+    assert 'ticon_stage_seconds_count{stage="db_insert"} 3' in text
+
+
+def test_observe_stays_in_memory():
+    code = (
+        "import threading\n"
+        "from core import metrics\n"
+        "with metrics.timed('db_insert'):\n"
+        "    pass\n"
+        "assert metrics.stage_seconds.snapshot()['db_insert']['count'] == 1\n"
+        "names = [thread.name for thread in threading.enumerate()]\n"
+        "assert 'metrics-flush' not in names, names\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
@@ -0,0 +1,114 @@
+import gzip
+import brotli
+import pytest
+from flask import Flask
+from core import watchlist as watchlist_module
+from core.payload import ChartPayload, dumps, loads, register_payload_routes
+from core.watchlist import Watchlist
+
+DAY = 86400
+
+
+def chart_data(bars=3000):
+    times = [1_600_000_000 + DAY * i for i in range(bars)]
+    return {
+        "candlestick": [
+            {
+                "time": t,
+                "open": 100.0 + i % 7,
+                "high": 110.0 + i % 11,
+                "low": 90.0 - i % 5,
+                "close": 101.0 + i % 3,
+                "volume_formatted": f"{1_000 + i:,}",
+            }
+            for i, t in enumerate(times)
+        ],
+        "volume": [
+            {"time": t, "value": 1_000 + i, "color": "#00ff88", "formatted": "1K"}
+            for i, t in enumerate(times)
+        ],
+        "panels": {
+            "version": "v1",
+            "columns": ["date"],
+            "rows": [[str(t)] for t in times],
+        },
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    watchlist = Watchlist(symbols=["QQQ"])
+    monkeypatch.setattr(watchlist_module, "get_watchlist", lambda: watchlist)
+    server = Flask(__name__)
+    register_payload_routes(server)
+    client = server.test_client()
+    data = chart_data()
+    entry = watchlist.add("QQQ")
+    entry.version = "v1"
+    entry.chart_data = data
+    entry.payload = ChartPayload(dumps(data), "v1", data)
+    client.payload = entry.payload
+    return client
+
+
+def test_unchanged_payload_costs_a_304(client):
+    first = client.get("/chart-data?symbol=QQQ")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Vary"] == "Accept-Encoding"
+
+    again = client.get("/chart-data?symbol=QQQ", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+    stale = client.get("/chart-data?symbol=QQQ", headers={"If-None-Match": '"old"'})
+    assert stale.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "accept, encoding, decode",
+    [
+        ("gzip, deflate, br", "br", brotli.decompress),
+        ("gzip", "gzip", gzip.decompress),
+        ("", None, lambda body: body),
+    ],
+)
+def test_content_encoding_follows_accept_encoding(client, accept, encoding, decode):
+    response = client.get(
+        "/chart-data?symbol=QQQ&format=columnar",
+        headers={"Accept-Encoding": accept},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == encoding
+    assert decode(response.data) == client.payload.render("columnar")
+
+
+def test_whole_range_views_are_cached_per_point_budget(client):
+    narrow = client.get("/chart-data?symbol=QQQ&width=900")
+    wide = client.get("/chart-data?symbol=QQQ&width=1000")
+    # Both widths round up to the same 1024-point budget
+    assert narrow.headers["ETag"] == wide.headers["ETag"]
+    assert narrow.data == wide.data
+    assert len(loads(narrow.data)["candlestick"]) == 1024
+    assert ("json", "identity", 1024) in client.payload._encoded
+
+    wider = client.get("/chart-data?symbol=QQQ&width=2000")
+    assert wider.headers["ETag"] != narrow.headers["ETag"]
+    assert len(loads(wider.data)["candlestick"]) == 2048
+    assert ("json", "identity", 2048) in client.payload._encoded
+
+
+def test_windows_are_not_cached(client):
+    start = 1_600_000_000 + DAY * 100
+    end = 1_600_000_000 + DAY * 199
+    response = client.get(f"/chart-data?symbol=QQQ&width=1000&start={start}&end={end}")
+    candles = loads(response.data)["candlestick"]
+    assert [candles[0]["time"], candles[-1]["time"]] == [start, end]
+    assert len(candles) == 100
+    assert set(client.payload._encoded) == {("json", "identity", None)}
+
+
+def test_unknown_instrument_and_format_are_rejected(client):
+    assert client.get("/chart-data?symbol=NOPE").status_code == 404
+    assert client.get("/chart-data?symbol=QQQ&format=xml").status_code == 400
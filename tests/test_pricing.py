@@ -0,0 +1,63 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from core import pricing
+from core.screener import screen_chain
+
+
+def test_erfc_fallback_matches_math_erfc():
+    x = np.linspace(-6, 6, 2001)
+    expected = np.array([math.erfc(v) for v in x])
+    assert np.allclose(pricing.erfc(x), expected, rtol=2e-7, atol=1e-12)
+
+
+def test_norm_cdf_without_scipy(monkeypatch):
+    x = np.linspace(-5, 5, 101)
+    expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    monkeypatch.setattr(pricing, "_ndtr", None)
+    assert np.allclose(pricing.norm_cdf(x), expected, atol=1e-8)
+
+
+def test_put_call_parity():
+    spot, strike, time, rate = 100.0, np.array([90.0, 100.0, 110.0]), 0.5, 0.03
+    call = pricing.bs_price(spot, strike, time, rate, 0.25, "call")
+    put = pricing.bs_price(spot, strike, time, rate, 0.25, "put")
+    assert np.allclose(call - put, spot - strike * np.exp(-rate * time))
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_implied_volatility_recovers_input(option_type):
+    strike = np.linspace(80, 120, 9)
+    vol = np.linspace(0.1, 0.6, 9)
+    price = pricing.bs_price(100.0, strike, 0.25, 0.01, vol, option_type)
+    solved = pricing.implied_volatility(price, 100.0, strike, 0.25, 0.01, option_type)
+    assert np.allclose(solved, vol, atol=1e-6)
+
+
+def test_price_option_at_given_and_implied_vol():
+    price = float(pricing.bs_price(100.0, 105.0, 30 / 365, 0.0, 0.3, "call"))
+    implied = pricing.price_option(price, 100.0, 105.0, 30 / 365)
+    assert implied["implied_vol"] == pytest.approx(0.3, abs=1e-6)
+    assert implied["theoretical_value"] == pytest.approx(price)
+
+    given = pricing.price_option(price, 100.0, 105.0, 30 / 365, vol=0.4)
+    assert given["implied_vol"] == pytest.approx(0.3, abs=1e-6)
+    assert given["theoretical_value"] > price
+
+
+def test_screen_chain_prices_contracts_with_expiry():
+    chain = pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 105.0],
+            "option_type": ["call", "call", "put"],
+            "bid": [6.0, 2.8, 5.6],
+            "ask": [6.2, 3.0, 5.9],
+        }
+    )
+    screened = screen_chain(
+        chain, 100.0, 100.0, 1.0, tradable_only=False, time_to_expiry=30 / 365
+    )
+    assert screened["implied_vol"].between(0.05, 2).all()
+    mid = (screened["bid"] + screened["ask"]) / 2
+    assert np.allclose(screened["theoretical_value"], mid, atol=1e-6)
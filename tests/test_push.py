@@ -0,0 +1,89 @@
+import pytest
+from flask import Flask
+from core import push
+from core.watchlist import Watchlist
+
+
+@pytest.fixture
+def client(monkeypatch):
+    watchlist = Watchlist(symbols=["QQQ"])
+    slots = push.StreamSlots(limit=2)
+    monkeypatch.setattr(push, "get_watchlist", lambda: watchlist)
+    monkeypatch.setattr(push, "stream_slots", slots)
+    server = Flask(__name__)
+    push.register_push_routes(server)
+    client = server.test_client()
+    client.watchlist = watchlist
+    client.slots = slots
+    return client
+
+
+def warm(entry, version, times):
+    entry.version = version
+    entry.chart_data = {"candlestick": [{"time": t} for t in times]}
+
+
+def test_streams_beyond_the_cap_are_refused(client):
+    first = client.get("/stream?symbol=QQQ", buffered=False)
+    second = client.get("/stream?symbol=QQQ", buffered=False)
+    refused = client.get("/stream?symbol=QQQ", buffered=False)
+    assert first.status_code == second.status_code == 200
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == str(push.REFUSED_RETRY_SECONDS)
+    assert client.slots.refused == 1
+
+    # Closed newest first: the test client shares one thread between streams
+    second.close()
+    assert client.slots.open == 1
+    again = client.get("/stream?symbol=QQQ", buffered=False)
+    assert again.status_code == 200
+    again.close()
+    first.close()
+    assert client.slots.open == 0
+
+
+def test_stream_ends_after_its_lifetime(client):
+    entry = client.watchlist.add("QQQ")
+    warm(entry, "v2", [100, 200])
+    events = list(push._stream(entry, "v1", 100, lifetime=0.05))
+    assert events[0] == f"retry: {push.RECONNECT_SECONDS * 1000}\n\n"
+    assert events[1].startswith("id: 200 v2\nevent: delta\n")
+    assert all(event == ": keep-alive\n\n" for event in events[2:])
+
+
+def test_reconnect_resumes_from_the_last_event_id(client, monkeypatch):
+    seen = {}
+
+    def fake_stream(entry, version, since, lifetime=None):
+        seen.update(version=version, since=since)
+        yield ""
+
+    monkeypatch.setattr(push, "_stream", fake_stream)
+    client.get(
+        "/stream?symbol=QQQ&version=old&since=1",
+        headers={"Last-Event-ID": "200 v2"},
+    ).close()
+    assert seen == {"version": "v2", "since": 200}
+    client.get("/stream?symbol=QQQ&version=old&since=1").close()
+    assert seen == {"version": "old", "since": 1}
+
+
+@pytest.mark.parametrize(
+    "value, parsed",
+    [
+        ("200 1:2025-01-02", ("1:2025-01-02", 200)),
+        (" v1", ("v1", None)),
+        ("", None),
+        ("abc v1", None),
+        (None, None),
+    ],
+)
+def test_parse_event_id(value, parsed):
+    assert push._parse_event_id(value) == parsed
+
+
+def test_unknown_instruments_are_refused(client):
+    assert client.get("/stream?symbol=ZZZZ").status_code == 404
+    assert client.get("/stream?symbol=QQQ&interval=5m").status_code == 404
+    assert client.watchlist.symbols() == ["QQQ"]
+    assert client.slots.open == 0
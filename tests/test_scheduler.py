@@ -0,0 +1,61 @@
+from datetime import datetime
+from functools import partial
+import pytest
+from core.scheduler import RefreshScheduler
+from core.trading_calendar import MARKET_TZ, REFRESH_SECONDS_CLOSED, poll_seconds
+
+
+def scheduler(cadence, failures, max_backoff_seconds=600):
+    s = RefreshScheduler(
+        lambda: True,
+        cadence=lambda: cadence,
+        max_backoff_seconds=max_backoff_seconds,
+    )
+    s.failures = failures
+    return s
+
+
+@pytest.mark.parametrize("failures", [1, 2, 5, 20])
+def test_backoff_never_polls_faster_than_a_closed_market(failures):
+    s = scheduler(REFRESH_SECONDS_CLOSED, failures)
+    for _ in range(50):
+        assert s.next_delay() >= REFRESH_SECONDS_CLOSED
+
+
+@pytest.mark.skipif(MARKET_TZ is None, reason="no timezone data")
+def test_backoff_on_a_weekend_uses_the_calendar_cadence():
+    saturday = datetime(2025, 3, 8, 12, 0, tzinfo=MARKET_TZ)
+    s = RefreshScheduler(lambda: False, cadence=partial(poll_seconds, saturday))
+    s.run_once()
+    s.run_once()
+    assert s.failures == 2
+    assert s.next_delay() >= poll_seconds(saturday) == REFRESH_SECONDS_CLOSED
+
+
+def test_backoff_grows_from_the_open_cadence():
+    for failures in (1, 2, 3):
+        delay = scheduler(15, failures).next_delay()
+        assert 15 * 2**failures * 0.8 <= delay <= 15 * 2**failures * 1.2
+
+
+def test_backoff_is_capped():
+    for _ in range(50):
+        assert scheduler(15, 30).next_delay() <= 600 * 1.2
+
+
+def test_success_resets_the_backoff():
+    outcomes = iter([False, ValueError("down"), True])
+
+    def job():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    s = RefreshScheduler(job, cadence=lambda: 15)
+    assert not s.run_once()
+    assert not s.run_once()
+    assert s.failures == 2
+    assert s.run_once()
+    assert s.failures == 0
+    assert s.next_delay() == 15
@@ -0,0 +1,82 @@
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from core import shared_cache
+from core.shared_cache import SharedSnapshotCache
+
+pytestmark = pytest.mark.skipif(shared_cache.fcntl is None, reason="needs flock")
+
+
+def cache(root):
+    return SharedSnapshotCache(
+        db_path=root / "snapshots.db",
+        lock_path=root / "refresh.lock",
+        snapshot_dir=root / "snapshots",
+    )
+
+
+def bars():
+    index = pd.date_range("2025-01-02", periods=4, name="Date")
+    return pd.DataFrame(
+        {"Close": [1.0, 2.0, np.nan, 4.0], "Volume": [10, 20, 30, 40]},
+        index=index,
+    )
+
+
+def test_one_leader_and_the_follower_loads_what_it_published(tmp_path):
+    leader, follower = cache(tmp_path), cache(tmp_path)
+    assert leader.is_leader()
+    assert not follower.is_leader()
+    assert leader.is_leader()
+
+    follower.watch("QQQ", "1d")
+    assert leader.watched() == [("QQQ", "1d")]
+    assert follower.load("QQQ", "1d") is None
+    assert follower.version("QQQ", "1d") is None
+
+    df = bars()
+    leader.publish("QQQ", "1d", "v1", "QQQ", b'{"candlestick":[]}', df)
+    assert follower.version("QQQ", "1d") == "v1"
+    snapshot = follower.load("QQQ", "1d")
+    assert snapshot["version"] == "v1"
+    assert snapshot["instrument"] == "QQQ"
+    assert snapshot["chart_data_body"] == b'{"candlestick":[]}'
+    df.index = df.index.as_unit("ns")
+    pd.testing.assert_frame_equal(
+        snapshot["df"], df, check_dtype=False, check_freq=False
+    )
+
+
+def test_leadership_passes_on_when_the_leader_exits(tmp_path):
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from core.shared_cache import SharedSnapshotCache\n"
+        "root = Path(sys.argv[1])\n"
+        "leader = SharedSnapshotCache(root / 'snapshots.db', root / 'refresh.lock',"
+        " root / 'snapshots')\n"
+        "assert leader.is_leader()\n"
+        "print('leading', flush=True)\n"
+        "sys.stdin.readline()\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    leader = subprocess.Popen(
+        [sys.executable, "-c", code, str(tmp_path)],
+        cwd=root,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert leader.stdout.readline() == "leading\n"
+        follower = cache(tmp_path)
+        assert not follower.is_leader()
+        leader.stdin.close()
+        assert leader.wait(timeout=30) == 0
+        assert follower.is_leader()
+    finally:
+        leader.kill()
+        leader.wait()
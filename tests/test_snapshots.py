@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from core.snapshots import attach, publish_frame
+
+
+def bars():
+    index = pd.date_range("2025-01-02", periods=3, name="Date")
+    return pd.DataFrame(
+        {
+            "Close": [1.0, np.nan, 3.0],
+            "Volume": [10, 20, 30],
+            "Instrument": ["QQQ", "QQQ", "QQQ"],
+            "Note": pd.Series(["a", None, np.nan], index=index, dtype=object),
+        },
+        index=index,
+    )
+
+
+def test_round_trip(tmp_path):
+    df = bars()
+    publish_frame(df, "QQQ", "1d", "v1", root=tmp_path)
+    snapshot = attach("QQQ", "1d", root=tmp_path)
+    assert snapshot.version == "v1"
+    df.index = df.index.as_unit("ns")
+    pd.testing.assert_frame_equal(
+        snapshot.to_frame(), df, check_dtype=False, check_freq=False
+    )
+
+
+def test_missing_values_come_back_as_missing(tmp_path):
+    publish_frame(bars(), "QQQ", "1d", "v1", root=tmp_path)
+    note = attach("QQQ", "1d", root=tmp_path).to_frame()["Note"].tolist()
+    assert note[0] == "a"
+    assert note[1] is None
+    assert isinstance(note[2], float) and np.isnan(note[2])
+
+
+def test_numeric_columns_are_memory_mapped(tmp_path):
+    publish_frame(bars(), "QQQ", "1d", "v1", root=tmp_path)
+    snapshot = attach("QQQ", "1d", root=tmp_path)
+    assert isinstance(snapshot.columns["Close"].base, np.memmap)
+
+
+def test_new_version_replaces_the_attached_one(tmp_path):
+    df = bars()
+    publish_frame(df, "QQQ", "1d", "v1", root=tmp_path)
+    first = attach("QQQ", "1d", root=tmp_path)
+    assert attach("QQQ", "1d", root=tmp_path) is first
+    df.loc[df.index[-1], "Close"] = 4.0
+    publish_frame(df, "QQQ", "1d", "v2", root=tmp_path)
+    second = attach("QQQ", "1d", root=tmp_path)
+    assert second.version == "v2"
+    assert second.to_frame()["Close"].iloc[-1] == 4.0
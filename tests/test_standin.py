@@ -0,0 +1,45 @@
+import json
+import pytest
+import requests
+from benchmarks.fixtures import make_payload
+from benchmarks.standin import StandInServer
+
+
+@pytest.fixture
+def payloads():
+    return [
+        make_payload(50, seed=0, instrument="QQQ"),
+        make_payload(80, seed=1, instrument="SPY"),
+    ]
+
+
+def test_serves_each_instrument(payloads):
+    with StandInServer(payloads) as server:
+        qqq = requests.get(f"{server.url}/data/full").json()
+        spy = requests.get(f"{server.url}/data/full", params={"instrument": "SPY"})
+        assert len(qqq["data"]) == 50
+        assert len(spy.json()["data"]) == 80
+        missing = requests.get(f"{server.url}/data/full?instrument=ZZZ")
+        assert missing.status_code == 404
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_garbage_cuts_the_requested_instruments_body(payloads, compress):
+    with StandInServer(
+        payloads, failure_rate=1.0, failure_modes=["garbage"], compress=compress
+    ) as server:
+        expected = server.instruments["SPY"].full_body()
+        response = requests.get(
+            f"{server.url}/data/full",
+            params={"instrument": "SPY"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.content == expected[: len(expected) // 2]
+        with pytest.raises(ValueError):
+            json.loads(response.content)
+
+        summary = requests.get(f"{server.url}/data/summary?instrument=SPY")
+        full = json.dumps(server.instruments["SPY"].summary()).encode()
+        assert summary.content == full[: len(full) // 2]
+        assert server.stats["failure:garbage"] == 2
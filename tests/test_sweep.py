@@ -0,0 +1,92 @@
+import itertools
+import numpy as np
+import pytest
+from core.calculators import BATCH_OUTPUT_FIELDS, calculate_trade_analysis
+from core.sweep import (
+    SWEEP_DIMS,
+    sweep_to_frame,
+    sweep_trade_analysis,
+    tradability_heatmap,
+)
+
+BASE = {
+    "open_price": 2.0,
+    "current_price": 20.0,
+    "strike_price": 12.0,
+    "atr_value": 1.0,
+    "bid_price": 9.0,
+    "ask_price": 11.0,
+    "trade_direction": "long",
+}
+ATR_MULTIPLIERS = (0.5, 1.0, 2.0, 4.0)
+ADJUSTMENTS = (0.25, 0.5, 1.0)
+OFFSETS = (-4.0, -2.0, 0.0, 2.0, 4.0)
+
+
+def scalar(atr_multiplier, adjustment, offset):
+    return calculate_trade_analysis(
+        {
+            **BASE,
+            "atr_value": BASE["atr_value"] * atr_multiplier,
+            "intrinsic_adjustment": adjustment,
+            "current_price": BASE["current_price"] + offset,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def cube():
+    return sweep_trade_analysis(BASE, ATR_MULTIPLIERS, ADJUSTMENTS, OFFSETS)
+
+
+def test_cube_shape_and_axes(cube):
+    assert cube["dims"] == SWEEP_DIMS
+    assert cube["coords"]["atr_multiplier"].tolist() == list(ATR_MULTIPLIERS)
+    assert cube["coords"]["intrinsic_adjustment"].tolist() == list(ADJUSTMENTS)
+    assert cube["coords"]["price_offset"].tolist() == list(OFFSETS)
+    for field in (*BATCH_OUTPUT_FIELDS, "margin"):
+        assert cube[field].shape == (4, 3, 5)
+
+    frame = sweep_to_frame(cube)
+    assert len(frame) == 4 * 3 * 5
+    assert list(frame.columns[:3]) == list(SWEEP_DIMS)
+    # Row-major over (atr_multiplier, intrinsic_adjustment, price_offset)
+    assert frame.iloc[1][list(SWEEP_DIMS)].tolist() == [0.5, 0.25, -2.0]
+    assert frame.iloc[5][list(SWEEP_DIMS)].tolist() == [0.5, 0.5, -4.0]
+    assert frame.iloc[15][list(SWEEP_DIMS)].tolist() == [1.0, 0.25, -4.0]
+
+
+@pytest.mark.parametrize("i, j, k", [(0, 0, 0), (1, 2, 2), (3, 1, 4), (2, 0, 3)])
+def test_grid_points_match_the_scalar_calculator(cube, i, j, k):
+    expected = scalar(ATR_MULTIPLIERS[i], ADJUSTMENTS[j], OFFSETS[k])
+    for field in ("target_price", "intrinsic_value", "target_size", "is_tradable"):
+        assert cube[field][i, j, k] == expected[field]
+    assert cube["margin"][i, j, k] == pytest.approx(
+        expected["target_size"] - expected["target_price"]
+    )
+
+    frame = sweep_to_frame(cube).set_index(list(SWEEP_DIMS))
+    row = frame.loc[(ATR_MULTIPLIERS[i], ADJUSTMENTS[j], OFFSETS[k])]
+    assert row["target_size"] == expected["target_size"]
+
+
+def test_heatmap_is_the_tradable_fraction(cube):
+    assert cube["is_tradable"].any() and not cube["is_tradable"].all()
+    heatmap = tradability_heatmap(cube)
+    assert heatmap.index.name == "atr_multiplier"
+    assert heatmap.columns.name == "price_offset"
+    assert heatmap.shape == (4, 5)
+    for (i, atr), (k, offset) in itertools.product(
+        enumerate(ATR_MULTIPLIERS), enumerate(OFFSETS)
+    ):
+        tradable = [scalar(atr, adj, offset)["is_tradable"] for adj in ADJUSTMENTS]
+        assert heatmap.loc[atr, offset] == pytest.approx(np.mean(tradable))
+
+    # Rows later than columns in the cube's order are transposed into place
+    flipped = tradability_heatmap(cube, rows="price_offset", columns="atr_multiplier")
+    assert flipped.equals(heatmap.T)
+
+
+def test_heatmap_needs_two_different_dims(cube):
+    with pytest.raises(ValueError):
+        tradability_heatmap(cube, rows="price_offset", columns="price_offset")
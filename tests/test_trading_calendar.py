@@ -0,0 +1,111 @@
+from datetime import date, datetime
+import pytest
+from core import trading_calendar as tc
+
+needs_tz = pytest.mark.skipif(tc.MARKET_TZ is None, reason="no timezone data")
+
+
+def at(year, month, day, hour, minute=0):
+    return datetime(year, month, day, hour, minute, tzinfo=tc.MARKET_TZ)
+
+
+# Published NYSE holiday schedules
+NYSE_HOLIDAYS = {
+    2024: {
+        date(2024, 1, 1),
+        date(2024, 1, 15),
+        date(2024, 2, 19),
+        date(2024, 3, 29),
+        date(2024, 5, 27),
+        date(2024, 6, 19),
+        date(2024, 7, 4),
+        date(2024, 9, 2),
+        date(2024, 11, 28),
+        date(2024, 12, 25),
+    },
+    2025: {
+        date(2025, 1, 1),
+        date(2025, 1, 20),
+        date(2025, 2, 17),
+        date(2025, 4, 18),
+        date(2025, 5, 26),
+        date(2025, 6, 19),
+        date(2025, 7, 4),
+        date(2025, 9, 1),
+        date(2025, 11, 27),
+        date(2025, 12, 25),
+    },
+}
+
+
+@pytest.mark.parametrize("year", sorted(NYSE_HOLIDAYS))
+def test_holidays_match_the_published_schedule(year):
+    assert tc.holidays(year) == NYSE_HOLIDAYS[year]
+
+
+def test_weekend_holidays_are_observed():
+    # July 4th 2026 is a Saturday, Christmas 2022 a Sunday
+    assert date(2026, 7, 3) in tc.holidays(2026)
+    assert date(2022, 12, 26) in tc.holidays(2022)
+    # New Year's Day on a Saturday is not observed on Dec 31st
+    assert date(2021, 12, 31) not in tc.holidays(2021)
+    assert date(2022, 1, 1) not in tc.holidays(2022)
+
+
+def test_juneteenth_only_from_2022():
+    assert date(2021, 6, 18) not in tc.holidays(2021)
+    assert date(2022, 6, 20) in tc.holidays(2022)
+
+
+def test_early_closes():
+    assert tc.early_closes(2024) == {
+        date(2024, 7, 3),
+        date(2024, 11, 29),
+        date(2024, 12, 24),
+    }
+    # July 3rd 2026 is the observed Independence Day, not an early close
+    assert date(2026, 7, 3) not in tc.early_closes(2026)
+
+
+@needs_tz
+def test_early_close_session_bounds():
+    opens, closes = tc.session_bounds(date(2024, 11, 29))
+    assert (opens.hour, opens.minute) == (9, 30)
+    assert (closes.hour, closes.minute) == (13, 0)
+    assert tc.session_bounds(date(2024, 11, 28)) is None
+
+
+@needs_tz
+@pytest.mark.parametrize(
+    "now, phase",
+    [
+        (at(2025, 3, 10, 9, 45), "opening"),
+        (at(2025, 3, 10, 12), "intraday"),
+        (at(2025, 3, 10, 15, 45), "closing"),
+        (at(2025, 3, 10, 16), "closed"),
+        (at(2024, 11, 29, 12, 45), "closing"),
+        (at(2024, 11, 29, 14), "closed"),
+        (at(2025, 4, 18, 12), "closed"),
+        (at(2025, 3, 8, 12), "closed"),
+    ],
+)
+def test_session_phase(now, phase):
+    assert tc.session_phase(now) == phase
+
+
+@needs_tz
+def test_next_open_skips_weekends_and_holidays():
+    # Thursday before Good Friday 2025 -> Monday
+    assert tc.next_open(at(2025, 4, 17, 17)) == at(2025, 4, 21, 9, 30)
+    assert tc.next_open(at(2025, 3, 10, 8)) == at(2025, 3, 10, 9, 30)
+
+
+@needs_tz
+def test_poll_seconds():
+    assert tc.poll_seconds(at(2025, 3, 10, 9, 45)) == tc.REFRESH_SECONDS_EDGE
+    assert tc.poll_seconds(at(2025, 3, 10, 12)) == tc.REFRESH_SECONDS_INTRADAY
+    # Settling after an early close
+    assert tc.poll_seconds(at(2024, 11, 29, 13, 5)) == tc.REFRESH_SECONDS_INTRADAY
+    assert tc.poll_seconds(at(2025, 3, 8, 12)) == tc.REFRESH_SECONDS_CLOSED
+    # Idle, but never sleeping through the open
+    assert tc.poll_seconds(at(2025, 3, 10, 9, 20)) == min(tc.REFRESH_SECONDS_CLOSED, 600)
@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import Future
+import pytest
+import pandas as pd
+from core.watchlist import UnknownInstrumentError, Watchlist
+
+
+def fake_fetch(symbol, period, interval):
+    df = pd.DataFrame({"Close": [1.0, 2.0], "Instrument": symbol})
+    return df, {"panels": {"version": f"{symbol}-v1"}}
+
+
+class FinishedPool:
+    """Hands back futures that are already done when submit() returns"""
+
+    def submit(self, fn, entry):
+        future = Future()
+        future.set_result(entry)
+        return future
+
+
+def run_with_timeout(target, timeout=5):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "deadlocked"
+    return result["value"]
+
+
+def test_submit_with_an_already_finished_future():
+    watchlist = Watchlist(symbols=[], fetch=fake_fetch)
+    watchlist._pool = FinishedPool()
+    entry = watchlist.add("qqq")
+    future = run_with_timeout(lambda: watchlist._submit(entry))
+    assert future.result() is entry
+    assert watchlist._inflight == {}
+
+
+def test_concurrent_requests_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(symbol, period, interval):
+        calls.append(symbol)
+        release.wait(5)
+        return fake_fetch(symbol, period, interval)
+
+    watchlist = Watchlist(symbols=["QQQ"], fetch=slow_fetch)
+    entry = watchlist.get("QQQ")
+    first = watchlist._submit(entry)
+    second = watchlist._submit(entry)
+    release.set()
+    assert first is second
+    first.result(timeout=5)
+    assert calls == ["QQQ"]
+    watchlist._pool.shutdown()
+
+
+class FakeShared:
+    def __init__(self, watched):
+        self._watched = watched
+
+    def watched(self):
+        return list(self._watched)
+
+
+def test_only_served_instruments_are_allowed():
+    watchlist = Watchlist(symbols=["QQQ"], fetch=fake_fetch)
+    assert watchlist.allows("qqq")
+    assert watchlist.allows("QQQ", "1wk")
+    assert not watchlist.allows("QQQ", "5m")
+    assert not watchlist.allows("ZZZZ")
+    with pytest.raises(UnknownInstrumentError):
+        watchlist.get_or_fetch("ZZZZ")
+    assert watchlist.symbols() == ["QQQ"]
+
+
+def test_instruments_tracked_by_the_leader_are_allowed():
+    watchlist = Watchlist(symbols=[], fetch=fake_fetch)
+    watchlist.shared = FakeShared([("SPY", "1d")])
+    assert watchlist.allows("spy")
+    assert not watchlist.allows("QQQ")